@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
 import logging
+import hashlib
 from typing import Dict, List, Optional, Tuple, Union, Any
 import json
 import time
@@ -22,7 +23,7 @@ from ..utils.extractor_utils import (
 from .quality_control import QualityControl
 from .domain_classifier import DomainClassifier
 from .language_confidence_detector import detect_language_confidence
-from .corruption_detector import CorruptionDetector
+from .corruption_detector import get_corruption_detector
 
 class ExtractionError(Exception):
     """Custom exception for extraction errors."""
@@ -132,9 +133,8 @@ class BaseExtractor(ABC):
             lang_info = detect_language_confidence(text)
             metadata.update(lang_info)
             
-            # Detect corruption
-            detector = CorruptionDetector()
-            corruption_info = detector.detect(text)
+            # Detect corruption with this worker's shared detector
+            corruption_info = get_corruption_detector().detect(text)
             metadata.update(corruption_info)
             
             # Classify domain
@@ -147,9 +147,11 @@ class BaseExtractor(ABC):
             else:
                 output_dir = self.extracted_dir
             
-            # Save extracted text
+            # Save extracted text, recording its hash for checksum verification
+            text_bytes = text.encode('utf-8')
+            metadata['text_sha256'] = hashlib.sha256(text_bytes).hexdigest()
             text_file = output_dir / f"{safe_filename(file_path.stem, 128)}.txt"
-            text_file.write_text(text, encoding='utf-8')
+            text_file.write_bytes(text_bytes)
             
             # Save metadata
             metadata_file = output_dir / f"{safe_filename(file_path.stem, 128)}.json"
@@ -141,7 +141,7 @@ from langdetect import detect, LangDetectException  # type: ignore
 import yaml
 from tqdm import tqdm
 
-from .formula_extractor import FormulaExtractor
+from .formula_extractor import FormulaExtractor, extract_page_text
 from .chart_image_extractor import ChartImageExtractor
 from .financial_symbol_processor import FinancialSymbolProcessor, AcademicPaperProcessor, MemoryOptimizer
 from ..utils.domain_utils import get_domain_for_file
@@ -278,12 +278,23 @@ def extract_text_with_pypdf2(pdf_path: str) -> str:
         logger.warning(f"PyPDF2 extraction failed: {str(e)}")
     return text
 
-def extract_text_with_pymupdf(pdf_path: str) -> str:
+def extract_text_with_pymupdf(pdf_path: str, math_lines: Optional[List[Tuple[int, str]]] = None) -> str:
+    """Extract text with PyMuPDF.
+
+    When ``math_lines`` is given it is filled with ``(page number, line)`` for
+    the math-font lines of each page, read from the same parse, for
+    :meth:`FormulaExtractor.extract_from_pdf`.
+    """
     text = ""
     try:
         doc = fitz.open(pdf_path)
-        for page in doc:
-            text += page.get_text() + "\n"
+        for page_num, page in enumerate(doc):
+            if math_lines is None:
+                text += page.get_text() + "\n"
+                continue
+            page_text, page_math_lines = extract_page_text(page)
+            text += page_text + "\n"
+            math_lines.extend((page_num + 1, line) for line in page_math_lines)
     except Exception as e:
         logger.warning(f"PyMuPDF extraction failed: {str(e)}")
     return text
@@ -296,7 +307,8 @@ def extract_text_with_pdfminer(pdf_path: str) -> str:
         logger.warning(f"PDFMiner extraction failed: {str(e)}")
     return text
 
-def extract_text_from_pdf(pdf_path: str) -> str:
+def extract_text_from_pdf(pdf_path: str, math_lines: Optional[List[Tuple[int, str]]] = None) -> str:
+    """Best text of the extraction methods; ``math_lines`` is filled by the PyMuPDF pass."""
     logger.debug(f"[DEBUG] Entering extract_text_from_pdf for: {pdf_path}")
     methods = [
         extract_text_with_pypdf2,
@@ -308,7 +320,10 @@ def extract_text_from_pdf(pdf_path: str) -> str:
     for method in methods:
         try:
             logger.debug(f"[DEBUG] Trying method: {method.__name__}")
-            text = method(pdf_path)
+            if method is extract_text_with_pymupdf:
+                text = method(pdf_path, math_lines)
+            else:
+                text = method(pdf_path)
             logger.debug(f"[DEBUG] Method {method.__name__} returned {len(text) if text else 0} characters")
             if not text:
                 continue
@@ -564,8 +579,9 @@ def process_pdf_file_enhanced(file_path: str, args: argparse.Namespace) -> Optio
         if getattr(args, 'verbose', False):
             logger.info(f"[{worker_id}] Starting processing: {os.path.basename(file_path)}")
         
-        # Extract text
-        text = extract_text_from_pdf(file_path)
+        # Extract text; math-font lines are kept for formula detection
+        math_lines = []
+        text = extract_text_from_pdf(file_path, math_lines)
         logger.debug(f"[DEBUG] process_pdf_file_enhanced: Extracted text length: {len(text) if text else 0}")
         
         if not text or len(text.strip()) < MIN_TOKEN_THRESHOLD:
@@ -578,7 +594,8 @@ def process_pdf_file_enhanced(file_path: str, args: argparse.Namespace) -> Optio
 
         # === NEW ENHANCEMENTS START HERE ===
         formula_extractor = FormulaExtractor()
-        chart_extractor = ChartImageExtractor()
+        # One blob store for the corpus, so images recurring across PDFs are stored once
+        chart_extractor = ChartImageExtractor(blob_store=Path(args.output_dir) / 'blobs')
         symbol_processor = FinancialSymbolProcessor()
         academic_processor = AcademicPaperProcessor()
         # MemoryOptimizer can be used for chunked processing if needed
@@ -586,7 +603,7 @@ def process_pdf_file_enhanced(file_path: str, args: argparse.Namespace) -> Optio
         pdf_output_dir = Path(args.output_dir) / 'extracted' / Path(file_path).stem
         pdf_output_dir.mkdir(parents=True, exist_ok=True)
 
-        formula_results = formula_extractor.extract_comprehensive(file_path, text)
+        formula_results = formula_extractor.extract_comprehensive(file_path, text, math_lines=math_lines)
         image_results = chart_extractor.extract_from_pdf(file_path, str(pdf_output_dir))
         symbol_results = symbol_processor.extract_symbols(text)
         symbol_glossary = symbol_processor.generate_symbol_glossary(symbol_results)
@@ -0,0 +1,74 @@
+"""
+Module: blob_store
+Purpose: Content-addressed store for binary artefacts of extraction
+(thumbnails, extracted images). Each distinct content is written once;
+metadata keeps a short reference instead of the bytes.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Union
+
+logger = logging.getLogger(__name__)
+
+
+class BlobStore:
+    """Directory of blobs named by the SHA-256 of their content
+
+    References are paths relative to ``root`` (``ab/abcdef….png``), so
+    metadata stays valid when the store is moved with it. Writes go to a
+    temporary file first and are renamed into place, so concurrent writers
+    of the same content, in threads or processes, are safe.
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+        self.stats = {'written': 0, 'reused': 0, 'bytes_written': 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def ref_for(data: bytes, ext: str) -> str:
+        """Reference ``data`` is stored under"""
+        digest = hashlib.sha256(data).hexdigest()
+        return f"{digest[:2]}/{digest}.{ext.lstrip('.').lower()}"
+
+    def path(self, ref: str) -> Path:
+        return self.root / ref
+
+    def exists(self, ref: str) -> bool:
+        return self.path(ref).is_file()
+
+    def put(self, data: bytes, ext: str) -> str:
+        """Store ``data`` unless already stored; its reference"""
+        ref = self.ref_for(data, ext)
+        path = self.path(ref)
+        if path.is_file():
+            with self._lock:
+                self.stats['reused'] += 1
+            return ref
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.tmp_')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        with self._lock:
+            self.stats['written'] += 1
+            self.stats['bytes_written'] += len(data)
+        return ref
+
+    def get(self, ref: str) -> bytes:
+        return self.path(ref).read_bytes()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {'root': self.root}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
@@ -10,9 +10,8 @@ import fitz  # PyMuPDF
 import cv2
 import numpy as np
 from PIL import Image, ImageEnhance
-import pytesseract
 import time
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union
 from pathlib import Path
 import logging
 import hashlib
@@ -20,17 +19,35 @@ import base64
 from io import BytesIO
 import re
 from shared_tools.config.project_config import ProjectConfig
+from .blob_store import BlobStore
+from .image_analysis_cache import DEFAULT_MAX_ENTRIES, ImageAnalysisCache, shared_image_analysis_cache
+from .ocr_service import shared_ocr_service
 logger = logging.getLogger(__name__)
 
+# Extracted image record, the image to OCR (None when an earlier entry OCRs the same image)
+# and the analysis to cache (None for images not cached)
+_PendingOCR = Tuple[Dict[str, Any], Optional[Image.Image], Optional[Dict[str, Any]]]
+
 class ChartImageExtractor:
     """Extract and analyze charts, graphs, and images from PDFs."""
     
-    def __init__(self, config: Optional[Dict] = None, project_config: Optional[Dict] = None):
+    # Bump whenever the analysis of raster images changes, so cached analyses are redone
+    ANALYSIS_VERSION = 1
+    
+    def __init__(self, config: Optional[Dict] = None, project_config: Optional[Dict] = None,
+                 analysis_cache: Optional[Union[str, Path, ImageAnalysisCache]] = None,
+                 blob_store: Optional[Union[str, Path, BlobStore]] = None):
         """Initialize chart image extractor
         
         Args:
             config (dict): Optional configuration
             project_config (dict): Optional project configuration
+            analysis_cache: ImageAnalysisCache or database path for persisted
+                image analyses (default: the ``analysis_cache`` config entry,
+                if any, otherwise the process-wide in-memory cache)
+            blob_store: BlobStore or directory for thumbnails and saved images
+                (default: the ``blob_store`` config entry, if any, otherwise
+                ``image_output_dir`` under the output directory of each PDF)
         """
         self.logger = logging.getLogger(self.__class__.__name__)
         
@@ -60,6 +77,27 @@ class ChartImageExtractor:
             'performance', 'risk', 'yield', 'correlation', 'distribution',
             'trend', 'forecast', 'backtest', 'sharpe', 'drawdown'
         }
+        
+        # OCR runs in batches; images waiting for it are held at most this many at a time
+        processing = self.config.get('processing', {})
+        self.ocr_batch_size = processing.get('batch_size', 10)
+        self.ocr = shared_ocr_service(psm=6, max_workers=processing.get('max_workers', 1),
+                                      batch_size=self.ocr_batch_size)
+        
+        # Analyses of embedded images by content digest; OCR settings change what is cached
+        analysis_cache = analysis_cache or self.config.get('analysis_cache')
+        if not isinstance(analysis_cache, ImageAnalysisCache):
+            ocr = self.config.get('ocr_enabled', True) and self.config.get('extract_text_from_images', True)
+            analysis_cache = shared_image_analysis_cache(
+                analysis_cache, version=f"{self.ANALYSIS_VERSION}{'' if ocr else '-no-ocr'}",
+                max_entries=self.config.get('analysis_cache_size', DEFAULT_MAX_ENTRIES)
+            )
+        self.analysis_cache = analysis_cache
+        
+        blob_store = blob_store or self.config.get('blob_store')
+        if blob_store is not None and not isinstance(blob_store, BlobStore):
+            blob_store = BlobStore(blob_store)
+        self.blob_store = blob_store
     
     def _get_default_config(self) -> Dict[str, Any]:
         """Get default configuration"""
@@ -145,29 +183,36 @@ class ChartImageExtractor:
         images_data = []
         total_raster_images = 0
         total_vector_graphics = 0
+        # Images found so far whose OCR (and what depends on it) is outstanding
+        pending_ocr = []
+        
+        # Thumbnails and saved images go to a content-addressed blob store,
+        # written once per distinct content; records only reference them
+        blob_store = self.blob_store
+        if blob_store is None and output_dir:
+            blob_store = BlobStore(Path(output_dir) / self.config['image_output_dir'])
+        img_output_dir = blob_store.root if self.config['save_images'] and blob_store is not None else None
         
         try:
             doc = fitz.open(pdf_path)
             
-            # Setup output directory if saving images
-            if self.config['save_images'] and output_dir:
-                img_output_dir = Path(output_dir) / self.config['image_output_dir']
-                img_output_dir.mkdir(parents=True, exist_ok=True)
-            else:
-                img_output_dir = None
-            
             for page_num in range(len(doc)):
                 page = doc.load_page(page_num)
                 
                 # Extract images from page
-                page_images = self._extract_page_images(page, page_num, pdf_path, img_output_dir)
+                page_images = self._extract_page_images(page, page_num, pdf_path, img_output_dir, pending_ocr,
+                                                        blob_store)
                 images_data.extend(page_images)
                 total_raster_images += len(page.get_images())
                 
                 # Look for vector graphics that might be charts
-                vector_graphics = self._extract_vector_graphics(page, page_num)
+                vector_graphics = self._extract_vector_graphics(page, page_num, pending_ocr, blob_store)
                 images_data.extend(vector_graphics)
                 total_vector_graphics += len(vector_graphics)
+                
+                if len(pending_ocr) >= self.ocr_batch_size:
+                    self._apply_ocr(pending_ocr)
+                    pending_ocr = []
             
             doc.close()
             
@@ -177,6 +222,12 @@ class ChartImageExtractor:
         except Exception as e:
             self.logger.error(f"Error extracting images from PDF {pdf_path}: {e}")
         
+        self._apply_ocr(pending_ocr)
+        self.analysis_cache.flush()
+        logger.info(f"Image analysis cache: {self.analysis_cache.stats}")
+        if blob_store is not None:
+            logger.info(f"Image blob store {blob_store.root}: {blob_store.stats}")
+        
         # Post-process and enhance image data
         enhanced_images = []
         for img_data in images_data:
@@ -187,8 +238,22 @@ class ChartImageExtractor:
         return enhanced_images
     
     def _extract_page_images(self, page, page_num: int, pdf_path: str, 
-                           output_dir: Optional[Path]) -> List[Dict[str, Any]]:
-        """Extract raster images from a page."""
+                           output_dir: Optional[Path],
+                           pending_ocr: Optional[List[_PendingOCR]] = None,
+                           blob_store: Optional[BlobStore] = None) -> List[Dict[str, Any]]:
+        """Extract raster images from a page.
+        
+        Images analysed before, here or in other documents, take their
+        analysis from ``analysis_cache`` by digest of the image bytes.
+        With ``pending_ocr``, other images are appended to it and their OCR
+        text and chart fields are left for the caller's next :meth:`_apply_ocr`.
+        With a ``blob_store`` (default: ``self.blob_store``), thumbnails and
+        images saved for ``output_dir`` are written to it instead.
+        """
+        blob_store = blob_store or self.blob_store
+        own_batch = pending_ocr is None
+        if own_batch:
+            pending_ocr = []
         images = []
         image_list = page.get_images()
         
@@ -199,74 +264,121 @@ class ChartImageExtractor:
                 base_image = page.parent.extract_image(xref)
                 image_bytes = base_image["image"]
                 image_ext = base_image["ext"]
+                image_hash = hashlib.md5(image_bytes).hexdigest()
+                
+                # Reuse the analysis of the same image from an earlier page or document
+                cached = self.analysis_cache.get(image_hash)
+                leader = None
+                if cached is None:
+                    # ... or of one still waiting for OCR in this batch
+                    leader = next((a for d, i, a in pending_ocr
+                                   if i is not None and a is not None and d['image_hash'] == image_hash), None)
+                analysis = dict(cached or leader or {})
+                pil_image = None
                 
-                # Convert to PIL Image
-                pil_image = Image.open(BytesIO(image_bytes))
+                if 'size' not in analysis:
+                    # Convert to PIL Image
+                    pil_image = Image.open(BytesIO(image_bytes))
+                    analysis.update(size=list(pil_image.size), mode=pil_image.mode)
                 
                 # Check size constraints
-                if not self._is_valid_image_size(pil_image.size):
+                if not self._is_valid_image_size(tuple(analysis['size'])):
+                    if analysis != cached:
+                        self.analysis_cache.put(image_hash, analysis)
                     continue
                 
                 # Calculate quality score
-                quality_score = self._calculate_image_quality(pil_image)
+                if 'quality_score' not in analysis:
+                    pil_image = pil_image or Image.open(BytesIO(image_bytes))
+                    analysis['quality_score'] = self._calculate_image_quality(pil_image)
+                quality_score = analysis['quality_score']
                 if quality_score < self.config['image_quality_threshold']:
+                    if analysis != cached:
+                        self.analysis_cache.put(image_hash, analysis)
                     continue
                 
+                # Thumbnails go to the blob store if there is one, else into the record
+                if blob_store is not None:
+                    thumbnail_ref = analysis.get('thumbnail_ref')
+                    if thumbnail_ref is None or not blob_store.exists(thumbnail_ref):
+                        pil_image = pil_image or Image.open(BytesIO(image_bytes))
+                        analysis['thumbnail_ref'] = self._store_thumbnail(pil_image, blob_store)
+                elif not output_dir and 'thumbnail' not in analysis:
+                    pil_image = pil_image or Image.open(BytesIO(image_bytes))
+                    analysis['thumbnail'] = self._create_thumbnail_base64(pil_image)
+                
                 # Generate unique image ID
                 image_id = self._generate_image_id(pdf_path, page_num, img_index)
                 
                 # Save image if configured
                 image_path = None
-                if output_dir:
+                image_ref = None
+                if output_dir and blob_store is not None:
+                    image_ref = blob_store.put(image_bytes, image_ext)
+                    image_path = blob_store.path(image_ref)
+                elif output_dir:
                     image_filename = f"{image_id}.{image_ext}"
                     image_path = output_dir / image_filename
-                    pil_image.save(image_path)
-                
-                # Extract text from image using OCR
-                ocr_text = ""
-                if self.config['extract_text_from_images']:
-                    ocr_text = self._extract_text_from_image(pil_image)
+                    image_path.write_bytes(image_bytes)
                 
-                # Detect if this is likely a chart/graph
-                is_chart = self._detect_chart_type(pil_image, ocr_text)
-                
-                # Create image metadata
+                # Create image metadata; OCR text and chart fields are filled in by _apply_analysis
                 image_data = {
                     'id': image_id,
                     'page': page_num + 1,
                     'index_on_page': img_index,
                     'type': 'raster_image',
                     'format': image_ext,
-                    'size': pil_image.size,
-                    'mode': pil_image.mode,
+                    'size': tuple(analysis['size']),
+                    'mode': analysis['mode'],
                     'quality_score': quality_score,
                     'file_size': len(image_bytes),
                     'saved_path': str(image_path) if image_path else None,
-                    'ocr_text': ocr_text,
-                    'is_chart': is_chart['is_chart'],
-                    'chart_type': is_chart['chart_type'],
-                    'chart_confidence': is_chart['confidence'],
-                    'contains_financial_content': self._contains_financial_content(ocr_text),
-                    'image_hash': hashlib.md5(image_bytes).hexdigest(),
-                    'base64_thumbnail': self._create_thumbnail_base64(pil_image) if not output_dir else None,
+                    'image_ref': image_ref,
+                    'ocr_text': "",
+                    'is_chart': False,
+                    'chart_type': "unknown",
+                    'chart_confidence': 0.0,
+                    'contains_financial_content': False,
+                    'image_hash': image_hash,
+                    'base64_thumbnail': analysis['thumbnail'] if blob_store is None and not output_dir else None,
+                    'thumbnail_ref': analysis.get('thumbnail_ref') if blob_store is not None else None,
                     'metadata': {
                         'source': 'raster_image',
                         'quality_score': quality_score,
-                        'chart_type': is_chart['chart_type'],
-                        'chart_confidence': is_chart['confidence']
+                        'chart_type': "unknown",
+                        'chart_confidence': 0.0
                     }
                 }
                 
                 images.append(image_data)
+                if 'ocr_text' in analysis:
+                    self._apply_analysis(image_data, analysis)
+                    if analysis != cached:
+                        self.analysis_cache.put(image_hash, analysis)
+                elif leader is not None:
+                    pending_ocr.append((image_data, None, leader))
+                else:
+                    pending_ocr.append((image_data, pil_image or Image.open(BytesIO(image_bytes)), analysis))
                 
             except Exception as e:
                 self.logger.warning(f"Error processing image {img_index} on page {page_num}: {e}")
                 continue
         
+        if own_batch:
+            self._apply_ocr(pending_ocr)
         return images
     
-    def _extract_vector_graphics(self, page, page_num: int) -> List[Dict[str, Any]]:
-        """Extract vector graphics that might be charts, rasterize, OCR, and analyze."""
+    def _extract_vector_graphics(self, page, page_num: int,
+                                 pending_ocr: Optional[List[_PendingOCR]] = None,
+                                 blob_store: Optional[BlobStore] = None) -> List[Dict[str, Any]]:
+        """Extract vector graphics that might be charts, rasterize, OCR, and analyze.
+        
+        ``pending_ocr`` and ``blob_store`` are used as in :meth:`_extract_page_images`.
+        """
+        blob_store = blob_store or self.blob_store
+        own_batch = pending_ocr is None
+        if own_batch:
+            pending_ocr = []
         vector_graphics = []
         try:
             # Convert page to image to analyze vector content
@@ -279,8 +391,6 @@ class ChartImageExtractor:
                 for chart_area in chart_detection['chart_areas']:
                     # Extract the chart area as a separate image
                     chart_image = pil_image.crop(chart_area['bbox'])
-                    # Extract text from the chart area using OCR
-                    ocr_text = self._extract_text_from_image(chart_image) if self.config['extract_text_from_images'] else ""
                     # Classify chart type
                     chart_type = chart_area.get('chart_type', 'unknown')
                     # Create unified metadata
@@ -292,12 +402,13 @@ class ChartImageExtractor:
                         'size': chart_image.size,
                         'bbox': chart_area['bbox'],
                         'quality_score': chart_area['confidence'],
-                        'ocr_text': ocr_text,
+                        'ocr_text': "",
                         'is_chart': True,
                         'chart_type': chart_type,
                         'chart_confidence': chart_area['confidence'],
-                        'contains_financial_content': self._contains_financial_content(ocr_text),
-                        'base64_thumbnail': self._create_thumbnail_base64(chart_image),
+                        'contains_financial_content': False,
+                        'base64_thumbnail': self._create_thumbnail_base64(chart_image) if blob_store is None else None,
+                        'thumbnail_ref': self._store_thumbnail(chart_image, blob_store) if blob_store is not None else None,
                         'metadata': {
                             'source': 'vector_graphic',
                             'quality_score': chart_area['confidence'],
@@ -306,10 +417,48 @@ class ChartImageExtractor:
                         }
                     }
                     vector_graphics.append(vector_data)
+                    pending_ocr.append((vector_data, chart_image, None))
         except Exception as e:
             self.logger.warning(f"Error extracting vector graphics from page {page_num}: {e}")
+        if own_batch:
+            self._apply_ocr(pending_ocr)
         return vector_graphics
     
+    def _apply_ocr(self, pending_ocr: List[_PendingOCR]) -> None:
+        """OCR the images of ``pending_ocr`` in one batch and fill in their OCR text and the fields derived from it."""
+        if not pending_ocr:
+            return
+        to_ocr = [(image_data, image, analysis) for image_data, image, analysis in pending_ocr if image is not None]
+        if self.config['extract_text_from_images']:
+            texts = self._extract_text_from_images([image for _, image, _ in to_ocr])
+        else:
+            texts = [""] * len(to_ocr)
+        for (image_data, image, analysis), ocr_text in zip(to_ocr, texts):
+            if analysis is None:
+                image_data['ocr_text'] = ocr_text
+                image_data['contains_financial_content'] = self._contains_financial_content(ocr_text)
+                continue
+            # Detect if this is likely a chart/graph
+            is_chart = self._detect_chart_type(image, ocr_text)
+            analysis.update(
+                ocr_text=ocr_text,
+                is_chart=is_chart['is_chart'],
+                chart_type=is_chart['chart_type'],
+                chart_confidence=is_chart['confidence'],
+                contains_financial_content=self._contains_financial_content(ocr_text)
+            )
+            self.analysis_cache.put(image_data['image_hash'], analysis)
+        for image_data, image, analysis in pending_ocr:
+            if analysis is not None:
+                self._apply_analysis(image_data, analysis)
+    
+    def _apply_analysis(self, image_data: Dict[str, Any], analysis: Dict[str, Any]) -> None:
+        """Fill in the OCR text and chart fields of a raster image record from its analysis."""
+        for field in ('ocr_text', 'is_chart', 'chart_type', 'chart_confidence', 'contains_financial_content'):
+            image_data[field] = analysis[field]
+        image_data['metadata']['chart_type'] = analysis['chart_type']
+        image_data['metadata']['chart_confidence'] = analysis['chart_confidence']
+    
     def _is_valid_image_size(self, size: Tuple[int, int]) -> bool:
         """Check if image size is within acceptable bounds."""
         width, height = size
@@ -350,24 +499,26 @@ class ChartImageExtractor:
     
     def _extract_text_from_image(self, image: Image.Image) -> str:
         """Extract text from image using OCR."""
+        return self._extract_text_from_images([image])[0]
+    
+    def _extract_text_from_images(self, images: List[Image.Image]) -> List[str]:
+        """Extract text from a batch of images using OCR."""
         if not self.config['ocr_enabled']:
-            return ""
+            return [""] * len(images)
         
         try:
-            # Enhance image for better OCR
-            enhanced_image = self._enhance_image_for_ocr(image)
+            # Enhance images for better OCR
+            enhanced_images = [self._enhance_image_for_ocr(image) for image in images]
             
-            # Extract text using Tesseract
-            text = pytesseract.image_to_string(enhanced_image, config='--psm 6')
+            # Extract text using Tesseract, one batch for all images
+            texts = self.ocr.images_to_strings(enhanced_images)
             
             # Clean up the text
-            text = ' '.join(text.split())  # Normalize whitespace
-            
-            return text
+            return [' '.join(text.split()) for text in texts]  # Normalize whitespace
             
         except Exception as e:
-            self.logger.warning(f"Error extracting text from image: {e}")
-            return ""
+            self.logger.warning(f"Error extracting text from images: {e}")
+            return [""] * len(images)
     
     def _enhance_image_for_ocr(self, image: Image.Image) -> Image.Image:
         """Enhance image quality for better OCR results."""
@@ -545,8 +696,8 @@ class ChartImageExtractor:
         pdf_name = Path(pdf_path).stem
         return f"{pdf_name}_p{page_num + 1}_img{img_index}"
     
-    def _create_thumbnail_base64(self, image: Image.Image, size: Tuple[int, int] = (150, 150)) -> str:
-        """Create a base64-encoded thumbnail of the image."""
+    def _create_thumbnail_png(self, image: Image.Image, size: Tuple[int, int] = (150, 150)) -> bytes:
+        """Create a PNG thumbnail of the image."""
         try:
             thumbnail = image.copy()
             thumbnail.thumbnail(size, Image.Resampling.LANCZOS)
@@ -554,11 +705,20 @@ class ChartImageExtractor:
             buffer = BytesIO()
             thumbnail.save(buffer, format='PNG')
             
-            return base64.b64encode(buffer.getvalue()).decode('utf-8')
+            return buffer.getvalue()
             
         except Exception as e:
             self.logger.warning(f"Error creating thumbnail: {e}")
-            return ""
+            return b""
+    
+    def _create_thumbnail_base64(self, image: Image.Image, size: Tuple[int, int] = (150, 150)) -> str:
+        """Create a base64-encoded thumbnail of the image."""
+        return base64.b64encode(self._create_thumbnail_png(image, size)).decode('utf-8')
+    
+    def _store_thumbnail(self, image: Image.Image, blob_store: BlobStore) -> Optional[str]:
+        """Write a PNG thumbnail of the image to ``blob_store``; its reference."""
+        data = self._create_thumbnail_png(image)
+        return blob_store.put(data, 'png') if data else None
     
     def _detect_chart_in_rendered_page(self, page_image: Image.Image, page) -> Dict[str, Any]:
         """Detect chart areas in a rendered page image."""
@@ -638,6 +798,7 @@ def integrate_chart_image_extraction(pdf_path: str, output_dir: str, config_path
     return {
         'images': images,
         'statistics': {
+            'analysis_cache': extractor.analysis_cache.stats,
             'total_images': total_images,
             'total_charts': len(charts),
             'financial_charts': len(financial_charts),
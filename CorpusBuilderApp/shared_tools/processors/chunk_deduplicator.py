@@ -0,0 +1,246 @@
+"""
+Module: chunk_deduplicator
+Purpose: Detects passages repeated across many documents (disclaimers,
+licence blocks, notebook preambles) and optionally strips them.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from shared_tools.utils.extractor_utils import chunk_text, count_tokens, normalize_text
+
+if TYPE_CHECKING:
+    from shared_tools.project_config import ProjectConfig
+
+logger = logging.getLogger(__name__)
+
+_PARAGRAPH_RE = re.compile(r'\n\s*\n')
+
+
+class ChunkDeduplicator:
+    """Find high-frequency chunks across the corpus in one streaming pass.
+
+    Documents are split into paragraphs, and paragraphs longer than
+    ``chunk_size`` are split further with :func:`chunk_text`. Each chunk is
+    normalised and reduced to an 8-byte digest. Per digest only its counts
+    and first document are kept; chunk text is sampled once the chunk turns
+    up in a second document. Memory therefore grows with the number of
+    distinct chunks, a few dozen bytes each, and with the text of repeated
+    chunks only, never with the text of the corpus.
+    """
+
+    def __init__(self, min_chunk_chars: int = 200, min_doc_frequency: int = 5, chunk_size: int = 2000):
+        """Initialize the chunk deduplicator.
+
+        Args:
+            min_chunk_chars: Chunks shorter than this (after normalisation) are ignored
+            min_doc_frequency: Number of documents a chunk must appear in to be reported/stripped
+            chunk_size: Maximum characters per chunk before a paragraph is split
+        """
+        self.min_chunk_chars = min_chunk_chars
+        self.min_doc_frequency = min_doc_frequency
+        self.chunk_size = chunk_size
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.doc_frequency: Counter = Counter()  # Maps chunk digest to number of documents containing it
+        self.occurrences: Counter = Counter()  # Maps chunk digest to total occurrences
+        self.first_documents: Dict[bytes, str] = {}  # Maps chunk digest to the first document containing it
+        self.samples: Dict[bytes, str] = {}  # Maps digest of a chunk found in several documents to its text
+        # Sample at the second document, or the first when single-document chunks are reported
+        self._sample_frequency = min(2, min_doc_frequency)
+        self.documents_scanned = 0
+
+    def iter_chunks(self, text: str) -> Iterator[Tuple[str, Optional[bytes]]]:
+        """Yield ``(chunk, digest)`` covering ``text`` in order.
+
+        Concatenating the chunks reproduces the text, and chunks too short to
+        fingerprint get a ``None`` digest, so callers can rebuild documents.
+        """
+        pos = 0
+        for match in _PARAGRAPH_RE.finditer(text):
+            yield from self._split_paragraph(text[pos:match.start()])
+            yield match.group(0), None
+            pos = match.end()
+        yield from self._split_paragraph(text[pos:])
+
+    def _split_paragraph(self, paragraph: str) -> Iterator[Tuple[str, Optional[bytes]]]:
+        if not paragraph:
+            return
+        pieces = [paragraph] if len(paragraph) <= self.chunk_size else chunk_text(paragraph, self.chunk_size, overlap=0)
+        for piece in pieces:
+            yield piece, self._digest(piece)
+
+    def _digest(self, chunk: str) -> Optional[bytes]:
+        normalized = normalize_text(chunk)
+        if len(normalized) < self.min_chunk_chars:
+            return None
+        return hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).digest()
+
+    def add_document(self, doc_id: str, text: str) -> None:
+        """Fold one document's chunks into the frequency tables."""
+        seen = set()
+        for chunk, digest in self.iter_chunks(text):
+            if digest is None:
+                continue
+            self.occurrences[digest] += 1
+            if digest not in seen:
+                seen.add(digest)
+                self.doc_frequency[digest] += 1
+                self.first_documents.setdefault(digest, doc_id)
+                if self.doc_frequency[digest] == self._sample_frequency:
+                    self.samples[digest] = chunk.strip()
+        self.documents_scanned += 1
+
+    def scan_directory(self, directory: Union[str, Path], pattern: str = '**/*.txt') -> int:
+        """Stream every matching text file through :meth:`add_document`."""
+        directory = Path(directory)
+        count = 0
+        for path in sorted(directory.glob(pattern)):
+            if not path.is_file():
+                continue
+            try:
+                text = path.read_text(encoding='utf-8', errors='ignore')
+            except Exception as e:
+                self.logger.error(f"Error reading {path}: {e}")
+                continue
+            self.add_document(str(path), text)
+            count += 1
+        self.logger.info(f"Scanned {count} documents, {len(self.doc_frequency)} distinct chunks")
+        return count
+
+    def repeated_digests(self, min_doc_frequency: Optional[int] = None) -> set:
+        threshold = min_doc_frequency or self.min_doc_frequency
+        return {digest for digest, freq in self.doc_frequency.items() if freq >= threshold}
+
+    def get_repeated_chunks(self, min_doc_frequency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return repeated chunks, most wasteful first.
+
+        ``redundant_tokens`` counts the tokens spent on every occurrence
+        after the first.
+        """
+        report = []
+        for digest in self.repeated_digests(min_doc_frequency):
+            sample = self.samples.get(digest, '')
+            tokens = count_tokens(sample)
+            report.append({
+                'chunk_id': digest.hex(),
+                'doc_frequency': self.doc_frequency[digest],
+                'occurrences': self.occurrences[digest],
+                'tokens': tokens,
+                'redundant_tokens': tokens * (self.occurrences[digest] - 1),
+                'first_document': self.first_documents[digest],
+                'sample': sample[:300],
+            })
+        report.sort(key=lambda item: item['redundant_tokens'], reverse=True)
+        return report
+
+    def strip_text(self, text: str, repeated: Optional[set] = None) -> Tuple[str, int]:
+        """Remove repeated chunks from ``text``; return ``(text, tokens_removed)``."""
+        repeated = self.repeated_digests() if repeated is None else repeated
+        kept = []
+        removed = 0
+        for chunk, digest in self.iter_chunks(text):
+            if digest is not None and digest in repeated:
+                removed += count_tokens(chunk)
+            else:
+                kept.append(chunk)
+        stripped = ''.join(kept)
+        if removed:
+            stripped = _PARAGRAPH_RE.sub('\n\n', stripped).strip() + '\n'
+        return stripped, removed
+
+    def strip_directory(self, directory: Union[str, Path], output_dir: Union[str, Path],
+                        pattern: str = '**/*.txt') -> Dict[str, Any]:
+        """Write stripped copies of every matching file under ``output_dir``."""
+        directory = Path(directory)
+        output_dir = Path(output_dir)
+        repeated = self.repeated_digests()
+        stats = {'files': 0, 'files_changed': 0, 'tokens_removed': 0}
+        for path in sorted(directory.glob(pattern)):
+            if not path.is_file():
+                continue
+            text = path.read_text(encoding='utf-8', errors='ignore')
+            stripped, removed = self.strip_text(text, repeated)
+            target = output_dir / path.relative_to(directory)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(stripped, encoding='utf-8')
+            os.replace(tmp_path, target)
+            stats['files'] += 1
+            stats['tokens_removed'] += removed
+            if removed:
+                stats['files_changed'] += 1
+        self.logger.info(f"Stripped {stats['tokens_removed']} tokens from {stats['files_changed']} of {stats['files']} files")
+        return stats
+
+    def save_report(self, report_path: Union[str, Path]) -> Dict[str, Any]:
+        repeated = self.get_repeated_chunks()
+        report = {
+            'documents_scanned': self.documents_scanned,
+            'distinct_chunks': len(self.doc_frequency),
+            'min_doc_frequency': self.min_doc_frequency,
+            'repeated_chunks': len(repeated),
+            'redundant_tokens': sum(item['redundant_tokens'] for item in repeated),
+            'chunks': repeated,
+        }
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return report
+
+
+def run_with_project_config(project: 'ProjectConfig', verbose: bool = False):
+    """Run chunk-level duplicate detection with project configuration
+
+    Args:
+        project (ProjectConfig): Project configuration
+        verbose (bool): Enable verbose output
+
+    Returns:
+        dict: Repeated chunk report
+    """
+    cfg = project.get('processors.chunk_deduplicator', {}) or {}
+    detector = ChunkDeduplicator(
+        min_chunk_chars=cfg.get('min_chunk_chars', 200),
+        min_doc_frequency=cfg.get('min_doc_frequency', 5),
+        chunk_size=cfg.get('chunk_size', 2000),
+    )
+    extracted_dir = Path(project.get_processed_dir()) / '_extracted'
+    detector.scan_directory(extracted_dir)
+    report = detector.save_report(project.get_logs_dir() / 'chunk_dedup_report.json')
+
+    if verbose:
+        logger.info(f"Repeated chunks: {report['repeated_chunks']}, redundant tokens: {report['redundant_tokens']}")
+
+    if cfg.get('strip_output_dir'):
+        report['strip'] = detector.strip_directory(extracted_dir, cfg['strip_output_dir'])
+    return report
+
+
+def main():
+    """Main entry point when script is run directly"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Find passages repeated across many documents')
+    parser.add_argument('--input-dir', required=True, help='Directory of extracted .txt files')
+    parser.add_argument('--report', default='chunk_dedup_report.json', help='Path to save the repeated chunk report')
+    parser.add_argument('--min-doc-frequency', type=int, default=5, help='Documents a chunk must appear in to count as boilerplate')
+    parser.add_argument('--min-chunk-chars', type=int, default=200, help='Ignore chunks shorter than this')
+    parser.add_argument('--strip-to', help='Write copies with repeated chunks removed to this directory')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    detector = ChunkDeduplicator(min_chunk_chars=args.min_chunk_chars, min_doc_frequency=args.min_doc_frequency)
+    detector.scan_directory(args.input_dir)
+    report = detector.save_report(args.report)
+    logger.info(f"Repeated chunks: {report['repeated_chunks']}, redundant tokens: {report['redundant_tokens']}")
+    if args.strip_to:
+        detector.strip_directory(args.input_dir, args.strip_to)
+
+
+if __name__ == "__main__":
+    main()
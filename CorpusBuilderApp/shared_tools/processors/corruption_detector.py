@@ -2,17 +2,260 @@
 Corruption detection module
 """
 
+import io
 import re
+import copy
 import json
+import hashlib
 import logging
+import zipfile
+import threading
 from collections import Counter
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Iterable, List, Optional, Any, Union
 from shared_tools.project_config import ProjectConfig
+try:
+    import numpy as np
+    _HAS_NUMPY = hasattr(np, 'bincount')
+except ImportError:  # pragma: no cover - numpy is optional here
+    np = None
+    _HAS_NUMPY = False
 logger = logging.getLogger(__name__)
 
+# --- Character statistics ---
+# Byte classes of UTF-8 encoded text. Non-ASCII characters are counted by
+# their lead byte (0xC0-0xFF), so counts are per character, not per byte.
+WHITESPACE_BYTES = frozenset(b' \t\n\r\x0b\x0c')
+CONTROL_BYTES = frozenset(set(range(0x20)) - WHITESPACE_BYTES) | {0x7f}
+LETTER_BYTES = frozenset(range(ord('A'), ord('Z') + 1)) | frozenset(range(ord('a'), ord('z') + 1))
+DIGIT_BYTES = frozenset(range(ord('0'), ord('9') + 1))
+PUNCTUATION_BYTES = frozenset(range(0x21, 0x7f)) - LETTER_BYTES - DIGIT_BYTES
+NON_ASCII_LEAD_BYTES = frozenset(range(0xc0, 0x100))
+# Punctuation of numeric tables; counted with digits rather than against the letter ratio
+TABLE_BYTES = frozenset(b'|%.,-+$()/:')
+# Rule and leader characters (separators, dot leaders); long runs of them are layout, not damage
+RULE_BYTES = frozenset(b'-=_.')
+
+STATS_BLOCK_CHARS = 1 << 20  # Text is encoded and scanned in blocks of this many characters
+MIN_LONG_RUN = 8             # Runs of one repeated non-whitespace, non-rule byte at least this long are suspicious
+
+# Ratios at which each check reaches a score of 1.0
+ENCODING_ERROR_RATIO = 0.02  # Control + replacement characters per character
+GIBBERISH_MIN_ALPHA = 0.5    # Letters per visible non-tabular character below which text looks like gibberish
+FORMAT_RUN_RATIO = 0.1       # Bytes inside long repeated runs per byte
+
+# --- File-level checks (check_file) ---
+DEFAULT_FILE_OPTIONS = {
+    'check_file_headers': True,
+    'verify_checksums': True,
+    'deep_scan': False,
+    'check_encoding': True,
+    'validate_structure': True,
+    'max_file_size': 100  # MB; larger files are skipped rather than read into memory
+}
+FILE_SIGNATURES = {
+    '.pdf': b'%PDF',
+    '.zip': b'PK\x03\x04',
+    '.docx': b'PK\x03\x04',
+    '.xlsx': b'PK\x03\x04',
+    '.pptx': b'PK\x03\x04',
+    '.epub': b'PK\x03\x04',
+    '.png': b'\x89PNG\r\n\x1a\n',
+    '.jpg': b'\xff\xd8\xff',
+    '.jpeg': b'\xff\xd8\xff',
+    '.gz': b'\x1f\x8b'
+}
+ZIP_EXTENSIONS = {'.zip', '.docx', '.xlsx', '.pptx', '.epub'}
+TEXT_EXTENSIONS = {'.txt', '.md', '.csv', '.json', '.py', '.html', '.htm', '.xml', '.tex'}
+HARD_FAILURE_CHECKS = ('size', 'file_header', 'structure', 'encoding', 'checksum')
+
+_LONG_RUN_RE = re.compile(rb'(.)\1{%d,}' % (MIN_LONG_RUN - 1), re.DOTALL)
+
+class CharStats:
+    """Character-class counts and repeated-run statistics for a text
+    
+    Text is UTF-8 encoded and scanned in blocks: a 256-bin byte histogram
+    gives every class count at once, and run lengths come from the
+    positions where the byte value changes. With numpy both are vectorised;
+    without it the histogram falls back to ``Counter`` and runs to a regex,
+    with identical results. Runs crossing a block boundary are carried over,
+    so feeding a text in pieces gives the same statistics as feeding it whole.
+    """
+    
+    def __init__(self):
+        self.histogram = [0] * 256
+        self.chars = 0
+        self.replacement_chars = 0
+        self.long_run_bytes = 0
+        self.longest_run = 0
+        self._run_byte = None
+        self._run_length = 0
+    
+    @classmethod
+    def from_text(cls, text: str) -> 'CharStats':
+        return cls().update(text).finish()
+    
+    def update(self, text: str) -> 'CharStats':
+        """Add the next piece of text"""
+        for start in range(0, len(text), STATS_BLOCK_CHARS):
+            block = text[start:start + STATS_BLOCK_CHARS]
+            self.chars += len(block)
+            self.replacement_chars += block.count('\ufffd')
+            self._scan(block.encode('utf-8', 'surrogatepass'))
+        return self
+    
+    def finish(self) -> 'CharStats':
+        """Close the run still open at the end of the text"""
+        self._close_run(self._run_byte, self._run_length)
+        self._run_byte, self._run_length = None, 0
+        return self
+    
+    def _scan(self, data: bytes) -> None:
+        if not data:
+            return
+        if _HAS_NUMPY:
+            lead, trail, interior = self._scan_numpy(data)
+        else:
+            lead, trail, interior = self._scan_python(data)
+        first, last = data[0], data[-1]
+        if lead == len(data):
+            # The whole block is one run
+            if first == self._run_byte:
+                self._run_length += lead
+            else:
+                self._close_run(self._run_byte, self._run_length)
+                self._run_byte, self._run_length = first, lead
+            return
+        if first == self._run_byte:
+            self._close_run(first, self._run_length + lead)
+        else:
+            self._close_run(self._run_byte, self._run_length)
+            self._close_run(first, lead)
+        for byte, length in interior:
+            self._close_run(byte, length)
+        self._run_byte, self._run_length = last, trail
+    
+    def _scan_numpy(self, data: bytes):
+        arr = np.frombuffer(data, dtype=np.uint8)
+        counts = np.bincount(arr, minlength=256)
+        self.histogram = [a + int(b) for a, b in zip(self.histogram, counts)]
+        n = len(data)
+        # Positions i where byte i equals byte i+1; sparse in ordinary text
+        pairs = np.flatnonzero(arr[1:] == arr[:-1])
+        if not pairs.size:
+            return 1, 1, []
+        # Consecutive pair positions form one run of (pairs + 1) bytes
+        breaks = np.flatnonzero(np.diff(pairs) != 1) + 1
+        seg_starts = pairs[np.concatenate(([0], breaks))]
+        seg_ends = pairs[np.concatenate((breaks - 1, [pairs.size - 1]))]
+        lengths = seg_ends - seg_starts + 2
+        lead = int(lengths[0]) if seg_starts[0] == 0 else 1
+        if lead == n:
+            return n, n, []
+        trail = int(lengths[-1]) if seg_ends[-1] == n - 2 else 1
+        interior = slice(1 if lead > 1 else 0, -1 if trail > 1 else None)
+        seg_starts, lengths = seg_starts[interior], lengths[interior]
+        long_mask = lengths >= MIN_LONG_RUN
+        runs = list(zip(arr[seg_starts[long_mask]].tolist(), lengths[long_mask].tolist()))
+        return lead, trail, runs
+    
+    def _scan_python(self, data: bytes):
+        for byte, count in Counter(data).items():
+            self.histogram[byte] += count
+        lead = len(data) - len(data.lstrip(data[:1]))
+        if lead == len(data):
+            return lead, lead, []
+        trail = len(data) - len(data.rstrip(data[-1:]))
+        interior = [
+            (m.group(1)[0], m.end() - m.start())
+            for m in _LONG_RUN_RE.finditer(data, lead, len(data) - trail)
+        ]
+        return lead, trail, interior
+    
+    def _close_run(self, byte: Optional[int], length: int) -> None:
+        if byte is None or byte in WHITESPACE_BYTES or byte in RULE_BYTES or length < MIN_LONG_RUN:
+            return
+        self.long_run_bytes += length
+        self.longest_run = max(self.longest_run, length)
+    
+    def _count(self, byte_class) -> int:
+        return sum(self.histogram[b] for b in byte_class)
+    
+    @property
+    def total_bytes(self) -> int:
+        return sum(self.histogram)
+    
+    @property
+    def control_chars(self) -> int:
+        return self._count(CONTROL_BYTES)
+    
+    @property
+    def whitespace_chars(self) -> int:
+        return self._count(WHITESPACE_BYTES)
+    
+    @property
+    def letter_chars(self) -> int:
+        """ASCII letters plus non-ASCII characters other than U+FFFD"""
+        return self._count(LETTER_BYTES) + self._count(NON_ASCII_LEAD_BYTES) - self.replacement_chars
+    
+    @property
+    def digit_chars(self) -> int:
+        return self._count(DIGIT_BYTES)
+    
+    @property
+    def punctuation_chars(self) -> int:
+        return self._count(PUNCTUATION_BYTES)
+    
+    @property
+    def tabular_chars(self) -> int:
+        """Digits and numeric-table punctuation"""
+        return self._count(DIGIT_BYTES) + self._count(TABLE_BYTES)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        visible = self.chars - self.whitespace_chars
+        return {
+            'chars': self.chars,
+            'control_ratio': self.control_chars / self.chars if self.chars else 0.0,
+            'replacement_ratio': self.replacement_chars / self.chars if self.chars else 0.0,
+            'letter_ratio': self.letter_chars / visible if visible else 0.0,
+            'digit_ratio': self.digit_chars / visible if visible else 0.0,
+            'punctuation_ratio': self.punctuation_chars / visible if visible else 0.0,
+            'long_run_ratio': self.long_run_bytes / self.total_bytes if self.chars else 0.0,
+            'longest_run': self.longest_run
+        }
+
+def compute_char_stats(text: str) -> CharStats:
+    """Character statistics for ``text`` in one pass, see :class:`CharStats`"""
+    return CharStats.from_text(text)
+
+# Long-lived detectors keyed by their canonical config, see get_corruption_detector
+_SHARED_DETECTORS: Dict[Optional[str], 'CorruptionDetector'] = {}
+_SHARED_DETECTORS_LOCK = threading.Lock()
+
+def get_corruption_detector(config: Optional[Dict] = None) -> 'CorruptionDetector':
+    """Return a process-wide detector for ``config``, creating and validating it once
+    
+    The detector keeps its own copy of ``config`` and holds no per-call
+    state, so one instance can be shared by every thread in a worker.
+    
+    Args:
+        config (dict, optional): Configuration for corruption detection
+        
+    Returns:
+        CorruptionDetector: Shared detector instance
+    """
+    key = json.dumps(config, sort_keys=True, default=str) if config else None
+    detector = _SHARED_DETECTORS.get(key)
+    if detector is None:
+        with _SHARED_DETECTORS_LOCK:
+            detector = _SHARED_DETECTORS.get(key)
+            if detector is None:
+                detector = CorruptionDetector(config=copy.deepcopy(config) if config else None)
+                _SHARED_DETECTORS[key] = detector
+    return detector
+
 def detect_corruption(text: str, config: Optional[Dict] = None) -> Dict[str, Any]:
-    """Detect corruption in text using CorruptionDetector
+    """Detect corruption in text using a shared CorruptionDetector
     
     Args:
         text (str): Text to analyze
@@ -21,12 +264,38 @@ def detect_corruption(text: str, config: Optional[Dict] = None) -> Dict[str, Any
     Returns:
         dict: Detection results
     """
-    detector = CorruptionDetector(config=config)
-    return detector.detect(text)
+    return get_corruption_detector(config).detect(text)
+
+class CorruptionStream:
+    """Incremental :meth:`CorruptionDetector.detect`
+    
+    Each :meth:`feed` folds a piece of text into running :class:`CharStats`,
+    which carry runs across pieces, so :meth:`result` equals ``detect`` on the
+    whole text while only the statistics are kept.
+    """
+    
+    def __init__(self, detector: 'CorruptionDetector'):
+        self.detector = detector
+        self.length = 0
+        self.stats = CharStats() if detector._checks else None
+    
+    def feed(self, text: str) -> 'CorruptionStream':
+        self.length += len(text)
+        if self.stats is not None:
+            self.stats.update(text)
+        return self
+    
+    def result(self) -> Dict[str, Any]:
+        if self.stats is not None:
+            self.stats.finish()
+        return self.detector._score(self.length, self.stats)
 
 class CorruptionDetector:
     """Detect corrupted content"""
     
+    # Bump when detect() scoring changes so cached verdicts are recomputed
+    VERDICT_VERSION = 1
+    
     def __init__(self, config: Optional[Dict] = None, project_config: Optional[Dict] = None):
         """Initialize corruption detector
         
@@ -51,6 +320,14 @@ class CorruptionDetector:
         
         # Validate configuration
         self._validate_config()
+        
+        # Resolve everything detect() needs once, so calls only read from the instance
+        checks = self.config['checks']
+        self._checks = tuple(
+            name for name in ('encoding_errors', 'gibberish', 'format_errors') if checks.get(name, False)
+        )
+        self._min_text_length = self.config['min_text_length']
+        self._corruption_threshold = self.config.get('corruption_threshold', 0.3)
     
     def _get_default_config(self) -> Dict[str, Any]:
         """Get default configuration"""
@@ -58,8 +335,11 @@ class CorruptionDetector:
             'enabled': True,
             'min_confidence': 0.8,
             'min_text_length': 100,
+            'corruption_threshold': 0.3,
             'checks': {
                 'encoding_errors': True,
+                'gibberish': True,
+                'format_errors': True,
                 'garbled_text': True,
                 'incomplete_sentences': True,
                 'missing_content': True
@@ -195,7 +475,27 @@ class CorruptionDetector:
         Returns:
             dict: Detection results
         """
-        if len(text) < self.config['min_text_length']:
+        if len(text) < self._min_text_length:
+            return self._score(len(text), None)
+        
+        # Encoding errors, gibberish and format errors, as enabled in the config,
+        # all scored from one pass of character statistics
+        return self._score(len(text), compute_char_stats(text) if self._checks else None)
+    
+    def stream(self) -> 'CorruptionStream':
+        """Start scoring a text that is fed in pieces (see :class:`CorruptionStream`)"""
+        return CorruptionStream(self)
+    
+    def detect_stream(self, windows: Iterable[str]) -> Dict[str, Any]:
+        """Same result as :meth:`detect` on the joined ``windows``, holding one window at a time"""
+        stream = self.stream()
+        for window in windows:
+            stream.feed(window)
+        return stream.result()
+    
+    def _score(self, length: int, stats: Optional[CharStats]) -> Dict[str, Any]:
+        """Detection results for a text of ``length`` characters described by ``stats``"""
+        if length < self._min_text_length:
             return {
                 'is_corrupted': False,
                 'corruption_score': 0.0,
@@ -208,46 +508,194 @@ class CorruptionDetector:
             'issues_found': []
         }
         
-        # Check for encoding errors
-        if self.config['checks']['encoding_errors']:
-            encoding_score = self._check_encoding_errors(text)
-            if encoding_score > 0.3:
-                results['issues_found'].append('encoding_errors')
-                results['corruption_score'] = max(results['corruption_score'], encoding_score)
-        
-        # Check for gibberish
-        if self.config['checks']['gibberish']:
-            gibberish_score = self._check_gibberish(text)
-            if gibberish_score > 0.3:
-                results['issues_found'].append('gibberish')
-                results['corruption_score'] = max(results['corruption_score'], gibberish_score)
-        
-        # Check for format errors
-        if self.config['checks']['format_errors']:
-            format_score = self._check_format_errors(text)
-            if format_score > 0.3:
-                results['issues_found'].append('format_errors')
-                results['corruption_score'] = max(results['corruption_score'], format_score)
+        for name in self._checks:
+            # The checks read everything from stats, not the text
+            score = getattr(self, '_check_' + name)('', stats)
+            if score > 0.3:
+                results['issues_found'].append(name)
+                results['corruption_score'] = max(results['corruption_score'], score)
         
         # Set final result
-        results['is_corrupted'] = results['corruption_score'] >= self.config['corruption_threshold']
+        results['is_corrupted'] = results['corruption_score'] >= self._corruption_threshold
         
         return results
     
-    def _check_encoding_errors(self, text: str) -> float:
-        """Check for encoding errors"""
-        # Implementation details...
-        return 0.0
+    def configure(self, **options) -> None:
+        """Set default options for :meth:`check_file` (see ``DEFAULT_FILE_OPTIONS``)"""
+        self.file_options = {**getattr(self, 'file_options', DEFAULT_FILE_OPTIONS), **options}
     
-    def _check_gibberish(self, text: str) -> float:
-        """Check for gibberish content"""
-        # Implementation details...
-        return 0.0
+    def check_file(self, file_path: Union[str, Path], options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Check one file for corruption
+        
+        Args:
+            file_path: File to check
+            options (dict, optional): Overrides for the configured file options
+            
+        Returns:
+            dict: ``status`` (clean/suspicious/corrupted, or skipped for files
+            over ``max_file_size`` MB), ``confidence`` in that status and
+            per-check ``checks`` entries with ``passed``, ``message`` and
+            optional ``details``
+        """
+        options = {**getattr(self, 'file_options', DEFAULT_FILE_OPTIONS), **(options or {})}
+        path = Path(file_path)
+        ext = path.suffix.lower()
+        max_file_size = options.get('max_file_size')
+        size = path.stat().st_size
+        if max_file_size and size > max_file_size * 2**20:
+            return {
+                'status': 'skipped',
+                'confidence': 0.0,
+                'checks': {'size': {
+                    'passed': True,
+                    'message': f"File is larger than {max_file_size} MB, not checked",
+                    'details': f"{size} bytes"
+                }}
+            }
+        data = path.read_bytes()
+        checks = {}
+        
+        if not data:
+            checks['size'] = {'passed': False, 'message': 'File is empty'}
+        
+        if options.get('check_file_headers') and data and ext in FILE_SIGNATURES:
+            passed = data.startswith(FILE_SIGNATURES[ext])
+            checks['file_header'] = {
+                'passed': passed,
+                'message': 'Header matches file type' if passed else f"Header does not match {ext}"
+            }
+        
+        if options.get('validate_structure') and data:
+            passed = None
+            if ext == '.pdf':
+                passed = b'%%EOF' in data[-2048:]
+                message = 'PDF trailer found' if passed else 'PDF is truncated (no %%EOF)'
+            elif ext in ZIP_EXTENSIONS:
+                try:
+                    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+                        bad_member = zf.testzip() if options.get('deep_scan') else None
+                    passed = bad_member is None
+                    message = 'Archive is readable' if passed else f"Bad archive member: {bad_member}"
+                except zipfile.BadZipFile as e:
+                    passed, message = False, f"Invalid archive: {e}"
+            elif ext == '.json':
+                try:
+                    json.loads(data)
+                    passed, message = True, 'Valid JSON'
+                except ValueError as e:
+                    passed, message = False, f"Invalid JSON: {e}"
+            if passed is not None:
+                checks['structure'] = {'passed': passed, 'message': message}
+        
+        if options.get('verify_checksums'):
+            digest = hashlib.sha256(data).hexdigest()
+            expected = self._expected_checksum(path)
+            passed = expected is None or expected == digest
+            checks['checksum'] = {
+                'passed': passed,
+                'message': 'Checksum recorded' if expected is None else ('Checksum matches metadata' if passed else 'Checksum differs from metadata'),
+                'details': digest
+            }
+        
+        content = None
+        if ext in TEXT_EXTENSIONS and data and (options.get('check_encoding') or options.get('deep_scan')):
+            try:
+                text = data.decode('utf-8')
+                encoding_ok = True
+            except UnicodeDecodeError as e:
+                text = data.decode('utf-8', errors='replace')
+                encoding_ok = False
+                encoding_error = str(e)
+            if options.get('check_encoding'):
+                checks['encoding'] = {
+                    'passed': encoding_ok,
+                    'message': 'Valid UTF-8' if encoding_ok else f"Invalid UTF-8: {encoding_error}"
+                }
+            if options.get('deep_scan'):
+                content = self.detect(text)
+                checks['content'] = {
+                    'passed': not content.get('is_corrupted', False),
+                    'message': ', '.join(content.get('issues_found', [])) or content.get('reason', 'No issues found'),
+                    'details': f"corruption score {content['corruption_score']:.2f}"
+                }
+        
+        if any(not checks[name]['passed'] for name in HARD_FAILURE_CHECKS if name in checks):
+            status, confidence = 'corrupted', 1.0
+        elif content and content.get('is_corrupted'):
+            status, confidence = 'corrupted', content['corruption_score']
+        elif content and content.get('issues_found'):
+            status, confidence = 'suspicious', content['corruption_score']
+        else:
+            status = 'clean'
+            confidence = 1.0 - (content['corruption_score'] if content else 0.0)
+        return {'status': status, 'confidence': confidence, 'checks': checks}
+    
+    def _expected_checksum(self, path: Path) -> Optional[str]:
+        """SHA-256 of this file recorded in its sidecar metadata, if any"""
+        meta_path = path.with_suffix('.json')
+        if meta_path == path or not meta_path.exists():
+            return None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(meta, dict):
+            return None
+        # Extraction sidecars are shared by the source document (sha256) and
+        # its extracted text (text_sha256)
+        source = meta.get('source_file')
+        if not source or Path(source).resolve() == path.resolve():
+            return meta.get('sha256')
+        if path.suffix.lower() == '.txt':
+            return meta.get('text_sha256')
+        return None
+    
+    def _check_encoding_errors(self, text: str, stats: Optional[CharStats] = None) -> float:
+        """Check for encoding errors: control and U+FFFD replacement characters"""
+        stats = stats or compute_char_stats(text)
+        if not stats.chars:
+            return 0.0
+        bad_ratio = (stats.control_chars + stats.replacement_chars) / stats.chars
+        return min(1.0, bad_ratio / ENCODING_ERROR_RATIO)
+    
+    def _check_gibberish(self, text: str, stats: Optional[CharStats] = None) -> float:
+        """Check for gibberish content: too few letters among visible characters
+        
+        Digits and table punctuation are left out, so numeric tables are not
+        mistaken for gibberish.
+        """
+        stats = stats or compute_char_stats(text)
+        scored = stats.chars - stats.whitespace_chars - stats.tabular_chars
+        if scored <= 0:
+            return 0.0
+        letter_ratio = stats.letter_chars / scored
+        return max(0.0, (GIBBERISH_MIN_ALPHA - letter_ratio) / GIBBERISH_MIN_ALPHA)
+    
+    def _check_format_errors(self, text: str, stats: Optional[CharStats] = None) -> float:
+        """Check for format errors: long runs of one repeated character other than rules"""
+        stats = stats or compute_char_stats(text)
+        total = stats.total_bytes
+        if not total:
+            return 0.0
+        return min(1.0, stats.long_run_bytes / total / FORMAT_RUN_RATIO)
+
+def check_files(file_paths: List[str], options: Optional[Dict[str, Any]] = None) -> List[tuple]:
+    """Check a batch of files with this process's shared detector
     
-    def _check_format_errors(self, text: str) -> float:
-        """Check for format errors"""
-        # Implementation details...
-        return 0.0
+    Safe to use as a process-pool task: it only takes picklable arguments and
+    returns ``(file_path, report)`` pairs, with an ``error`` report for files
+    that could not be read.
+    """
+    detector = get_corruption_detector()
+    results = []
+    for file_path in file_paths:
+        try:
+            report = detector.check_file(file_path, options)
+        except Exception as e:
+            report = {'status': 'error', 'error': str(e), 'checks': {}, 'confidence': 0.0}
+        results.append((file_path, report))
+    return results
 
 def run_with_project_config(project: 'ProjectConfig', verbose: bool = False):
     """Run corruption detection with project configuration
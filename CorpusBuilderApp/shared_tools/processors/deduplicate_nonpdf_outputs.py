@@ -1,12 +1,18 @@
 import os
 import json
+import shutil
+import threading
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from .deduplicator import Deduplicator
 import argparse
 import logging
 logger = logging.getLogger(__name__)
 
+DUPLICATE_ACTIONS = ('none', 'move', 'delete')
+DEFAULT_BATCH_SIZE = 500
+
 def get_token_count(json_path):
     try:
         with open(json_path, 'r', encoding='utf-8') as f:
@@ -15,6 +21,18 @@ def get_token_count(json_path):
     except Exception:
         return 0
 
+def write_json_atomic(json_path, data):
+    """Write ``data`` to ``json_path`` via a temp file and ``os.replace``."""
+    json_path = Path(json_path)
+    tmp_path = json_path.with_name(f".{json_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, json_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
 def update_metadata(json_path, group_id, deduplication_date, kept_file_path, is_kept, group_type, token_loss):
     try:
         with open(json_path, 'r', encoding='utf-8') as f:
@@ -25,10 +43,11 @@ def update_metadata(json_path, group_id, deduplication_date, kept_file_path, is_
         meta['kept_file'] = is_kept
         meta['is_duplicate_of'] = None if is_kept else str(kept_file_path)
         meta['token_loss'] = token_loss if not is_kept else 0
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(meta, f, ensure_ascii=False, indent=2)
+        write_json_atomic(json_path, meta)
+        return True
     except Exception as e:
         logger.warning(f"[WARN] Could not update metadata for {json_path}: {e}")
+        return False
 
 def main():
     parser = argparse.ArgumentParser(description="Deduplicate non-PDF extracted outputs and update metadata only.")
@@ -37,85 +56,56 @@ def main():
     parser.add_argument('--minhash', action='store_true', help='Enable MinHash/LSH near-duplicate detection')
     parser.add_argument('--similarity-threshold', type=float, default=0.8, help='MinHash similarity threshold')
     parser.add_argument('--report', default='deduplication_report.json', help='Path to save deduplication report (JSON)')
+    parser.add_argument('--duplicate-action', default='none', choices=DUPLICATE_ACTIONS, help='What to do with duplicate files besides updating metadata')
+    parser.add_argument('--duplicates-dir', help='Destination for --duplicate-action move (default <corpus-dir>/duplicates)')
+    parser.add_argument('--workers', type=int, default=None, help='Number of worker threads')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Groups or operations handled per worker task')
+    parser.add_argument('--dry-run', action='store_true', help='Record planned operations in the journal without applying them')
+    parser.add_argument('--journal', help='Path to JSONL journal of planned/applied operations')
     args = parser.parse_args()
 
-    dedup = Deduplicator(
+    report = DeduplicateNonPDFOutputs(
         corpus_dir=args.corpus_dir,
+        strategy=args.strategy,
+        minhash=args.minhash,
         similarity_threshold=args.similarity_threshold,
-        use_minhash=args.minhash
-    )
-    duplicates = dedup.find_duplicates()
-    deduplication_date = datetime.utcnow().isoformat()
-    total_token_loss = 0
-    total_duplicates = 0
-    duplicate_groups = []
-    group_id_counter = 1
-    for group in duplicates:
-        files = group.get('files', [])
-        if len(files) <= 1:
-            continue
-        group_id = f"dg-{group_id_counter:03d}"
-        group_id_counter += 1
-        # Find all .json metadata files for group members
-        file_jsons = []
-        for file_path in files:
-            p = Path(file_path)
-            for subdir in ['_extracted', 'low_quality']:
-                meta_path = p.parent.parent / subdir / (p.stem + '.json')
-                if meta_path.exists():
-                    file_jsons.append((file_path, meta_path))
-                    break
-        if not file_jsons:
-            continue
-        # Determine kept file
-        if args.strategy == 'keep_first':
-            kept_file, kept_json = file_jsons[0]
-        elif args.strategy == 'keep_largest':
-            kept_file, kept_json = max(file_jsons, key=lambda x: get_token_count(x[1]))
-        else:
-            kept_file, kept_json = file_jsons[0]
-        # Calculate token loss for this group
-        kept_tokens = get_token_count(kept_json)
-        group_token_loss = 0
-        duplicates_list = []
-        for file_path, json_path in file_jsons:
-            is_kept = (file_path == kept_file)
-            file_tokens = get_token_count(json_path)
-            loss = 0 if is_kept else file_tokens
-            if not is_kept:
-                group_token_loss += loss
-                duplicates_list.append(file_path)
-            update_metadata(json_path, group_id, deduplication_date, kept_file, is_kept, group.get('type'), loss)
-        total_token_loss += group_token_loss
-        total_duplicates += len(duplicates_list)
-        duplicate_groups.append({
-            "group_id": group_id,
-            "type": group.get('type'),
-            "kept_file": kept_file,
-            "duplicates": duplicates_list,
-            "token_loss": group_token_loss
-        })
-    report = {
-        "deduplication_date": deduplication_date,
-        "strategy": args.strategy,
-        "total_groups": len(duplicate_groups),
-        "total_duplicates": total_duplicates,
-        "token_loss": total_token_loss,
-        "duplicate_groups": duplicate_groups
-    }
-    with open(args.report, 'w', encoding='utf-8') as f:
-        json.dump(report, f, ensure_ascii=False, indent=2)
-    logger.info(f"Deduplication complete. Groups: {len(duplicate_groups)}, Duplicates: {total_duplicates}, Token loss: {total_token_loss}")
+        report_path=args.report,
+        duplicate_action=args.duplicate_action,
+        duplicates_dir=args.duplicates_dir,
+        max_workers=args.workers,
+        batch_size=args.batch_size,
+        dry_run=args.dry_run,
+        journal_path=args.journal,
+    ).run()
+    logger.info(f"Deduplication complete. Groups: {report['total_groups']}, Duplicates: {report['total_duplicates']}, Token loss: {report['token_loss']}")
     logger.info(f"Report saved to {args.report}")
 
 class DeduplicateNonPDFOutputs:
-    """Class for deduplicating non-PDF extracted outputs and updating metadata programmatically."""
-    def __init__(self, corpus_dir, strategy='keep_first', minhash=False, similarity_threshold=0.8, report_path=None):
+    """Class for deduplicating non-PDF extracted outputs and updating metadata programmatically.
+
+    Duplicate groups are resolved concurrently, then the resulting metadata
+    updates and optional file moves/deletions are applied concurrently in
+    batches. Metadata files are replaced atomically, and every planned and
+    applied operation can be recorded in a JSONL journal. With ``dry_run``
+    only the journal and report are written.
+    """
+    def __init__(self, corpus_dir, strategy='keep_first', minhash=False, similarity_threshold=0.8, report_path=None,
+                 duplicate_action='none', duplicates_dir=None, max_workers=None, batch_size=DEFAULT_BATCH_SIZE,
+                 dry_run=False, journal_path=None):
+        if duplicate_action not in DUPLICATE_ACTIONS:
+            raise ValueError(f"Unknown duplicate action: {duplicate_action}")
         self.corpus_dir = corpus_dir
         self.strategy = strategy
         self.minhash = minhash
         self.similarity_threshold = similarity_threshold
         self.report_path = report_path
+        self.duplicate_action = duplicate_action
+        self.duplicates_dir = Path(duplicates_dir) if duplicates_dir else Path(corpus_dir) / 'duplicates'
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.batch_size = max(1, batch_size)
+        self.dry_run = dry_run
+        self.journal_path = journal_path
+        self._journal_lock = threading.Lock()
 
     def run(self):
         dedup = Deduplicator(
@@ -125,67 +115,164 @@ class DeduplicateNonPDFOutputs:
         )
         duplicates = dedup.find_duplicates()
         deduplication_date = datetime.utcnow().isoformat()
-        total_token_loss = 0
-        total_duplicates = 0
-        duplicate_groups = []
-        group_id_counter = 1
+
+        # Group ids follow the detection order regardless of which worker resolves them
+        numbered = []
         for group in duplicates:
-            files = group.get('files', [])
-            if len(files) <= 1:
-                continue
-            group_id = f"dg-{group_id_counter:03d}"
-            group_id_counter += 1
-            # Find all .json metadata files for group members
-            file_jsons = []
-            for file_path in files:
-                p = Path(file_path)
-                for subdir in ['_extracted', 'low_quality']:
-                    meta_path = p.parent.parent / subdir / (p.stem + '.json')
-                    if meta_path.exists():
-                        file_jsons.append((file_path, meta_path))
-                        break
-            if not file_jsons:
+            if len(group.get('files', [])) <= 1:
                 continue
-            # Determine kept file
-            if self.strategy == 'keep_first':
-                kept_file, kept_json = file_jsons[0]
-            elif self.strategy == 'keep_largest':
-                kept_file, kept_json = max(file_jsons, key=lambda x: get_token_count(x[1]))
-            else:
-                kept_file, kept_json = file_jsons[0]
-            # Calculate token loss for this group
-            kept_tokens = get_token_count(kept_json)
-            group_token_loss = 0
-            duplicates_list = []
-            for file_path, json_path in file_jsons:
-                is_kept = (file_path == kept_file)
-                file_tokens = get_token_count(json_path)
-                loss = 0 if is_kept else file_tokens
-                if not is_kept:
-                    group_token_loss += loss
-                    duplicates_list.append(file_path)
-                update_metadata(json_path, group_id, deduplication_date, kept_file, is_kept, group.get('type'), loss)
-            total_token_loss += group_token_loss
-            total_duplicates += len(duplicates_list)
-            duplicate_groups.append({
-                "group_id": group_id,
-                "type": group.get('type'),
-                "kept_file": kept_file,
-                "duplicates": duplicates_list,
-                "token_loss": group_token_loss
-            })
+            numbered.append((f"dg-{len(numbered) + 1:03d}", group))
+
+        plans = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for batch_plans in executor.map(self._resolve_batch, self._batches(numbered)):
+                plans.extend(batch_plans)
+
+        metadata_ops, file_ops = self._plan_operations(plans, deduplication_date)
+        if self.journal_path:
+            Path(self.journal_path).write_text('', encoding='utf-8')
+        self._journal([dict(op, status='planned') for op in metadata_ops + file_ops])
+
+        if not self.dry_run:
+            self._apply_operations(metadata_ops)
+            if file_ops:
+                self.duplicates_dir.mkdir(parents=True, exist_ok=True)
+                self._apply_operations(file_ops)
+
+        duplicate_groups = [
+            {
+                "group_id": plan['group_id'],
+                "type": plan['type'],
+                "kept_file": plan['kept_file'],
+                "duplicates": [m['file'] for m in plan['members'] if not m['is_kept']],
+                "token_loss": sum(m['tokens'] for m in plan['members'] if not m['is_kept'])
+            }
+            for plan in plans
+        ]
         report = {
             "deduplication_date": deduplication_date,
             "strategy": self.strategy,
+            "dry_run": self.dry_run,
             "total_groups": len(duplicate_groups),
-            "total_duplicates": total_duplicates,
-            "token_loss": total_token_loss,
+            "total_duplicates": sum(len(g['duplicates']) for g in duplicate_groups),
+            "token_loss": sum(g['token_loss'] for g in duplicate_groups),
             "duplicate_groups": duplicate_groups
         }
         if self.report_path:
-            with open(self.report_path, 'w', encoding='utf-8') as f:
-                json.dump(report, f, ensure_ascii=False, indent=2)
+            write_json_atomic(self.report_path, report)
         return report
 
+    def _batches(self, items):
+        for start in range(0, len(items), self.batch_size):
+            yield items[start:start + self.batch_size]
+
+    def _resolve_batch(self, numbered_groups):
+        plans = []
+        for group_id, group in numbered_groups:
+            plan = self._resolve_group(group_id, group)
+            if plan:
+                plans.append(plan)
+        return plans
+
+    def _resolve_group(self, group_id, group):
+        """Pick the kept file of one duplicate group; read-only."""
+        # Find all .json metadata files for group members
+        members = []
+        for file_path in group.get('files', []):
+            p = Path(file_path)
+            for subdir in ['_extracted', 'low_quality']:
+                meta_path = p.parent.parent / subdir / (p.stem + '.json')
+                if meta_path.exists():
+                    members.append({'file': file_path, 'json': str(meta_path), 'tokens': get_token_count(meta_path)})
+                    break
+        if not members:
+            return None
+        # Determine kept file
+        if self.strategy == 'keep_largest':
+            kept = max(members, key=lambda m: m['tokens'])
+        else:
+            kept = members[0]
+        for member in members:
+            member['is_kept'] = member['file'] == kept['file']
+        return {
+            'group_id': group_id,
+            'type': group.get('type'),
+            'kept_file': kept['file'],
+            'members': members
+        }
+
+    def _plan_operations(self, plans, deduplication_date):
+        """Turn resolved groups into per-path operations.
+
+        A file can appear in several groups (hash, title and content matches);
+        the last group wins for metadata, as in serial processing, and a file
+        kept by any group is never moved or deleted.
+        """
+        metadata_updates = {}
+        kept_files = set()
+        duplicate_files = {}
+        for plan in plans:
+            for member in plan['members']:
+                metadata_updates[member['json']] = {
+                    'op': 'update_metadata',
+                    'path': member['json'],
+                    'group_id': plan['group_id'],
+                    'deduplication_date': deduplication_date,
+                    'kept_file': plan['kept_file'],
+                    'is_kept': member['is_kept'],
+                    'group_type': plan['type'],
+                    'token_loss': 0 if member['is_kept'] else member['tokens']
+                }
+                if member['is_kept']:
+                    kept_files.add(member['file'])
+                else:
+                    duplicate_files.setdefault(member['file'], plan['group_id'])
+
+        file_ops = []
+        if self.duplicate_action != 'none':
+            for file_path, group_id in duplicate_files.items():
+                if file_path in kept_files:
+                    continue
+                op = {'op': self.duplicate_action, 'path': file_path, 'group_id': group_id}
+                if self.duplicate_action == 'move':
+                    op['target'] = str(self.duplicates_dir / f"{group_id}_{Path(file_path).name}")
+                file_ops.append(op)
+        return list(metadata_updates.values()), file_ops
+
+    def _apply_operations(self, operations):
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for results in executor.map(self._apply_batch, self._batches(operations)):
+                self._journal(results)
+
+    def _apply_batch(self, operations):
+        results = []
+        for op in operations:
+            try:
+                if op['op'] == 'update_metadata':
+                    ok = update_metadata(op['path'], op['group_id'], op['deduplication_date'], op['kept_file'],
+                                         op['is_kept'], op['group_type'], op['token_loss'])
+                    status = 'applied' if ok else 'failed'
+                elif not Path(op['path']).exists():
+                    status = 'missing'
+                elif op['op'] == 'move':
+                    shutil.move(op['path'], op['target'])
+                    status = 'applied'
+                else:
+                    Path(op['path']).unlink()
+                    status = 'applied'
+            except Exception as e:
+                logger.warning(f"[WARN] Could not {op['op']} {op['path']}: {e}")
+                status = 'failed'
+            results.append(dict(op, status=status))
+        return results
+
+    def _journal(self, entries):
+        if not self.journal_path or not entries:
+            return
+        lines = ''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries)
+        with self._journal_lock:
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(lines)
+
 if __name__ == '__main__':
-    main() 
+    main()
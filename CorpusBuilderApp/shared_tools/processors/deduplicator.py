@@ -10,9 +10,11 @@ logger = logging.getLogger(__name__)
 import hashlib
 import json
 import re
+import zipfile
 import numpy as np
-from collections import defaultdict
-from typing import Dict, List, Optional, Any, Union
+from collections import Counter, defaultdict
+from itertools import combinations
+from typing import Dict, Iterator, List, Optional, Any, Union
 from datetime import datetime
 
 # Third-party imports above
@@ -26,19 +28,131 @@ from shared_tools.config.project_config import ProjectConfig
 logging.basicConfig(filename='deduplication.log', level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
 logger.info('Deduplicator script starting...')
 
+NEAR_DUPLICATE_METHODS = ('minhash', 'simhash')
+SIMHASH_BITS = 64
+SIMHASH_MIN_BAND_BITS = 16  # Narrowest band key, so a bucket holds ~2**-16 of unrelated documents
+SNAPSHOT_MIN_WORDS = 20
+SNAPSHOT_TEXT_PREFIX = "processed/_extracted/"
+_WORD_RE = re.compile(r'\w+')
+
+
+def compute_simhash(text: str, shingle_size: int = 1) -> int:
+    """Return the 64-bit SimHash fingerprint of ``text``.
+
+    Features are lowercased word shingles weighted by their frequency; each is
+    hashed with 8-byte BLAKE2b and a fingerprint bit is set when the features
+    with that bit set carry more than half of the total weight.
+    """
+    words = _WORD_RE.findall(text.lower())
+    if shingle_size > 1 and len(words) >= shingle_size:
+        words = [' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)]
+    features = Counter(words)
+
+    set_weights = [0] * SIMHASH_BITS
+    for feature, count in features.items():
+        h = int.from_bytes(hashlib.blake2b(feature.encode('utf8'), digest_size=8).digest(), 'big')
+        bit = 0
+        while h:
+            if h & 1:
+                set_weights[bit] += count
+            h >>= 1
+            bit += 1
+
+    total = sum(features.values())
+    fingerprint = 0
+    for bit, weight in enumerate(set_weights):
+        if 2 * weight > total:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Return the number of differing bits between two fingerprints."""
+    return bin(a ^ b).count('1')
+
+
+def simhash_bands(max_distance: int) -> List[tuple]:
+    """Split a fingerprint into ``(shift, mask)`` bands for multi-index lookup.
+
+    There are ``max_distance + 1`` bands, but never more than leave each band
+    SIMHASH_MIN_BAND_BITS wide; see :func:`simhash_probe_keys`.
+    """
+    num_bands = min(max_distance + 1, SIMHASH_BITS // SIMHASH_MIN_BAND_BITS)
+    width, extra = divmod(SIMHASH_BITS, num_bands)
+    bands = []
+    shift = 0
+    for band in range(num_bands):
+        band_width = width + (1 if band < extra else 0)
+        bands.append((shift, (1 << band_width) - 1))
+        shift += band_width
+    return bands
+
+
+def simhash_band_keys(fingerprint: int, bands: List[tuple]) -> List[tuple]:
+    """Return the ``(band, value)`` bucket keys a fingerprint is indexed under."""
+    return [(band, (fingerprint >> shift) & mask) for band, (shift, mask) in enumerate(bands)]
+
+
+def simhash_probe_keys(fingerprint: int, bands: List[tuple], max_distance: int) -> Iterator[tuple]:
+    """Yield the bucket keys holding every fingerprint within ``max_distance``.
+
+    By the pigeonhole principle two fingerprints within ``max_distance``
+    differ in at most ``max_distance // len(bands)`` bits of some band, so
+    each band value is probed together with every value within that radius
+    (1 + 16 lookups per band at the default distance of 6). Unrelated
+    fingerprints then share a probed bucket with probability about
+    ``probes / 2**16``: roughly N/960 candidates per document among N at
+    the default distance, against N/75 for seven exact bands of 9 bits.
+    The comparisons still grow quadratically, only with a smaller constant.
+    """
+    radius = max_distance // len(bands)
+    for band, (shift, mask) in enumerate(bands):
+        value = (fingerprint >> shift) & mask
+        for flips in range(radius + 1):
+            for bits in combinations(range(mask.bit_length()), flips):
+                probe = value
+                for bit in bits:
+                    probe ^= 1 << bit
+                yield band, probe
+
+
 class Deduplicator:
     """Identify and remove duplicate content in the corpus"""
     
-    def __init__(self, project_config: ProjectConfig, similarity_threshold: float = 0.8, use_minhash: bool = True):
-        """Initialize the deduplicator with project configuration."""
+    def __init__(self, project_config: Optional[ProjectConfig] = None, similarity_threshold: float = 0.8, use_minhash: bool = True,
+                 near_duplicate_method: str = 'minhash', simhash_max_distance: int = 6,
+                 corpus_dir: Optional[Union[str, Path]] = None):
+        """Initialize the deduplicator with project configuration.
+
+        Args:
+            project_config: Project configuration
+            similarity_threshold: Jaccard threshold for the MinHash LSH path
+            use_minhash: Enable near-duplicate content detection
+            near_duplicate_method: ``'minhash'`` (128-permutation MinHash LSH over
+                5-char shingles) or ``'simhash'`` (64-bit frequency-weighted SimHash
+                over words, cheaper for large volumes of short documents)
+            simhash_max_distance: Maximum Hamming distance between SimHash
+                fingerprints for two documents to be grouped
+            corpus_dir: Directory to deduplicate; overrides the project
+                config input directory and allows running without a config
+        """
+        if project_config is None and corpus_dir is None:
+            raise ValueError("Either project_config or corpus_dir is required")
+        if near_duplicate_method not in NEAR_DUPLICATE_METHODS:
+            raise ValueError(f"Unknown near-duplicate method: {near_duplicate_method}")
+        if not 0 <= simhash_max_distance < SIMHASH_BITS:
+            raise ValueError(f"simhash_max_distance must be between 0 and {SIMHASH_BITS - 1}")
 
         self.project_config = project_config
-        self.corpus_dir = Path(project_config.get_input_dir())
+        self.corpus_dir = Path(corpus_dir) if corpus_dir else Path(project_config.get_input_dir())
         self.similarity_threshold = similarity_threshold
         self.use_minhash = use_minhash
+        self.near_duplicate_method = near_duplicate_method
+        self.simhash_max_distance = simhash_max_distance
 
         # Log file setup
-        self.log_path = project_config.get_logs_dir() / "dedup_log.jsonl"
+        logs_dir = project_config.get_logs_dir() if project_config else Path.home() / ".cryptofinance" / "logs"
+        self.log_path = Path(logs_dir) / "dedup_log.jsonl"
         self.log_path.parent.mkdir(parents=True, exist_ok=True)
         
         # Indexes for duplicate detection
@@ -46,6 +160,15 @@ class Deduplicator:
         self.sha256_index = {}  # Maps SHA256 hash to file paths
         self.title_index = {}  # Maps normalized title to document info
         self.minhash_index = {}  # Maps MinHash signatures to document info
+        self.token_index = {}  # Maps file path to its extracted token count
+        self.processed_files: set[str] = set()
+
+        # Fingerprints of previously exported corpora, kept beside the main
+        # index so rebuilding the corpus index never drops them
+        self.snapshot_index_path = self.corpus_dir / "deduplication_snapshots.json"
+        self.snapshot_index = {}  # Maps snapshot name to its fingerprint records
+        self._snapshot_exact = {}  # Maps SHA256 to (snapshot, member)
+        self._snapshot_buckets = defaultdict(list)  # Maps SimHash band to [(fingerprint, snapshot, member)]
         
         # Configure logging
         self.logger = logging.getLogger("deduplicator")
@@ -78,8 +201,12 @@ class Deduplicator:
                     self.sha256_index = index_data.get('sha256_index', {})
                     self.title_index = index_data.get('title_index', {})
                     # MinHash index is rebuilt each time due to its structure
-                    self.logger.info(f"Loaded existing deduplication index with {len(self.file_hashes)} entries")
-                    return True
+                    if 'token_index' in index_data:
+                        self.token_index = index_data['token_index']
+                        self.logger.info(f"Loaded existing deduplication index with {len(self.file_hashes)} entries")
+                        return True
+                    # Indexes written before token counts were tracked must be rebuilt
+                    self.logger.info("Existing deduplication index has no token counts, rebuilding")
             except Exception as e:
                 self.logger.error(f"Error loading existing index: {e}")
                 # Continue and rebuild the index
@@ -90,6 +217,7 @@ class Deduplicator:
         self.sha256_index = {}
         self.title_index = {}
         self.minhash_index = {}
+        self.token_index = {}
         seen_hashes: set[str] = set()
         
         # Scan all files in the corpus directory
@@ -120,6 +248,9 @@ class Deduplicator:
                 self.sha256_index.setdefault(sha256, []).append(str(file_path))
             
             if file_hash:
+                # Count tokens once here so deduplicate() never rereads the corpus
+                self.token_index[str(file_path)] = self._get_file_token_count(file_path)
+
                 # Check if this hash already exists
                 if file_hash in self.file_hashes:
                     self.file_hashes[file_hash].append(str(file_path))
@@ -148,21 +279,38 @@ class Deduplicator:
                                 'original_title': title
                             }]
         
-        # Save the index
+        self._save_index()
+        
+        logger.info('scan_corpus called')
+        return True
+    
+    def _save_index(self):
+        """Write the duplicate and token indexes to ``deduplication_index.json``"""
+        index_path = self.corpus_dir / "deduplication_index.json"
         try:
             with open(index_path, 'w') as f:
                 json.dump({
                     'file_hashes': self.file_hashes,
                     'sha256_index': self.sha256_index,
-                    'title_index': self.title_index
+                    'title_index': self.title_index,
+                    'token_index': self.token_index
                 }, f, indent=2)
                 
             self.logger.info(f"Saved deduplication index with {len(self.file_hashes)} file hashes and {len(self.title_index)} titles")
         except Exception as e:
             self.logger.error(f"Error saving deduplication index: {e}")
-        
-        logger.info('scan_corpus called')
-        return True
+    
+    def _drop_from_index(self, removed_files):
+        """Remove deleted or moved files from the hash and title indexes"""
+        for index in (self.file_hashes, self.sha256_index):
+            for key in list(index):
+                index[key] = [path for path in index[key] if path not in removed_files]
+                if not index[key]:
+                    del index[key]
+        for key in list(self.title_index):
+            self.title_index[key] = [entry for entry in self.title_index[key] if entry['path'] not in removed_files]
+            if not self.title_index[key]:
+                del self.title_index[key]
     
     def find_duplicates(self, file_paths: Optional[List[str]] = None, threshold: Optional[float] = None):
         """Find duplicate content.
@@ -256,18 +404,20 @@ class Deduplicator:
         Returns:
             list: Details of deduplicated files
         """
-        # --- Token count before deduplication ---
-        domain_token_counts_before = self._get_domain_token_counts()
-        total_tokens_before = sum(domain_token_counts_before.values())
-        
-        logger.info('Token count before deduplication:', domain_token_counts_before)
-        
         # Find duplicates
         duplicates = self.find_duplicates(file_paths)
         if not duplicates:
             self.logger.info("No duplicates found")
             return []
         self.logger.info(f"Found {len(duplicates)} duplicate groups")
+
+        # --- Token count before deduplication (from the scan index) ---
+        if not self.token_index:
+            self.scan_corpus()
+        domain_token_counts_before = self._get_domain_token_counts()
+        total_tokens_before = sum(domain_token_counts_before.values())
+
+        logger.info('Token count before deduplication: %s', domain_token_counts_before)
         
         # Process each duplicate group
         deduplicated = []
@@ -280,7 +430,7 @@ class Deduplicator:
             if strategy == 'keep_first':
                 keep_file = files[0]
             elif strategy == 'keep_largest':
-                keep_file = max(files, key=lambda f: self._get_file_token_count(f))
+                keep_file = max(files, key=self._get_indexed_token_count)
             else:
                 keep_file = files[0]
             for f in files:
@@ -290,6 +440,7 @@ class Deduplicator:
         # Move or delete duplicates
         duplicates_dir = self.corpus_dir / 'duplicates'
         duplicates_dir.mkdir(exist_ok=True)
+        removed_files = set()
         for f in files_to_remove:
             src = Path(f)
             if str(src) in self.processed_files:
@@ -303,6 +454,7 @@ class Deduplicator:
                     self.logger.info(f"Moved duplicate: {src} -> {dst}")
                     self._append_log(str(src), "deduplicated")
                     self.processed_files.add(str(src))
+                    removed_files.add(str(src))
                 except Exception as e:
                     self.logger.error(f"Error moving {src}: {e}")
             else:
@@ -313,16 +465,26 @@ class Deduplicator:
                         self.logger.info(f"Deleted duplicate: {src}")
                         self._append_log(str(src), "deduplicated")
                         self.processed_files.add(str(src))
+                        removed_files.add(str(src))
                     except Exception as e:
                         self.logger.error(f"Error deleting {src}: {e}")
                 else:
                     self.logger.warning(f"File not found, skipping delete: {src}")
             
-        # --- Token count after deduplication ---
-        domain_token_counts_after = self._get_domain_token_counts()
+        # --- Token count after deduplication (index arithmetic, no rescan) ---
+        domain_token_counts_after = dict(domain_token_counts_before)
+        for f in removed_files:
+            domain = self._get_token_domain(f)
+            tokens = self.token_index.pop(f, 0)
+            if domain in domain_token_counts_after:
+                domain_token_counts_after[domain] -= tokens
         total_tokens_after = sum(domain_token_counts_after.values())
+        if removed_files:
+            # Persist the pruned indexes so the next run does not count removed files
+            self._drop_from_index(removed_files)
+            self._save_index()
         
-        logger.info('Token count after deduplication:', domain_token_counts_after)
+        logger.info('Token count after deduplication: %s', domain_token_counts_after)
         
         # --- Token loss report ---
         token_loss_stats = {}
@@ -343,7 +505,7 @@ class Deduplicator:
             'tokens_lost': total_tokens_before - total_tokens_after,
             'percent_loss': ((total_tokens_before - total_tokens_after) / total_tokens_before * 100) if total_tokens_before > 0 else 0
         }
-        logger.info('Token loss stats:', token_loss_stats)
+        logger.info('Token loss stats: %s', token_loss_stats)
         if token_loss_report:
             with open(token_loss_report, 'w') as f:
                 json.dump(token_loss_stats, f, indent=2)
@@ -419,97 +581,37 @@ class Deduplicator:
         return normalized
     
     def _find_content_duplicates(self, min_text_length=1000):
-        """Find files with similar content using datasketch MinHash and LSH (scalable version)."""
-        logger.info('_find_content_duplicates (LSH) called')
+        """Find files with similar content using the configured near-duplicate method."""
+        logger.info(f'_find_content_duplicates ({self.near_duplicate_method}) called')
         try:
-            import sys
-            from pathlib import Path
-            sys.path.append(str(Path(__file__).resolve().parent.parent))
-            from datasketch import MinHash, MinHashLSH
-            from processors.text_extractor import TextExtractor
-            from shared_tools.storage.corpus_manager import CorpusManager
-            import hashlib
-            
-            corpus_manager = CorpusManager(self.corpus_dir)
-            logger.debug(f"[DEBUG] CorpusManager loading from: {corpus_manager.metadata_file}")
-            logger.debug(f"[DEBUG] Documents loaded: {len(corpus_manager.metadata.get('documents', {}))}")
-            extractor = TextExtractor()
-            documents = corpus_manager.metadata.get("documents", {})
-            if not documents:
-                self.logger.warning("No documents found in corpus metadata")
+            doc_contents = self._load_document_texts(min_text_length)
+            if not doc_contents:
                 return []
-            
-            num_perm = 128
-            lsh = MinHashLSH(threshold=self.similarity_threshold, num_perm=num_perm)
-            doc_minhashes = {}
-            doc_contents = {}
-            valid, skipped = 0, 0
-            
-            def create_shingles(text, k=5):
-                return set(text[i:i+k] for i in range(len(text) - k + 1))
-
-            for doc_id, doc_info in documents.items():
-                path = doc_info.get("extracted_text_path")
-                if not path:
-                    # Fallback: try to reconstruct path
-                    domain = doc_info.get("domain")
-                    stem = Path(doc_info.get("filename", "")).stem
-                    fallback = self.corpus_dir / f"{domain}_extracted" / f"{stem}.txt"
-                    if fallback.exists():
-                        path = str(fallback)
-                        doc_info["extracted_text_path"] = path
-                    else:
-                        skipped += 1
-                    continue
-                try:
-                    with open(path, 'r', encoding='utf-8') as f:
-                        text = f.read()
-                    if len(text) < min_text_length:
-                        skipped += 1
-                        continue
-                    valid += 1
-                    shingles = create_shingles(text)
-                    m = MinHash(num_perm=num_perm)
-                    for shingle in shingles:
-                        m.update(shingle.encode('utf8'))
-                    doc_minhashes[doc_id] = m
-                    doc_contents[doc_id] = {
-                        "text": text,
-                        "path": doc_info.get("path"),
-                        "extracted_path": path
-                    }
-                    lsh.insert(doc_id, m)
-                except Exception as e:
-                    self.logger.error(f"Error processing {doc_id}: {e}")
-                    skipped += 1
 
-            logger.info(f"[MinHashLSH] Valid docs: {valid}, Skipped: {skipped}")
-            if valid == 0:
-                self.logger.warning("All documents skipped — no MinHash input. Check extraction and metadata.")
-                return []
+            texts = {doc_id: doc["text"] for doc_id, doc in doc_contents.items()}
+            if self.near_duplicate_method == 'simhash':
+                doc_groups = self._group_by_simhash(texts)
+                label = "SimHash"
+            else:
+                doc_groups = self._group_by_minhash(texts)
+                label = "MinHashLSH"
 
-            # Find duplicate groups using LSH
-            seen = set()
             groups = []
-            for doc_id, m in doc_minhashes.items():
-                if doc_id in seen:
-                    continue
-                # Query for near-duplicates
-                candidates = lsh.query(m)
-                group = [d for d in candidates if d != doc_id and d not in seen]
-                if group:
-                    group = [doc_id] + group
-                    for d in group:
-                        seen.add(d)
-                    files = [doc_contents[d]["path"] for d in group if "path" in doc_contents[d]]
-                    if len(files) > 1:
-                        groups.append({
-                            "type": "similar_content",
-                            "files": files,
-                            "similarity_threshold": self.similarity_threshold
-                        })
-            self.logger.info(f"Found {len(groups)} content similarity duplicate groups (MinHashLSH)")
-            logger.info(f"✅ MinHashLSH duplicate groups: {len(groups)}")
+            for group in doc_groups:
+                files = [doc_contents[d]["path"] for d in group if doc_contents[d].get("path")]
+                if len(files) > 1:
+                    entry = {
+                        "type": "similar_content",
+                        "files": files,
+                        "method": self.near_duplicate_method,
+                    }
+                    if self.near_duplicate_method == 'simhash':
+                        entry["max_hamming_distance"] = self.simhash_max_distance
+                    else:
+                        entry["similarity_threshold"] = self.similarity_threshold
+                    groups.append(entry)
+            self.logger.info(f"Found {len(groups)} content similarity duplicate groups ({label})")
+            logger.info(f"✅ {label} duplicate groups: {len(groups)}")
             return groups
         except ImportError as e:
             self.logger.error(f"Error importing required modules for content similarity: {e}")
@@ -519,36 +621,150 @@ class Deduplicator:
             self.logger.error(f"Error finding content duplicates: {e}")
             logger.warning(f"Error finding content duplicates: {e}")
             return []
-    
+
+    def _load_document_texts(self, min_text_length=1000):
+        """Load extracted text for every document listed in the corpus metadata."""
+        corpus_manager = CorpusManager(self.corpus_dir)
+        logger.debug(f"[DEBUG] CorpusManager loading from: {corpus_manager.metadata_file}")
+        logger.debug(f"[DEBUG] Documents loaded: {len(corpus_manager.metadata.get('documents', {}))}")
+        documents = corpus_manager.metadata.get("documents", {})
+        if not documents:
+            self.logger.warning("No documents found in corpus metadata")
+            return {}
+
+        doc_contents = {}
+        valid, skipped = 0, 0
+        for doc_id, doc_info in documents.items():
+            path = doc_info.get("extracted_text_path")
+            if not path:
+                # Fallback: try to reconstruct path
+                domain = doc_info.get("domain")
+                stem = Path(doc_info.get("filename", "")).stem
+                fallback = self.corpus_dir / f"{domain}_extracted" / f"{stem}.txt"
+                if fallback.exists():
+                    path = str(fallback)
+                    doc_info["extracted_text_path"] = path
+                else:
+                    skipped += 1
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    text = f.read()
+                if len(text) < min_text_length:
+                    skipped += 1
+                    continue
+                valid += 1
+                doc_contents[doc_id] = {
+                    "text": text,
+                    "path": doc_info.get("path"),
+                    "extracted_path": path
+                }
+            except Exception as e:
+                self.logger.error(f"Error processing {doc_id}: {e}")
+                skipped += 1
+
+        logger.info(f"[{self.near_duplicate_method}] Valid docs: {valid}, Skipped: {skipped}")
+        if valid == 0:
+            self.logger.warning("All documents skipped — no near-duplicate input. Check extraction and metadata.")
+        return doc_contents
+
+    def _group_by_minhash(self, texts: Dict[str, str]) -> List[List[str]]:
+        """Group document ids whose MinHash LSH signatures collide."""
+        from datasketch import MinHash, MinHashLSH
+
+        num_perm = 128
+        lsh = MinHashLSH(threshold=self.similarity_threshold, num_perm=num_perm)
+        doc_minhashes = {}
+
+        def create_shingles(text, k=5):
+            return set(text[i:i+k] for i in range(len(text) - k + 1))
+
+        for doc_id, text in texts.items():
+            m = MinHash(num_perm=num_perm)
+            for shingle in create_shingles(text):
+                m.update(shingle.encode('utf8'))
+            doc_minhashes[doc_id] = m
+            lsh.insert(doc_id, m)
+
+        # Find duplicate groups using LSH
+        seen = set()
+        groups = []
+        for doc_id, m in doc_minhashes.items():
+            if doc_id in seen:
+                continue
+            # Query for near-duplicates
+            candidates = lsh.query(m)
+            group = [d for d in candidates if d != doc_id and d not in seen]
+            if group:
+                group = [doc_id] + group
+                seen.update(group)
+                groups.append(group)
+        return groups
+
+    def _group_by_simhash(self, texts: Dict[str, str]) -> List[List[str]]:
+        """Group document ids whose SimHash fingerprints are within the Hamming threshold.
+
+        Fingerprints are indexed by band (see :func:`simhash_probe_keys`), so
+        only documents found in a probed bucket are compared.
+        """
+        fingerprints = {doc_id: compute_simhash(text) for doc_id, text in texts.items()}
+        bands = simhash_bands(self.simhash_max_distance)
+
+        buckets = defaultdict(list)
+        for doc_id, fp in fingerprints.items():
+            for key in simhash_band_keys(fp, bands):
+                buckets[key].append(doc_id)
+
+        seen = set()
+        groups = []
+        for doc_id, fp in fingerprints.items():
+            if doc_id in seen:
+                continue
+            group = [doc_id]
+            checked = {doc_id}
+            for key in simhash_probe_keys(fp, bands, self.simhash_max_distance):
+                for other in buckets.get(key, ()):
+                    if other in checked or other in seen:
+                        continue
+                    checked.add(other)
+                    if hamming_distance(fp, fingerprints[other]) <= self.simhash_max_distance:
+                        group.append(other)
+            if len(group) > 1:
+                seen.update(group)
+                groups.append(group)
+        return groups
+
     def _get_domain_token_counts(self):
-        """Helper to count total tokens per domain in the corpus."""
+        """Helper to total indexed token counts per domain in the corpus."""
         domain_token_counts = {}
         for domain_dir in self.corpus_dir.glob("*"):
             if domain_dir.is_dir() and not domain_dir.name.endswith("_extracted"):
-                domain = domain_dir.name
-                token_count = 0
-                pdf_files = list(domain_dir.glob("*.pdf"))
-                for pdf_path in pdf_files:
-                    extracted_dir = self.corpus_dir / f"{domain}_extracted"
-                    extracted_path = extracted_dir / f"{pdf_path.stem}.txt"
-                    extracted_meta_path = extracted_path.with_suffix(".meta.json")
-                    if extracted_meta_path.exists():
-                        try:
-                            with open(extracted_meta_path, 'r') as f:
-                                ext_meta = json.load(f)
-                                token_count += ext_meta.get("tokens", 0)
-                        except Exception as exc:
-                            logger.exception("Unhandled exception in token count read: %s", exc)
-                    elif extracted_path.exists():
-                        try:
-                            with open(extracted_path, 'r', encoding='utf-8', errors='ignore') as f:
-                                text = f.read()
-                                token_count += len(text.split())
-                        except Exception as exc:
-                            logger.exception("Unhandled exception in file read: %s", exc)
-                domain_token_counts[domain] = token_count
+                domain_token_counts[domain_dir.name] = 0
+        for path, tokens in self.token_index.items():
+            domain = self._get_token_domain(path)
+            if domain in domain_token_counts:
+                domain_token_counts[domain] += tokens
         return domain_token_counts
 
+    def _get_token_domain(self, file_path):
+        """Return the domain a file's tokens count towards, or None.
+
+        Only PDFs stored directly in a domain directory contribute to the
+        per-domain totals, matching the layout of the extracted text dirs.
+        """
+        file_path = Path(file_path)
+        if file_path.suffix.lower() != '.pdf' or file_path.parent.parent != self.corpus_dir:
+            return None
+        return file_path.parent.name
+
+    def _get_indexed_token_count(self, file_path):
+        """Return the token count recorded during the scan, counting on a miss."""
+        tokens = self.token_index.get(str(file_path))
+        if tokens is None:
+            tokens = self._get_file_token_count(file_path)
+            self.token_index[str(file_path)] = tokens
+        return tokens
+
     def _get_file_token_count(self, file_path):
         """Helper to get token count for a single file (by looking up extracted text/meta)."""
         file_path = Path(file_path)
@@ -609,6 +825,150 @@ class Deduplicator:
         """Return simple processing statistics."""
         return {"processed": len(self.processed_files)}
 
+    def load_snapshot_index(self) -> bool:
+        """Load stored snapshot fingerprints and build the lookup tables."""
+        if not self.snapshot_index_path.exists():
+            return False
+        try:
+            with open(self.snapshot_index_path, 'r') as f:
+                self.snapshot_index = json.load(f).get('snapshots', {})
+        except Exception as e:
+            self.logger.error(f"Error loading snapshot index: {e}")
+            return False
+        self._build_snapshot_lookup()
+        return True
+
+    def register_snapshot(self, snapshot_path: Union[str, Path], name: Optional[str] = None) -> int:
+        """Fingerprint an exported corpus and add it to the snapshot index.
+
+        ``snapshot_path`` is a ZIP produced by ``tools/export_corpus.py`` or an
+        unpacked copy of one. For every extracted text the SHA256 of its bytes
+        and a SimHash fingerprint are stored, so later checks never reopen the
+        snapshot. Registering the same name again replaces its fingerprints.
+
+        Returns:
+            Number of documents fingerprinted
+        """
+        snapshot_path = Path(snapshot_path)
+        name = name or snapshot_path.stem
+        if not self.snapshot_index:
+            self.load_snapshot_index()
+
+        documents = []
+        corpus_version = None
+        for member, data in self._iter_snapshot_texts(snapshot_path):
+            if member == 'manifest.json':
+                corpus_version = json.loads(data).get('corpus_version')
+                continue
+            sha256, simhash = self._fingerprint_bytes(data)
+            documents.append([member, sha256, None if simhash is None else f"{simhash:016x}"])
+
+        self.snapshot_index[name] = {
+            'source': str(snapshot_path),
+            'corpus_version': corpus_version,
+            'registered': datetime.utcnow().isoformat(),
+            'documents': documents,
+        }
+        self._build_snapshot_lookup()
+        try:
+            with open(self.snapshot_index_path, 'w') as f:
+                json.dump({'snapshots': self.snapshot_index}, f)
+        except Exception as e:
+            self.logger.error(f"Error saving snapshot index: {e}")
+        self.logger.info(f"Registered snapshot {name} with {len(documents)} documents")
+        return len(documents)
+
+    def check_against_snapshots(self, file_paths: List[str]) -> List[Dict[str, Any]]:
+        """Return duplicate entries for files already present in registered snapshots.
+
+        Only the given files are read; each is matched by exact hash first and
+        otherwise by SimHash band lookup within ``simhash_max_distance``.
+        """
+        if not self.snapshot_index:
+            self.load_snapshot_index()
+        if not self.snapshot_index:
+            return []
+
+        duplicates = []
+        for path in file_paths:
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+            except Exception as e:
+                self.logger.error(f"Error reading {path}: {e}")
+                continue
+            sha256, simhash = self._fingerprint_bytes(data)
+
+            exact = self._snapshot_exact.get(sha256)
+            if exact:
+                duplicates.append({
+                    'type': 'snapshot_hash',
+                    'files': [str(path)],
+                    'snapshot': exact[0],
+                    'snapshot_file': exact[1],
+                    'similarity': 1.0,
+                })
+                continue
+            if simhash is None:
+                continue
+
+            best = None
+            bands = simhash_bands(self.simhash_max_distance)
+            for key in simhash_probe_keys(simhash, bands, self.simhash_max_distance):
+                for fingerprint, snapshot, member in self._snapshot_buckets.get(key, ()):
+                    distance = hamming_distance(simhash, fingerprint)
+                    if distance <= self.simhash_max_distance and (best is None or distance < best[0]):
+                        best = (distance, snapshot, member)
+            if best:
+                duplicates.append({
+                    'type': 'snapshot_similar_content',
+                    'files': [str(path)],
+                    'snapshot': best[1],
+                    'snapshot_file': best[2],
+                    'hamming_distance': best[0],
+                })
+
+        self.logger.info(f"Found {len(duplicates)} of {len(file_paths)} files in registered snapshots")
+        return duplicates
+
+    def _build_snapshot_lookup(self) -> None:
+        self._snapshot_exact = {}
+        self._snapshot_buckets = defaultdict(list)
+        bands = simhash_bands(self.simhash_max_distance)
+        for snapshot, info in self.snapshot_index.items():
+            for member, sha256, simhash_hex in info.get('documents', []):
+                self._snapshot_exact.setdefault(sha256, (snapshot, member))
+                if simhash_hex is None:
+                    continue
+                fingerprint = int(simhash_hex, 16)
+                for key in simhash_band_keys(fingerprint, bands):
+                    self._snapshot_buckets[key].append((fingerprint, snapshot, member))
+
+    def _iter_snapshot_texts(self, snapshot_path: Path):
+        """Yield ``(member, bytes)`` for the manifest and extracted texts of a snapshot."""
+        if zipfile.is_zipfile(snapshot_path):
+            with zipfile.ZipFile(snapshot_path) as zf:
+                for member in zf.namelist():
+                    if member == 'manifest.json' or (member.startswith(SNAPSHOT_TEXT_PREFIX) and member.endswith('.txt')):
+                        yield member, zf.read(member)
+        elif snapshot_path.is_dir():
+            manifest = snapshot_path / 'manifest.json'
+            if manifest.exists():
+                yield 'manifest.json', manifest.read_bytes()
+            for text_path in sorted((snapshot_path / SNAPSHOT_TEXT_PREFIX).rglob('*.txt')):
+                yield text_path.relative_to(snapshot_path).as_posix(), text_path.read_bytes()
+        else:
+            raise ValueError(f"Snapshot must be an export ZIP or directory: {snapshot_path}")
+
+    @staticmethod
+    def _fingerprint_bytes(data: bytes):
+        """Return ``(sha256, simhash)``; SimHash is None for very short texts."""
+        sha256 = hashlib.sha256(data).hexdigest()
+        text = data.decode('utf-8', errors='ignore')
+        if len(_WORD_RE.findall(text)) < SNAPSHOT_MIN_WORDS:
+            return sha256, None
+        return sha256, compute_simhash(text)
+
 def run_with_project_config(project: 'ProjectConfig', verbose: bool = False):
     """Run deduplicator with project configuration
     
@@ -624,6 +984,8 @@ def run_with_project_config(project: 'ProjectConfig', verbose: bool = False):
         project_config=project,
         similarity_threshold=cfg.get('similarity_threshold', 0.8),
         use_minhash=cfg.get('use_minhash', True),
+        near_duplicate_method=cfg.get('near_duplicate_method', 'minhash'),
+        simhash_max_distance=cfg.get('simhash_max_distance', 6),
     )
     
     # Run deduplication
@@ -645,8 +1007,19 @@ def main():
     parser = argparse.ArgumentParser(description='Deduplicate corpus content')
     parser.add_argument('--project-config', required=True, help='Path to project config file')
     parser.add_argument('--verbose', action='store_true', help='Enable verbose output')
+    parser.add_argument('--register-snapshot', action='append', default=[], help='Exported corpus ZIP or directory to fingerprint for cross-run checks')
+    parser.add_argument('--check-snapshots', nargs='+', help='Extracted text files to check against registered snapshots')
     args = parser.parse_args()
 
+    if args.register_snapshot or args.check_snapshots:
+        deduplicator = Deduplicator(project_config=ProjectConfig.load(args.project_config))
+        for snapshot in args.register_snapshot:
+            count = deduplicator.register_snapshot(snapshot)
+            logger.info(f"Registered {count} documents from {snapshot}")
+        for dup in deduplicator.check_against_snapshots(args.check_snapshots or []):
+            logger.info(f"{dup['files'][0]} already exported in {dup['snapshot']}: {dup['snapshot_file']}")
+        return
+
     if args.project_config:
         # Use project config
         project = ProjectConfig.load(args.project_config)
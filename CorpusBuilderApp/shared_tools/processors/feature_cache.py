@@ -0,0 +1,205 @@
+"""
+Module: feature_cache
+Purpose: Bounded, optionally persisted memo of JSON-serialisable analysis
+results keyed by text (formula features, image analyses), so work repeated
+across the corpus is done once.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Type, TypeVar, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 50_000
+DEFAULT_FLUSH_EVERY = 1_000
+
+_shared_caches: Dict[Any, 'FeatureCache'] = {}
+
+C = TypeVar('C', bound='FeatureCache')
+
+
+class FeatureCache:
+    """LRU memo of per-key features, optionally backed by SQLite
+
+    At most ``max_entries`` features are held in memory (0 disables
+    caching), the least recently used evicted first. With a ``path``, the
+    ``max_entries`` most recently stored rows of the current ``version`` are
+    loaded on first use and new entries are written back by :meth:`flush`,
+    which runs every ``flush_every`` new entries and trims the table to
+    ``max_entries`` rows. Each process opens its own connection, so an
+    instance can be shared with (or recreated in) pool workers.
+
+    Subclasses name their ``table`` (and its ``key_column``) and may
+    normalise keys in :meth:`key`.
+    """
+
+    table = 'features'
+    key_column = 'key'
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, version: str = '1',
+                 max_entries: int = DEFAULT_MAX_ENTRIES, flush_every: int = DEFAULT_FLUSH_EVERY,
+                 timeout: float = 30.0):
+        self.path = Path(path) if path else None
+        self.version = version
+        self.max_entries = max_entries
+        self.flush_every = flush_every
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._loaded = self.path is None
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+    @staticmethod
+    def key(text: str) -> str:
+        return text
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=self.timeout, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                f'CREATE TABLE IF NOT EXISTS {self.table} ({self.key_column} TEXT PRIMARY KEY, '
+                'version TEXT NOT NULL, features TEXT NOT NULL, updated REAL NOT NULL)'
+            )
+            conn.commit()
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def _load(self) -> None:
+        self._loaded = True
+        try:
+            rows = self._connection().execute(
+                f'SELECT {self.key_column}, features FROM {self.table} '
+                'WHERE version = ? ORDER BY updated DESC LIMIT ?',
+                (self.version, self.max_entries)
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not load cached features from {self.path}: {e}")
+            return
+        for key, features in reversed(rows):
+            self._entries[key] = json.loads(features)
+
+    def get(self, text: str) -> Optional[Dict[str, Any]]:
+        """Stored features of ``text``, counted as a hit, or None, counted as a miss
+
+        The result is shared; callers must not modify it.
+        """
+        key = self.key(text)
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            features = self._entries.get(key)
+            if features is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return features
+
+    def put(self, text: str, features: Dict[str, Any]) -> None:
+        """Store ``features`` of ``text``, replacing any stored before"""
+        if self.max_entries <= 0:
+            return
+        key = self.key(text)
+        flush = False
+        with self._lock:
+            self._entries[key] = features
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if self.path is not None:
+                self._pending[key] = features
+                flush = len(self._pending) >= self.flush_every
+        if flush:
+            self.flush()
+
+    def get_or_compute(self, text: str, compute: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
+        """Stored features of ``text``, or ``compute`` of its key, stored
+
+        ``compute`` receives the normalised key, so every variant of ``text``
+        with the same key gets the same features. The result is shared;
+        callers must not modify it.
+        """
+        features = self.get(text)
+        if features is None:
+            features = compute(self.key(text))
+            self.put(text, features)
+        return features
+
+    def flush(self) -> int:
+        """Write entries computed since the last flush to ``path``"""
+        with self._lock:
+            if self.path is None or not self._pending:
+                return 0
+            pending, self._pending = self._pending, {}
+            try:
+                conn = self._connection()
+                now = time.time()
+                conn.executemany(
+                    f'INSERT OR REPLACE INTO {self.table} ({self.key_column}, version, features, updated) '
+                    'VALUES (?, ?, ?, ?)',
+                    ((key, self.version, json.dumps(features), now) for key, features in pending.items())
+                )
+                conn.execute(
+                    f'DELETE FROM {self.table} WHERE version != ? OR {self.key_column} IN '
+                    f'(SELECT {self.key_column} FROM {self.table} ORDER BY updated DESC LIMIT -1 OFFSET ?)',
+                    (self.version, self.max_entries)
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Could not store cached features in {self.path}: {e}")
+                return 0
+        return len(pending)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self._entries)
+        }
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+            self._pid = None
+
+    def __getstate__(self):
+        # Entries, connections and locks stay behind; the copy reloads lazily
+        return {'path': self.path, 'version': self.version, 'max_entries': self.max_entries,
+                'flush_every': self.flush_every, 'timeout': self.timeout}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+
+def shared_cache(cls: Type[C], path: Optional[Union[str, Path]] = None, version: str = '1',
+                 max_entries: int = DEFAULT_MAX_ENTRIES) -> C:
+    """Process-wide ``cls`` cache for ``path`` (or the in-memory one)
+
+    Processors are often created per document; sharing the cache lets
+    work repeated across documents hit it.
+    """
+    key = (cls, str(path) if path else None, version, max_entries)
+    cache = _shared_caches.get(key)
+    if cache is None:
+        cache = _shared_caches[key] = cls(path, version, max_entries)
+    return cache
@@ -7,15 +7,74 @@ Handles ticker symbols, mathematical notation, Greek letters, and financial abbr
 import re
 import json
 import unicodedata
-from typing import Dict, List, Set, Any, Optional, Tuple
+from typing import Dict, Iterator, List, Set, Any, Optional, Tuple
 from pathlib import Path
 import logging
-from collections import defaultdict, Counter
+from collections import defaultdict, deque, Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from .formula_extractor import FormulaExtractor
 from .chart_image_extractor import ChartImageExtractor
 from shared_tools.config.project_config import ProjectConfig
 logger = logging.getLogger(__name__)
 
+# Characters of surrounding text kept as each symbol's context
+SYMBOL_CONTEXT_CHARS = 30
+# Placeholders written by FinancialSymbolProcessor.preserve_symbols_in_text
+_PLACEHOLDER_RE = re.compile(r'__SYMBOL_\d+__')
+
+_CURRENCY_SIGNS = '$€£¥₹₽₩₪₦₡'
+_GREEK_LETTERS = 'αβγδεζηθικλμνξοπρστυφχψωΑΒΓΔΕΖΗΘΙΚΛΜΝΞΟΠΡΣΤΥΦΧΨΩ'
+_MATHEMATICAL_SYMBOLS = '∞∂∇∑∏∫√±≤≥≠≈∈∉⊂⊃∩∪∅ℝℕℤℚ→←↑↓⇒⇔'
+
+_SYMBOL_PATTERNS = {
+    # Stock ticker pattern (1-5 uppercase letters, possibly with dots)
+    'stock_ticker': r'\b[A-Z]{1,5}(?:\.[A-Z]{1,2})?\b',
+    # Crypto symbol pattern (2-10 chars, mostly uppercase)
+    'crypto_symbol': r'\b[A-Z]{2,10}\b',
+    # Currency amounts (symbol + number or number + code)
+    'currency_amount': rf'(?:[{_CURRENCY_SIGNS}]\s*\d+(?:,\d{{3}})*(?:\.\d{{2}})?|\d+(?:,\d{{3}})*(?:\.\d{{2}})?\s*(?:USD|EUR|GBP|JPY|CHF|CAD|AUD|NZD|CNY|INR|BRL|RUB|KRW|SGD|HKD|NOK|SEK))',
+    # Greek letters
+    'greek_letter': f'[{_GREEK_LETTERS}]',
+    # Mathematical symbols
+    'mathematical_symbol': f'[{_MATHEMATICAL_SYMBOLS}]',
+    # Financial ratios and metrics
+    'financial_ratio': r'\b(?:P/E|P/B|ROE|ROA|EBITDA|WACC|CAPM|VaR|CVaR|PnL|P&L|NAV|AUM|IRR|NPV|CAGR|YTD|QoQ|YoY|MoM|ATH|ATL|RSI|MACD|SMA|EMA|BB|ADX|CCI|MFI|OBV)\b',
+    # DeFi and crypto terms
+    'defi_term': r'\b(?:DeFi|DAO|NFT|DEX|CEX|LP|AMM|TVL|APY|APR|IL|MEV|PoS|PoW|TPS)\b',
+    # Percentage with optional basis points
+    'percentage': r'\d+(?:\.\d+)?%|\d+(?:\.\d+)?\s*bps?\b',
+    # Scientific notation
+    'scientific_notation': r'\b\d+(?:\.\d+)?[eE][+-]?\d+\b',
+}
+
+# Where matches of each built-in pattern can start. Word patterns open with
+# \b and an uppercase letter; numeric ones with a currency sign or a digit
+# that is not preceded by another (a leading \d+ absorbs any earlier
+# digits, so a match found mid-run also exists from the start of the run)
+_SYMBOL_START_GROUPS = {
+    'stock_ticker': 'word',
+    'crypto_symbol': 'word',
+    'financial_ratio': 'word',
+    'defi_term': 'word',
+    'currency_amount': 'number',
+    'percentage': 'number',
+    'scientific_notation': 'number',
+    'greek_letter': 'greek_letter',
+    'mathematical_symbol': 'mathematical_symbol',
+}
+# The leading lookahead lets the regex engine skip ahead by character set,
+# and the start conditions are checked behind the character for the same
+# reason; \b[A-Z] is written as [A-Z](?<!\w[A-Z])
+_SYMBOL_SCAN = re.compile(
+    rf'(?=[A-Z{_CURRENCY_SIGNS}{_GREEK_LETTERS}{_MATHEMATICAL_SYMBOLS}\d])(?:'
+    r'(?P<word>[A-Z])(?<!\w[A-Z])'
+    rf'|(?P<number>\d(?<!\d\d)|[{_CURRENCY_SIGNS}])'
+    rf'|(?P<greek_letter>[{_GREEK_LETTERS}])'
+    rf'|(?P<mathematical_symbol>[{_MATHEMATICAL_SYMBOLS}])'
+    r')'
+)
+
 class FinancialSymbolProcessor:
     """Process and preserve financial symbols, tickers, and mathematical notation."""
     
@@ -169,82 +228,123 @@ class FinancialSymbolProcessor:
     
     def _build_preservation_patterns(self) -> Dict[str, re.Pattern]:
         """Build regex patterns for symbol preservation."""
-        patterns = {}
-        
-        # Stock ticker pattern (1-5 uppercase letters, possibly with dots)
-        patterns['stock_ticker'] = re.compile(r'\b[A-Z]{1,5}(?:\.[A-Z]{1,2})?\b')
-        
-        # Crypto symbol pattern (2-10 chars, mostly uppercase)
-        patterns['crypto_symbol'] = re.compile(r'\b[A-Z]{2,10}\b')
-        
-        # Currency amounts (symbol + number or number + code)
-        patterns['currency_amount'] = re.compile(r'(?:[$€£¥₹₽₩₪₦₡]\s*\d+(?:,\d{3})*(?:\.\d{2})?|\d+(?:,\d{3})*(?:\.\d{2})?\s*(?:USD|EUR|GBP|JPY|CHF|CAD|AUD|NZD|CNY|INR|BRL|RUB|KRW|SGD|HKD|NOK|SEK))')
-        
-        # Greek letters
-        patterns['greek_letter'] = re.compile(r'[αβγδεζηθικλμνξοπρστυφχψωΑΒΓΔΕΖΗΘΙΚΛΜΝΞΟΠΡΣΤΥΦΧΨΩ]')
-        
-        # Mathematical symbols
-        patterns['mathematical_symbol'] = re.compile(r'[∞∂∇∑∏∫√±≤≥≠≈∈∉⊂⊃∩∪∅ℝℕℤℚ→←↑↓⇒⇔]')
-        
-        # Financial ratios and metrics
-        patterns['financial_ratio'] = re.compile(r'\b(?:P/E|P/B|ROE|ROA|EBITDA|WACC|CAPM|VaR|CVaR|PnL|P&L|NAV|AUM|IRR|NPV|CAGR|YTD|QoQ|YoY|MoM|ATH|ATL|RSI|MACD|SMA|EMA|BB|ADX|CCI|MFI|OBV)\b')
-        
-        # DeFi and crypto terms
-        patterns['defi_term'] = re.compile(r'\b(?:DeFi|DAO|NFT|DEX|CEX|LP|AMM|TVL|APY|APR|IL|MEV|PoS|PoW|TPS)\b')
-        
-        # Percentage with optional basis points
-        patterns['percentage'] = re.compile(r'\d+(?:\.\d+)?%|\d+(?:\.\d+)?\s*bps?\b')
-        
-        # Scientific notation
-        patterns['scientific_notation'] = re.compile(r'\b\d+(?:\.\d+)?[eE][+-]?\d+\b')
+        return {name: re.compile(pattern) for name, pattern in _SYMBOL_PATTERNS.items()}
+    
+    def _group_symbol_patterns(self) -> Tuple[Dict[str, List[Tuple[str, re.Pattern]]], List[Tuple[str, re.Pattern]]]:
+        """Split preservation patterns into those driven by the fused scan and the rest
         
-        return patterns
+        A pattern joins its start group only while it is the built-in pattern
+        of that name; replaced or added patterns get a pass of their own.
+        """
+        groups = defaultdict(list)
+        separate = []
+        for name, pattern in self.preservation_patterns.items():
+            if name in _SYMBOL_START_GROUPS and pattern.pattern == _SYMBOL_PATTERNS[name]:
+                groups[_SYMBOL_START_GROUPS[name]].append((name, pattern))
+            else:
+                separate.append((name, pattern))
+        return groups, separate
+    
+    def _iter_symbol_matches(self, text: str) -> Iterator[Tuple[str, re.Match]]:
+        """Yield ``(pattern_name, match)`` for every preservation pattern match
+        
+        One scan of ``_SYMBOL_SCAN`` visits every position a built-in
+        pattern can start at, and its named group selects the patterns to
+        try there. Each pattern resumes after its own previous match, so the
+        matches equal those of every pattern's ``finditer``. They come in
+        position order, except for retries inside a digit run and for
+        separately scanned patterns, which follow at the end.
+        """
+        groups, separate = self._group_symbol_patterns()
+        resume_at = dict.fromkeys(self.preservation_patterns, 0)
+        
+        for candidate in _SYMBOL_SCAN.finditer(text):
+            pos = candidate.start()
+            for pattern_name, pattern in groups.get(candidate.lastgroup, ()):
+                if pos < resume_at[pattern_name]:
+                    continue
+                match = pattern.match(text, pos)
+                while match:
+                    yield pattern_name, match
+                    end = resume_at[pattern_name] = match.end()
+                    # A match can stop inside a digit run ('$1.234' -> '$1.23'),
+                    # and the scan does not visit the digits left over
+                    if not (text[end - 1:end].isdecimal() and text[end:end + 1].isdecimal()):
+                        break
+                    match = pattern.match(text, end)
+        
+        for pattern_name, pattern in separate:
+            for match in pattern.finditer(text):
+                yield pattern_name, match
     
     def extract_symbols(self, text: str) -> Dict[str, Any]:
-        """Extract all financial symbols from text."""
-        extracted_symbols = defaultdict(list)
-        symbol_positions = []
-        
-        # Extract using patterns
-        for pattern_name, pattern in self.preservation_patterns.items():
-            matches = pattern.finditer(text)
-            
-            for match in matches:
-                symbol = match.group()
-                
-                # Validate and classify symbol
-                classification = self._classify_symbol(symbol, pattern_name)
-                
-                if classification:
-                    symbol_data = {
-                        'symbol': symbol,
-                        'type': classification['type'],
-                        'pattern': pattern_name,
-                        'position': {
-                            'start': match.start(),
-                            'end': match.end()
-                        },
-                        'context': self._extract_context(text, match.start(), match.end()),
-                        'confidence': classification['confidence'],
-                        'metadata': classification.get('metadata', {})
-                    }
-                    
-                    extracted_symbols[pattern_name].append(symbol_data)
-                    symbol_positions.append(symbol_data)
+        """Extract all financial symbols from text.
         
-        # Sort by position
-        symbol_positions.sort(key=lambda x: x['position']['start'])
+        Matches come from a single fused scan (see
+        :meth:`_iter_symbol_matches`) and equal those of running every
+        preservation pattern separately.
+        """
+        pattern_order = {name: order for order, name in enumerate(self.preservation_patterns)}
+        extracted_symbols = {name: [] for name in self.preservation_patterns}
+        symbol_positions = []
+        classifications = {}
+        in_order = True
+        last_key = (-1, -1)
+        
+        for pattern_name, match in self._iter_symbol_matches(text):
+            symbol_data = self._symbol_data(text, match, pattern_name, classifications)
+            if symbol_data:
+                extracted_symbols[pattern_name].append(symbol_data)
+                symbol_positions.append(symbol_data)
+                key = (match.start(), pattern_order[pattern_name])
+                if key < last_key:
+                    in_order = False
+                last_key = key
+        
+        # Sort by position; symbols starting together keep pattern order
+        if not in_order:
+            symbol_positions.sort(key=lambda x: (x['position']['start'], pattern_order[x['pattern']]))
+        extracted_symbols = {name: symbols for name, symbols in extracted_symbols.items() if symbols}
         
         # Calculate statistics
         stats = self._calculate_symbol_statistics(extracted_symbols)
         
         return {
-            'symbols_by_type': dict(extracted_symbols),
+            'symbols_by_type': extracted_symbols,
             'symbols_by_position': symbol_positions,
             'statistics': stats,
             'preservation_map': self._create_preservation_map(symbol_positions)
         }
     
+    def _symbol_data(self, text: str, match: re.Match, pattern_name: str,
+                     classifications: Dict[Tuple[str, str], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """Entry for one pattern match, or None when the symbol is rejected
+        
+        ``classifications`` memoises :meth:`_classify_symbol` for one text,
+        and the context is sliced straight from ``text``.
+        """
+        symbol = match.group()
+        key = (symbol, pattern_name)
+        if key in classifications:
+            classification = classifications[key]
+        else:
+            classification = classifications[key] = self._classify_symbol(symbol, pattern_name)
+        if not classification:
+            return None
+        start, end = match.span()
+        return {
+            'symbol': symbol,
+            'type': classification['type'],
+            'pattern': pattern_name,
+            'position': {
+                'start': start,
+                'end': end
+            },
+            'context': text[start - SYMBOL_CONTEXT_CHARS if start > SYMBOL_CONTEXT_CHARS else 0:end + SYMBOL_CONTEXT_CHARS],
+            'confidence': classification['confidence'],
+            'metadata': classification.get('metadata', {})
+        }
+    
     def _classify_symbol(self, symbol: str, pattern_name: str) -> Optional[Dict[str, Any]]:
         """Classify and validate a symbol."""
         # Check in known dictionaries first
@@ -303,7 +403,7 @@ class FinancialSymbolProcessor:
         
         return None
     
-    def _extract_context(self, text: str, start: int, end: int, context_chars: int = 30) -> str:
+    def _extract_context(self, text: str, start: int, end: int, context_chars: int = SYMBOL_CONTEXT_CHARS) -> str:
         """Extract context around a symbol."""
         context_start = max(0, start - context_chars)
         context_end = min(len(text), end + context_chars)
@@ -349,35 +449,63 @@ class FinancialSymbolProcessor:
         
         return preservation_map
     
-    def preserve_symbols_in_text(self, text: str) -> Tuple[str, Dict[str, str]]:
-        """Replace symbols with placeholders to preserve them during processing."""
-        symbols_data = self.extract_symbols(text)
-        symbol_positions = symbols_data['symbols_by_position']
+    def _preservation_spans(self, text: str) -> List[Tuple[int, int, str, str]]:
+        """Non-overlapping ``(start, end, symbol, type)`` spans to preserve, in text order
         
-        # Sort by position (reverse order to maintain positions when replacing)
-        symbol_positions.sort(key=lambda x: x['position']['start'], reverse=True)
+        Patterns overlap (a ticker is usually a crypto symbol too, and "P/E"
+        contains two tickers), so where matches overlap the one starting
+        first wins, then the longest, then the earliest pattern.
+        """
+        pattern_order = {name: order for order, name in enumerate(self.preservation_patterns)}
+        classifications = {}
+        candidates = []
+        for pattern_name, match in self._iter_symbol_matches(text):
+            symbol = match.group()
+            key = (symbol, pattern_name)
+            if key not in classifications:
+                classifications[key] = self._classify_symbol(symbol, pattern_name)
+            classification = classifications[key]
+            if classification:
+                candidates.append((match.start(), -match.end(), pattern_order[pattern_name], symbol, classification['type']))
+        candidates.sort()
+        
+        spans = []
+        covered = 0
+        for start, negative_end, order, symbol, symbol_type in candidates:
+            if start >= covered:
+                covered = -negative_end
+                spans.append((start, covered, symbol, symbol_type))
+        return spans
+    
+    def preserve_symbols_in_text(self, text: str) -> Tuple[str, Dict[str, str]]:
+        """Replace symbols with placeholders to preserve them during processing.
         
-        preserved_text = text
+        The output is assembled in one pass over :meth:`_preservation_spans`;
+        placeholders are numbered in text order.
+        """
+        pieces = []
         preservation_map = {}
+        pos = 0
         
-        for i, symbol_data in enumerate(symbol_positions):
+        for i, (start, end, symbol, symbol_type) in enumerate(self._preservation_spans(text)):
             placeholder = f"__SYMBOL_{i}__"
-            start = symbol_data['position']['start']
-            end = symbol_data['position']['end']
-            
-            # Replace symbol with placeholder
-            preserved_text = (
-                preserved_text[:start] + 
-                placeholder + 
-                preserved_text[end:]
-            )
-            
-            preservation_map[placeholder] = symbol_data['symbol']
+            pieces.append(text[pos:start])
+            pieces.append(placeholder)
+            preservation_map[placeholder] = symbol
+            pos = end
+        pieces.append(text[pos:])
         
-        return preserved_text, preservation_map
+        return ''.join(pieces), preservation_map
     
     def restore_symbols_in_text(self, text: str, preservation_map: Dict[str, str]) -> str:
-        """Restore symbols from placeholders."""
+        """Restore symbols from placeholders.
+        
+        Maps made by :meth:`preserve_symbols_in_text` are restored in a
+        single pass; other placeholder formats are replaced one by one.
+        """
+        if all(_PLACEHOLDER_RE.fullmatch(placeholder) for placeholder in preservation_map):
+            return _PLACEHOLDER_RE.sub(lambda m: preservation_map.get(m.group(), m.group()), text)
+        
         restored_text = text
         
         for placeholder, symbol in preservation_map.items():
@@ -463,9 +591,25 @@ class FinancialSymbolProcessor:
         
         return type_definitions.get(symbol_type, f'Symbol: {symbol}')
 
+# Texts longer than ACADEMIC_SAMPLE_MAX_CHARS are classified from bounded
+# regions: the leading pages, probe windows spread over the body (to catch
+# section headers) and the trailing reference block
+ACADEMIC_HEAD_CHARS = 24_000
+ACADEMIC_TAIL_CHARS = 24_000
+ACADEMIC_PROBE_WINDOWS = 16
+ACADEMIC_PROBE_CHARS = 2_000
+ACADEMIC_SAMPLE_MAX_CHARS = ACADEMIC_HEAD_CHARS + ACADEMIC_TAIL_CHARS + ACADEMIC_PROBE_WINDOWS * ACADEMIC_PROBE_CHARS
+_REFERENCE_SECTIONS = ('references', 'bibliography')
+
 # Academic paper thresholds and content validation
 class AcademicPaperProcessor:
-    """Enhanced processing for academic papers with adjusted thresholds."""
+    """Enhanced processing for academic papers with adjusted thresholds.
+    
+    Long texts are checked in bounded mode: only the regions returned by
+    :meth:`_sample_regions` are read, so the cost does not grow with the
+    document. Section, citation and reference counts are the full-scan
+    counts restricted to those regions.
+    """
     
     def __init__(self):
         self.academic_thresholds = {
@@ -493,25 +637,104 @@ class AcademicPaperProcessor:
             r'doi:\s*10\.\d+',  # DOI
             r'arXiv:\d+\.\d+',  # arXiv papers
         ]
+        
+        self._citation_regexes = [re.compile(pattern) for pattern in self.citation_patterns]
+        # Citation patterns that validate_academic_content also counts as references
+        self._reference_regexes = self._citation_regexes[:2]
     
-    def detect_academic_paper(self, text: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
-        """Detect if document is an academic paper and return confidence."""
-        indicators_found = []
-        score = 0
+    def _sample_regions(self, text: str) -> List[str]:
+        """Leading pages, evenly spread body windows and the trailing block of ``text``"""
+        if len(text) <= ACADEMIC_SAMPLE_MAX_CHARS:
+            return [text]
+        regions = [text[:ACADEMIC_HEAD_CHARS]]
+        body_start = ACADEMIC_HEAD_CHARS
+        body_end = len(text) - ACADEMIC_TAIL_CHARS
+        step = (body_end - body_start) / ACADEMIC_PROBE_WINDOWS
+        for i in range(ACADEMIC_PROBE_WINDOWS):
+            start = body_start + int(i * step + (step - ACADEMIC_PROBE_CHARS) / 2)
+            regions.append(text[start:start + ACADEMIC_PROBE_CHARS])
+        regions.append(text[body_end:])
+        return regions
+    
+    def _scan_signals(self, regions: List[str]) -> Dict[str, Any]:
+        """Section words, citation and reference counts of ``regions``"""
+        sections = set()
+        citation_count = 0
+        reference_matches = 0
+        tokens = 0
+        chars = 0
+        for region in regions:
+            tokens += len(region.split())
+            chars += len(region)
+            # Section words are plain substrings of the lowercased region,
+            # which is far cheaper than a case-insensitive alternation
+            region_lower = region.lower()
+            sections.update(indicator for indicator in self.academic_indicators if indicator in region_lower)
+            reference_matches += sum(region_lower.count(word) for word in _REFERENCE_SECTIONS)
+            for regex in self._citation_regexes:
+                matches = len(regex.findall(region))
+                citation_count += matches
+                if regex in self._reference_regexes:
+                    reference_matches += matches
+        return {
+            'sections': sections,
+            'citation_count': citation_count,
+            'reference_matches': reference_matches,
+            'tokens': tokens,
+            'chars': chars
+        }
+    
+    def _estimate_counts(self, text: str) -> Tuple[int, float, Set[str]]:
+        """Estimated token and reference counts of ``text``, and its section words
         
-        text_lower = text.lower()
+        The trailing block of :meth:`_sample_regions` is counted as it is; the
+        leading pages and probe windows stand in for the rest of the text, so
+        their counts are scaled by its length. A reference list at the end is
+        thus counted once rather than weighted like a sample of the body.
+        """
+        regions = self._sample_regions(text)
+        tail = self._scan_signals(regions[-1:])
+        if len(regions) == 1:
+            return tail['tokens'], tail['reference_matches'], tail['sections']
+        body = self._scan_signals(regions[:-1])
+        scale = (len(text) - tail['chars']) / body['chars'] if body['chars'] else 0
+        token_count = round(tail['tokens'] + body['tokens'] * scale)
+        reference_matches = tail['reference_matches'] + body['reference_matches'] * scale
+        return token_count, reference_matches, body['sections'] | tail['sections']
+    
+    def detect_academic_paper(self, text: str, metadata: Dict[str, Any],
+                              bounded: Optional[bool] = None) -> Dict[str, Any]:
+        """Detect if document is an academic paper and return confidence.
         
-        # Check for academic sections
-        for indicator in self.academic_indicators:
-            if indicator in text_lower:
-                indicators_found.append(indicator)
-                score += 1
+        ``bounded`` defaults to True for texts longer than
+        ``ACADEMIC_SAMPLE_MAX_CHARS``; pass False to scan the whole text.
+        """
+        if bounded is None:
+            bounded = len(text) > ACADEMIC_SAMPLE_MAX_CHARS
+        indicators_found = []
+        score = 0
         
-        # Check citation patterns
-        citation_count = 0
-        for pattern in self.citation_patterns:
-            matches = len(re.findall(pattern, text))
-            citation_count += matches
+        if bounded:
+            signals = self._scan_signals(self._sample_regions(text))
+            for indicator in self.academic_indicators:
+                if indicator in signals['sections']:
+                    indicators_found.append(indicator)
+                    score += 1
+            citation_count = signals['citation_count']
+        else:
+            text_lower = text.lower()
+            
+            # Check for academic sections
+            for indicator in self.academic_indicators:
+                if indicator in text_lower:
+                    indicators_found.append(indicator)
+                    score += 1
+            
+            # Check citation patterns
+            citation_count = 0
+            for pattern in self.citation_patterns:
+                matches = len(re.findall(pattern, text))
+                citation_count += matches
         
         if citation_count > 5:
             score += 2
@@ -537,11 +760,19 @@ class AcademicPaperProcessor:
             'score': score,
             'indicators_found': indicators_found,
             'citation_count': citation_count,
+            'bounded': bounded,
             'recommended_thresholds': self.academic_thresholds if is_academic else None
         }
     
-    def validate_academic_content(self, text: str, extracted_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Validate academic content quality with adjusted thresholds."""
+    def validate_academic_content(self, text: str, extracted_data: Dict[str, Any],
+                                  bounded: Optional[bool] = None) -> Dict[str, Any]:
+        """Validate academic content quality with adjusted thresholds.
+        
+        In bounded mode (see :meth:`detect_academic_paper`) the token and
+        reference counts are estimated with :meth:`_estimate_counts`.
+        """
+        if bounded is None:
+            bounded = len(text) > ACADEMIC_SAMPLE_MAX_CHARS
         validation_results = {
             'passes_academic_standards': True,
             'issues': [],
@@ -553,7 +784,10 @@ class AcademicPaperProcessor:
         if not isinstance(validation_results['adjustments_made'], list):
             validation_results['adjustments_made'] = list(validation_results['adjustments_made'])
         
-        token_count = len(text.split())
+        if bounded:
+            token_count, reference_matches, sections = self._estimate_counts(text)
+        else:
+            token_count = len(text.split())
         
         # Apply academic-specific validation
         if token_count < self.academic_thresholds['min_tokens']:
@@ -561,8 +795,9 @@ class AcademicPaperProcessor:
             validation_results['passes_academic_standards'] = False
         
         # Check reference density
-        reference_patterns = ['references', 'bibliography', r'\[\d+\]', r'\(\d{4}\)']
-        reference_matches = sum(len(re.findall(pattern, text, re.IGNORECASE)) for pattern in reference_patterns)
+        if not bounded:
+            reference_patterns = ['references', 'bibliography', r'\[\d+\]', r'\(\d{4}\)']
+            reference_matches = sum(len(re.findall(pattern, text, re.IGNORECASE)) for pattern in reference_patterns)
         reference_density = reference_matches / token_count if token_count > 0 else 0
         
         if reference_density > self.academic_thresholds['reference_density_max']:
@@ -571,7 +806,10 @@ class AcademicPaperProcessor:
             validation_results['adjustments_made'].append('Reference density within academic norms')
         
         # Check for required sections
-        sections_found = sum(1 for indicator in self.academic_indicators if indicator in text.lower())
+        if bounded:
+            sections_found = len(sections)
+        else:
+            sections_found = sum(1 for indicator in self.academic_indicators if indicator in text.lower())
         if sections_found < self.academic_thresholds['min_sections']:
             validation_results['issues'].append(f'Insufficient academic sections: {sections_found}')
         
@@ -579,49 +817,102 @@ class AcademicPaperProcessor:
 
 # Memory optimization utilities
 class MemoryOptimizer:
-    """Optimize memory usage during large-scale processing."""
+    """Optimize memory usage during large-scale processing.
     
-    def __init__(self):
-        self.chunk_size = 1000000  # 1MB chunks
+    Text is processed in chunks of ``chunk_size`` characters. Each chunk is
+    handed to the processor with ``overlap`` characters of the neighbouring
+    text on both sides, so symbols crossing a boundary and their contexts
+    are seen whole, and only symbols starting inside the chunk's own span
+    are kept. With ``max_workers`` above 1 chunks run on a process pool,
+    with at most two chunks per worker in flight.
+    """
+    
+    def __init__(self, chunk_size: int = 1000000, overlap: int = 256, max_workers: int = 1):
+        self.chunk_size = chunk_size  # 1MB chunks
+        self.overlap = overlap  # Longer than any symbol plus its context
+        self.max_workers = max_workers
         self.max_cache_size = 100
         self.cache = {}
     
+    def _iter_chunks(self, text: str):
+        """Yield ``(offset, own_start, own_end, chunk)`` where ``chunk`` starts at ``offset``"""
+        for own_start in range(0, len(text), self.chunk_size):
+            own_end = min(own_start + self.chunk_size, len(text))
+            offset = max(0, own_start - self.overlap)
+            yield offset, own_start, own_end, text[offset:own_end + self.overlap]
+    
     def process_large_text_in_chunks(self, text: str, processor_func, **kwargs):
         """Process large text in memory-efficient chunks."""
+        func = partial(processor_func, **kwargs) if kwargs else processor_func
         results = []
         
-        for i in range(0, len(text), self.chunk_size):
-            chunk = text[i:i + self.chunk_size]
-            
-            # Process chunk
-            chunk_result = processor_func(chunk, **kwargs)
-            results.append(chunk_result)
-            
-            # Clear variables to free memory
-            del chunk
+        if self.max_workers <= 1 or len(text) <= self.chunk_size:
+            for offset, own_start, own_end, chunk in self._iter_chunks(text):
+                results.append((offset, own_start, own_end, func(chunk)))
+                
+                # Clear variables to free memory
+                del chunk
+        else:
+            # processor_func must be picklable, e.g. a FinancialSymbolProcessor method
+            pending = deque()
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                for offset, own_start, own_end, chunk in self._iter_chunks(text):
+                    pending.append((offset, own_start, own_end, executor.submit(func, chunk)))
+                    del chunk
+                    if len(pending) >= self.max_workers * 2:
+                        offset, own_start, own_end, future = pending.popleft()
+                        results.append((offset, own_start, own_end, future.result()))
+                while pending:
+                    offset, own_start, own_end, future = pending.popleft()
+                    results.append((offset, own_start, own_end, future.result()))
         
         return self._merge_chunk_results(results)
     
-    def _merge_chunk_results(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Merge results from multiple chunks."""
+    def _merge_chunk_results(self, results: List[Tuple[int, int, int, Dict[str, Any]]]) -> Dict[str, Any]:
+        """Merge results from multiple chunks.
+        
+        ``results`` holds ``(offset, own_start, own_end, result)`` per chunk,
+        with symbol lists sorted by position and entries shared between
+        both views, as :meth:`FinancialSymbolProcessor.extract_symbols`
+        returns them. Symbols starting outside ``[own_start, own_end)``
+        belong to a neighbouring chunk and are dropped, positions are
+        rebased by ``offset`` to the whole text and the preservation map is
+        renumbered.
+        """
         merged: Dict[str, Any] = {
             'symbols_by_type': defaultdict(list),
             'symbols_by_position': [],
             'statistics': {},
             'preservation_map': {}
         }
-        for result in results:
+        for offset, own_start, own_end, result in results:
+            lo, hi = own_start - offset, own_end - offset
             # Merge symbols
             for symbol_type, symbols in result.get('symbols_by_type', {}).items():
-                merged['symbols_by_type'][symbol_type].extend(symbols)
+                merged['symbols_by_type'][symbol_type].extend(self._owned_symbols(symbols, lo, hi))
             # Merge positions
-            merged['symbols_by_position'].extend(result.get('symbols_by_position', []))
-            # Merge preservation maps
-            merged['preservation_map'].update(result.get('preservation_map', {}))
+            owned = self._owned_symbols(result.get('symbols_by_position', []), lo, hi)
+            for symbol_data in owned:
+                symbol_data['position']['start'] += offset
+                symbol_data['position']['end'] += offset
+            merged['symbols_by_position'].extend(owned)
+        # Rebuild the preservation map; chunk maps reuse the same placeholders
+        for i, symbol_data in enumerate(merged['symbols_by_position']):
+            merged['preservation_map'][f"__SYMBOL_{i}__"] = symbol_data['symbol']
         # Recalculate statistics
         merged['statistics'] = self._recalculate_statistics(merged)
         return merged
     
+    @staticmethod
+    def _owned_symbols(symbols: List[Dict[str, Any]], lo: int, hi: int) -> List[Dict[str, Any]]:
+        """Symbols of a sorted list starting in ``[lo, hi)``; only the overlaps are walked"""
+        first, last = 0, len(symbols)
+        while first < last and symbols[first]['position']['start'] < lo:
+            first += 1
+        while last > first and symbols[last - 1]['position']['start'] >= hi:
+            last -= 1
+        return symbols[first:last]
+    
     def _recalculate_statistics(self, merged_data: Dict[str, Any]) -> Dict[str, Any]:
         """Recalculate statistics for merged data."""
         total_symbols = sum(len(symbols) for symbols in merged_data['symbols_by_type'].values())
@@ -639,22 +930,30 @@ class MemoryOptimizer:
 
 # Integration functions for your pipeline
 def integrate_all_enhancements(pdf_path: str, extracted_text: str, output_dir: str, 
-                             metadata: Dict[str, Any]) -> Dict[str, Any]:
-    """Complete integration of all enhancement features."""
+                             metadata: Dict[str, Any],
+                             math_lines: Optional[List[Tuple[int, str]]] = None) -> Dict[str, Any]:
+    """Complete integration of all enhancement features.
+    
+    ``math_lines`` are the math-font lines captured during primary
+    extraction (see ``formula_extractor.extract_page_text``); with them, formula
+    detection does not parse the PDF pages again.
+    """
     
     # Initialize processors
     formula_extractor = FormulaExtractor()
     chart_extractor = ChartImageExtractor()
     symbol_processor = FinancialSymbolProcessor()
     academic_processor = AcademicPaperProcessor()
-    memory_optimizer = MemoryOptimizer()
+    memory_optimizer = MemoryOptimizer(
+        max_workers=symbol_processor.config.get('processing', {}).get('max_workers', 1)
+    )
     
     # Results container
     enhancement_results = {}
     
     # 1. LaTeX Formula Extraction
     try:
-        formula_results = formula_extractor.extract_comprehensive(pdf_path, extracted_text)
+        formula_results = formula_extractor.extract_comprehensive(pdf_path, extracted_text, math_lines=math_lines)
         enhancement_results['formulas'] = formula_results
     except Exception as e:
         logging.error(f"Formula extraction failed: {e}")
@@ -0,0 +1,36 @@
+"""
+Module: formula_cache
+Purpose: Bounded, optionally persisted memo of formula scoring features
+(LaTeX validity, complexity, symbol flags) keyed by whitespace-normalised
+formula text, so formulas repeated across the corpus are scored once.
+"""
+from pathlib import Path
+from typing import Optional, Union
+
+from .feature_cache import DEFAULT_MAX_ENTRIES, FeatureCache, shared_cache
+
+
+def formula_key(formula: str) -> str:
+    """Cache key of ``formula``: its text with whitespace runs collapsed"""
+    return ' '.join(formula.split())
+
+
+class FormulaFeatureCache(FeatureCache):
+    """:class:`FeatureCache` of formula features keyed by :func:`formula_key`"""
+
+    table = 'formula_features'
+    key_column = 'formula'
+
+    @staticmethod
+    def key(text: str) -> str:
+        return formula_key(text)
+
+
+def shared_formula_cache(path: Optional[Union[str, Path]] = None, version: str = '1',
+                         max_entries: int = DEFAULT_MAX_ENTRIES) -> FormulaFeatureCache:
+    """Process-wide cache for ``path`` (or the in-memory one)
+
+    Extractors are often created per document; sharing the cache lets
+    formulas repeated across documents hit it.
+    """
+    return shared_cache(FormulaFeatureCache, path, version, max_entries)
@@ -7,24 +7,138 @@ Handles both extracted text formulas and direct PDF formula preservation.
 import re
 import json
 import fitz  # PyMuPDF
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Tuple, Union
 from pathlib import Path
 import logging
-import pytesseract
 from PIL import Image
-from io import BytesIO
 from shared_tools.config.project_config import ProjectConfig
+from .formula_cache import DEFAULT_MAX_ENTRIES, FormulaFeatureCache, shared_formula_cache
+from .ocr_service import shared_ocr_service
 logger = logging.getLogger(__name__)
 
+_FORMULA_FLAGS = re.DOTALL | re.IGNORECASE
+_WHITESPACE_RE = re.compile(r'\s+')
+_LATEX_COMMAND_RE = re.compile(r'\\[a-zA-Z]+')
+_INTEGRAL_RE = re.compile(r'\\int|∫')
+_SUMMATION_RE = re.compile(r'\\sum|Σ')
+_OPERATOR_RE = re.compile(r'[+\-*/=<>≤≥≠∈∉⊂⊃∩∪]')
+# An inline $...$ span starting with a number and holding words, with no operator
+# or LaTeX markup, is the prose between two dollar amounts ("$100 to $200")
+_LATEX_MARKUP = ('\\', '^', '_', '{')
+_LEADING_NUMBER_RE = re.compile(r'\s*\d')
+_WORD_RE = re.compile(r'[A-Za-z]{2,}')
+# Substrings that raise extraction confidence
+_CONFIDENCE_SYMBOLS = ('\\', '^', '_', '{', '}', 'sum', 'int', 'frac', 'sqrt')
+
+# Enhanced formula patterns
+_FORMULA_PATTERNS = {
+    'inline_latex': r'\$([^$]+)\$',
+    'display_latex': r'\$\$([^$]+)\$\$',
+    'equation_env': r'\\begin\{equation\*?\}(.*?)\\end\{equation\*?\}',
+    'align_env': r'\\begin\{align\*?\}(.*?)\\end\{align\*?\}',
+    'eqnarray_env': r'\\begin\{eqnarray\*?\}(.*?)\\end\{eqnarray\*?\}',
+    'math_env': r'\\begin\{math\}(.*?)\\end\{math\}',
+    'displaymath_env': r'\\begin\{displaymath\}(.*?)\\end\{displaymath\}',
+    'bracket_inline': r'\\\(([^)]+)\\\)',
+    'bracket_display': r'\\\[([^\]]+)\\\]',
+    
+    # Financial/mathematical expressions
+    'percentage': r'\b\d+(?:\.\d+)?%\b',
+    'currency': r'[\$€£¥]\s*\d+(?:,\d{3})*(?:\.\d{2})?',
+    'scientific_notation': r'\b\d+(?:\.\d+)?[eE][+-]?\d+\b',
+    'ratios': r'\b\d+(?:\.\d+)?:\d+(?:\.\d+)?\b',
+    'fractions': r'\b\d+/\d+\b',
+    'greek_letters': r'\\(?:alpha|beta|gamma|delta|epsilon|zeta|eta|theta|iota|kappa|lambda|mu|nu|xi|omicron|pi|rho|sigma|tau|upsilon|phi|chi|psi|omega)\b',
+    
+    # Statistical formulas
+    'probability': r'P\([^)]+\)',
+    'expectation': r'E\[[^\]]+\]',
+    'variance': r'Var\([^)]+\)',
+    'correlation': r'Corr\([^)]+\)',
+    
+    # Financial formulas
+    'volatility': r'σ\s*[²₂]?',
+    'returns': r'R_[{\w}]+',
+    'derivatives': r'd[A-Z]/d[A-Z]',
+}
+
+# Text every match of the pattern starts with (matched with _FORMULA_FLAGS).
+# Prepended as a lookahead, they let the single-pass scanner skip to
+# candidate positions instead of trying every pattern at every character
+_FORMULA_PREFIXES = {
+    'inline_latex': r'\$',
+    'display_latex': r'\$',
+    'equation_env': r'\\begin',
+    'align_env': r'\\begin',
+    'eqnarray_env': r'\\begin',
+    'math_env': r'\\begin',
+    'displaymath_env': r'\\begin',
+    'bracket_inline': r'\\\(',
+    'bracket_display': r'\\\[',
+    'percentage': r'\d',
+    'currency': r'[\$€£¥]',
+    'scientific_notation': r'\d',
+    'ratios': r'\d',
+    'fractions': r'\d',
+    'greek_letters': r'\\',
+    'probability': r'p\(',
+    'expectation': r'e\[',
+    'variance': r'var\(',
+    'correlation': r'corr\(',
+    'volatility': r'σ',
+    'returns': r'r_',
+    'derivatives': r'd[a-z]/',
+}
+
+# Fonts that mark a line as mathematical content
+_MATH_FONTS = ('symbol', 'math', 'times', 'cmr', 'latin')
+
+
+def math_font_lines(page_dict: Dict[str, Any]) -> List[str]:
+    """Text of the lines with at least one span in a math font
+    
+    Args:
+        page_dict: Output of PyMuPDF's ``page.get_text("dict")``
+    """
+    lines = []
+    for block in page_dict.get("blocks", []):
+        for line in block.get("lines", ()):
+            spans = line.get("spans", ())
+            if any(math_font in span.get("font", "").lower() for span in spans for math_font in _MATH_FONTS):
+                line_text = ''.join(span.get("text", "") for span in spans)
+                if line_text.strip():
+                    lines.append(line_text)
+    return lines
+
+
+def extract_page_text(page) -> Tuple[str, List[str]]:
+    """Plain text and math-font lines of a PyMuPDF page, from one parse
+    
+    The page is parsed into a TextPage once and both outputs are read from
+    it; the text is the same as ``page.get_text()``. Primary extraction uses
+    this to hand the lines to :meth:`FormulaExtractor.extract_from_pdf`
+    instead of having the page parsed again.
+    """
+    textpage = page.get_textpage(flags=fitz.TEXTFLAGS_TEXT)
+    return page.get_text(textpage=textpage), math_font_lines(page.get_text("dict", textpage=textpage))
+
+
 class FormulaExtractor:
     """Extract and preserve mathematical formulas from PDFs."""
     
-    def __init__(self, config: Optional[Dict] = None, project_config: Optional[Dict] = None):
+    # Bump whenever _compute_formula_features changes, so persisted features are recomputed
+    FEATURES_VERSION = 1
+    
+    def __init__(self, config: Optional[Dict] = None, project_config: Optional[Dict] = None,
+                 metadata_cache: Optional[Union[str, Path, FormulaFeatureCache]] = None):
         """Initialize formula extractor
         
         Args:
             config (dict): Optional configuration
             project_config (dict): Optional project configuration
+            metadata_cache: FormulaFeatureCache or database path for persisted
+                formula features (default: the ``metadata_cache`` config
+                entry, if any, otherwise the process-wide in-memory cache)
         """
         self.logger = logging.getLogger(self.__class__.__name__)
         
@@ -34,37 +148,17 @@ class FormulaExtractor:
         else:
             self.config = config or self._get_default_config()
         
-        # Enhanced formula patterns
-        self.formula_patterns = {
-            'inline_latex': r'\$([^$]+)\$',
-            'display_latex': r'\$\$([^$]+)\$\$',
-            'equation_env': r'\\begin\{equation\*?\}(.*?)\\end\{equation\*?\}',
-            'align_env': r'\\begin\{align\*?\}(.*?)\\end\{align\*?\}',
-            'eqnarray_env': r'\\begin\{eqnarray\*?\}(.*?)\\end\{eqnarray\*?\}',
-            'math_env': r'\\begin\{math\}(.*?)\\end\{math\}',
-            'displaymath_env': r'\\begin\{displaymath\}(.*?)\\end\{displaymath\}',
-            'bracket_inline': r'\\\(([^)]+)\\\)',
-            'bracket_display': r'\\\[([^\]]+)\\\]',
-            
-            # Financial/mathematical expressions
-            'percentage': r'\b\d+(?:\.\d+)?%\b',
-            'currency': r'[\$€£¥]\s*\d+(?:,\d{3})*(?:\.\d{2})?',
-            'scientific_notation': r'\b\d+(?:\.\d+)?[eE][+-]?\d+\b',
-            'ratios': r'\b\d+(?:\.\d+)?:\d+(?:\.\d+)?\b',
-            'fractions': r'\b\d+/\d+\b',
-            'greek_letters': r'\\(?:alpha|beta|gamma|delta|epsilon|zeta|eta|theta|iota|kappa|lambda|mu|nu|xi|omicron|pi|rho|sigma|tau|upsilon|phi|chi|psi|omega)\b',
-            
-            # Statistical formulas
-            'probability': r'P\([^)]+\)',
-            'expectation': r'E\[[^\]]+\]',
-            'variance': r'Var\([^)]+\)',
-            'correlation': r'Corr\([^)]+\)',
-            
-            # Financial formulas
-            'volatility': r'σ\s*[²₂]?',
-            'returns': r'R_[{\w}]+',
-            'derivatives': r'd[A-Z]/d[A-Z]',
-        }
+        self.formula_patterns = dict(_FORMULA_PATTERNS)
+        self._scanner_patterns = None
+        
+        metadata_cache = metadata_cache or self.config.get('metadata_cache')
+        if not isinstance(metadata_cache, FormulaFeatureCache):
+            metadata_cache = shared_formula_cache(
+                metadata_cache, version=str(self.FEATURES_VERSION),
+                max_entries=self.config.get('metadata_cache_size', DEFAULT_MAX_ENTRIES)
+            )
+        self.metadata_cache = metadata_cache
+        self._last_features = None
     
     def _get_default_config(self) -> Dict[str, Any]:
         """Get default configuration"""
@@ -116,37 +210,99 @@ class FormulaExtractor:
         results['count'] = len(results['formulas'])
         return results
     
+    def _formula_scanner(self):
+        """Compiled single-pass scanner for ``formula_patterns``
+        
+        Returns ``(scanner, alternatives, by_group)``. The scanner is one
+        alternation of every pattern, each wrapped in a group, in pattern
+        order, behind a lookahead of their ``_FORMULA_PREFIXES`` when all
+        patterns are the defaults. ``alternatives`` lists ``(name, compiled
+        pattern, formula group in the scanner, formula group in the
+        pattern)`` and ``by_group`` maps a wrapping group's index to its
+        alternative. Recompiled whenever ``formula_patterns`` changes.
+        """
+        if self._scanner_patterns != self.formula_patterns:
+            prefixes = []
+            for name, pattern in self.formula_patterns.items():
+                if _FORMULA_PATTERNS.get(name) != pattern:
+                    # Unknown start; without a full prefix set every position is a candidate
+                    prefixes = None
+                    break
+                if _FORMULA_PREFIXES[name] not in prefixes:
+                    prefixes.append(_FORMULA_PREFIXES[name])
+            lookahead = f"(?={'|'.join(prefixes)})" if prefixes else ''
+            
+            branches, alternatives, by_group = [], [], {}
+            group = 1
+            for name, pattern in self.formula_patterns.items():
+                compiled = re.compile(pattern, _FORMULA_FLAGS)
+                branches.append(f'({pattern})')
+                by_group[group] = len(alternatives)
+                alternatives.append((name, compiled, group + 1 if compiled.groups else group, 1 if compiled.groups else 0))
+                group += 1 + compiled.groups
+            self._scanner = (re.compile(f"{lookahead}(?:{'|'.join(branches)})", _FORMULA_FLAGS), alternatives, by_group)
+            self._scanner_patterns = dict(self.formula_patterns)
+        return self._scanner
+    
     def _extract_latex(self, text: str) -> List[str]:
-        """Extract LaTeX formulas"""
+        """Extract LaTeX formulas
+        
+        All ``formula_patterns`` are matched in one scan. Where matches
+        overlap, the leftmost wins, then the earliest pattern. A match that
+        fails validation gives way to the next pattern matching at the same
+        position, or else to matches starting after its first character.
+        Inline ``$...$`` matches that read as prose between dollar amounts
+        are rejected the same way, so "$100 to $2,500" yields two currency
+        amounts while "$n = 100$" stays inline math.
+        """
+        scanner, alternatives, by_group = self._formula_scanner()
         formulas = []
-        
-        for pattern_name, pattern in self.formula_patterns.items():
-            matches = re.finditer(pattern, text, re.DOTALL | re.IGNORECASE)
+        seen_formulas = set()
+        pos = 0
+        
+        while alternatives:
+            match = scanner.search(text, pos)
+            if match is None:
+                break
+            start = match.start()
+            index = by_group[match.lastindex]
+            pattern_name, _, formula_group, _ = alternatives[index]
+            formula_text = match.group(formula_group)
             
-            for match in matches:
-                formula_text = match.group(1) if match.groups() else match.group(0)
-                
-                # Validate formula
-                if not self._validate_formula(formula_text, pattern_name):
+            # Validate formula, falling back to later patterns at this position
+            if not self._accept_match(formula_text, pattern_name):
+                for pattern_name, pattern, _, formula_group in alternatives[index + 1:]:
+                    match = pattern.match(text, start)
+                    if match:
+                        formula_text = match.group(formula_group)
+                        if self._accept_match(formula_text, pattern_name):
+                            break
+                else:
+                    pos = start + 1
                     continue
-                
-                formula_data = {
-                    'formula': formula_text.strip(),
-                    'type': pattern_name,
-                    'position': {
-                        'start': match.start(),
-                        'end': match.end()
-                    },
-                    'context': "",
-                    'confidence': self._calculate_confidence(formula_text, pattern_name),
-                    'metadata': self._extract_formula_metadata(formula_text, pattern_name)
-                }
-                
-                formulas.append(formula_data)
-        
-        # Remove duplicates and sort by position
-        formulas = self._deduplicate_formulas(formulas)
-        formulas.sort(key=lambda x: x['position']['start'])
+            
+            pos = max(match.end(), start + 1)
+            
+            # Matches arrive in position order, so repeats are dropped here
+            # exactly as _deduplicate_formulas would, before any scoring
+            normalized = self._normalize_formula(formula_text)
+            if normalized in seen_formulas:
+                continue
+            seen_formulas.add(normalized)
+            
+            formula_data = {
+                'formula': formula_text.strip(),
+                'type': pattern_name,
+                'position': {
+                    'start': match.start(),
+                    'end': match.end()
+                },
+                'context': "",
+                'confidence': self._calculate_confidence(formula_text, pattern_name),
+                'metadata': self._extract_formula_metadata(formula_text, pattern_name)
+            }
+            
+            formulas.append(formula_data)
         
         for formula in formulas:
             if 'metadata' not in formula or not formula['metadata']:
@@ -166,6 +322,18 @@ class FormulaExtractor:
         # Implementation details...
         return []
     
+    def _accept_match(self, formula: str, pattern_type: str) -> bool:
+        """Whether a scanner match is kept as a formula of ``pattern_type``"""
+        if pattern_type == 'inline_latex' and self._is_currency_prose(formula):
+            return False
+        return self._validate_formula(formula, pattern_type)
+    
+    @staticmethod
+    def _is_currency_prose(formula: str) -> bool:
+        """Whether an inline ``$...$`` body is prose between two dollar amounts"""
+        return (bool(_LEADING_NUMBER_RE.match(formula)) and bool(_WORD_RE.search(formula))
+                and not _OPERATOR_RE.search(formula) and not any(m in formula for m in _LATEX_MARKUP))
+    
     def _validate_formula(self, formula: str, pattern_type: str) -> bool:
         """Validate if extracted text is likely a genuine formula."""
         if len(formula) < self.config['min_formula_length']:
@@ -187,7 +355,7 @@ class FormulaExtractor:
         
         # LaTeX validation for LaTeX patterns
         if self.config['patterns']['latex'] and 'latex' in pattern_type:
-            return self._validate_latex_syntax(formula)
+            return self._formula_features(formula)['latex_valid']
         
         return True
     
@@ -231,8 +399,7 @@ class FormulaExtractor:
             confidence += 0.2
         
         # Higher confidence for mathematical symbols
-        math_symbols = ['\\', '^', '_', '{', '}', 'sum', 'int', 'frac', 'sqrt']
-        symbol_count = sum(1 for symbol in math_symbols if symbol in formula)
+        symbol_count = self._formula_features(formula)['math_symbol_count']
         confidence += min(0.3, symbol_count * 0.05)
         
         # Lower confidence for very short formulas
@@ -243,19 +410,16 @@ class FormulaExtractor:
     
     def _extract_formula_metadata(self, formula: str, pattern_type: str) -> Dict[str, Any]:
         """Extract metadata about the formula, with defensive coding for all fields."""
-        try:
-            complexity_score = self._calculate_complexity(formula)
-        except Exception:
-            complexity_score = 0.0
+        features = self._formula_features(formula)
         metadata = {
             'length': len(formula),
-            'has_greek_letters': bool(re.search(r'\\[a-zA-Z]+', formula)),
-            'has_superscript': '^' in formula,
-            'has_subscript': '_' in formula,
-            'has_fractions': 'frac' in formula or '/' in formula,
-            'has_integrals': bool(re.search(r'\\int|∫', formula)),
-            'has_summations': bool(re.search(r'\\sum|Σ', formula)),
-            'complexity_score': complexity_score,
+            'has_greek_letters': features['has_greek_letters'],
+            'has_superscript': features['has_superscript'],
+            'has_subscript': features['has_subscript'],
+            'has_fractions': features['has_fractions'],
+            'has_integrals': features['has_integrals'],
+            'has_summations': features['has_summations'],
+            'complexity_score': features['complexity_score'],
             'source': pattern_type if pattern_type else 'unknown'
         }
         # Ensure all required keys exist with defaults
@@ -265,6 +429,38 @@ class FormulaExtractor:
                 metadata[key] = 0 if 'has_' in key or key == 'length' else ''
         return metadata
     
+    def _formula_features(self, formula: str) -> Dict[str, Any]:
+        """Validation and scoring features of ``formula``
+        
+        None of them depend on whitespace, so they are memoised in
+        ``metadata_cache`` by whitespace-normalised text and a formula
+        repeated across documents is scored once. Consecutive calls for the
+        same formula (validation, confidence, metadata) count as one lookup.
+        """
+        last = self._last_features
+        if last is not None and last[0] == formula:
+            return last[1]
+        features = self.metadata_cache.get_or_compute(formula, self._compute_formula_features)
+        self._last_features = (formula, features)
+        return features
+    
+    def _compute_formula_features(self, formula: str) -> Dict[str, Any]:
+        try:
+            complexity_score = self._calculate_complexity(formula)
+        except Exception:
+            complexity_score = 0.0
+        return {
+            'latex_valid': self._validate_latex_syntax(formula),
+            'math_symbol_count': sum(1 for symbol in _CONFIDENCE_SYMBOLS if symbol in formula),
+            'has_greek_letters': bool(_LATEX_COMMAND_RE.search(formula)),
+            'has_superscript': '^' in formula,
+            'has_subscript': '_' in formula,
+            'has_fractions': 'frac' in formula or '/' in formula,
+            'has_integrals': bool(_INTEGRAL_RE.search(formula)),
+            'has_summations': bool(_SUMMATION_RE.search(formula)),
+            'complexity_score': complexity_score
+        }
+    
     def _calculate_complexity(self, formula: str) -> float:
         """Calculate complexity score for the formula."""
         complexity = 0
@@ -282,23 +478,27 @@ class FormulaExtractor:
         complexity += max_nesting * 0.2
         
         # Count LaTeX commands
-        commands = len(re.findall(r'\\[a-zA-Z]+', formula))
+        commands = len(_LATEX_COMMAND_RE.findall(formula))
         complexity += commands * 0.1
         
         # Count operators
-        operators = len(re.findall(r'[+\-*/=<>≤≥≠∈∉⊂⊃∩∪]', formula))
+        operators = len(_OPERATOR_RE.findall(formula))
         complexity += operators * 0.05
         
         return min(1.0, complexity)
     
+    @staticmethod
+    def _normalize_formula(formula: str) -> str:
+        """Normalize formula text for comparison"""
+        return _WHITESPACE_RE.sub(' ', formula.strip().lower())
+    
     def _deduplicate_formulas(self, formulas: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Remove duplicate formulas based on content similarity."""
         unique_formulas = []
         seen_formulas = set()
         
         for formula in formulas:
-            # Normalize formula text for comparison
-            normalized = re.sub(r'\s+', ' ', formula['formula'].strip().lower())
+            normalized = self._normalize_formula(formula['formula'])
             
             if normalized not in seen_formulas:
                 seen_formulas.add(normalized)
@@ -306,10 +506,14 @@ class FormulaExtractor:
         
         return unique_formulas
     
-    def extract_comprehensive(self, pdf_path: str, text: str) -> Dict[str, Any]:
-        """Extract formulas using both PDF structure, text analysis, and OCR."""
+    def extract_comprehensive(self, pdf_path: str, text: str,
+                              math_lines: Optional[List[Tuple[int, str]]] = None) -> Dict[str, Any]:
+        """Extract formulas using both PDF structure, text analysis, and OCR.
+        
+        ``math_lines`` are passed to :meth:`extract_from_pdf`.
+        """
         text_formulas = self.extract(text)
-        pdf_formulas = self.extract_from_pdf(pdf_path)
+        pdf_formulas = self.extract_from_pdf(pdf_path, math_lines)
         ocr_formulas = self.extract_from_ocr(pdf_path)
         # Combine and deduplicate
         all_formulas = text_formulas['formulas'] + pdf_formulas + ocr_formulas
@@ -324,12 +528,14 @@ class FormulaExtractor:
             'complexity_distribution': self._analyze_complexity_distribution(unique_formulas),
             'formula_types': self._analyze_formula_types(unique_formulas)
         }
+        self.metadata_cache.flush()
         return {
             'formulas': unique_formulas,
             'statistics': stats,
             'extraction_metadata': {
                 'config': self.config,
-                'patterns_used': list(self.formula_patterns.keys())
+                'patterns_used': list(self.formula_patterns.keys()),
+                'metadata_cache': self.metadata_cache.stats
             }
         }
     
@@ -358,47 +564,34 @@ class FormulaExtractor:
         
         return type_counts
 
-    def extract_from_pdf(self, pdf_path: str) -> List[Dict[str, Any]]:
-        """Extract formulas directly from PDF structure."""
+    def extract_from_pdf(self, pdf_path: str,
+                         math_lines: Optional[List[Tuple[int, str]]] = None) -> List[Dict[str, Any]]:
+        """Extract formulas directly from PDF structure.
+        
+        Args:
+            pdf_path: PDF to read when ``math_lines`` is not given
+            math_lines: ``(page number, line text)`` of the math-font lines,
+                as captured during primary extraction by :func:`extract_page_text`;
+                when given the PDF is not opened again
+        """
         formulas = []
         
         try:
-            doc = fitz.open(pdf_path)
+            if math_lines is None:
+                math_lines = []
+                doc = fitz.open(pdf_path)
+                for page_num in range(len(doc)):
+                    page = doc.load_page(page_num)
+                    math_lines.extend((page_num + 1, line) for line in math_font_lines(page.get_text("dict")))
+                doc.close()
             
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                
-                # Extract text blocks with formatting
-                blocks = page.get_text("dict")
-                
-                for block in blocks.get("blocks", []):
-                    if "lines" in block:
-                        for line in block["lines"]:
-                            line_text = ""
-                            has_math_font = False
-                            
-                            for span in line.get("spans", []):
-                                text = span.get("text", "")
-                                font = span.get("font", "").lower()
-                                
-                                # Detect mathematical fonts
-                                if any(math_font in font for math_font in 
-                                      ['symbol', 'math', 'times', 'cmr', 'latin']):
-                                    has_math_font = True
-                                
-                                line_text += text
-                            
-                            # If line contains mathematical content, extract formulas
-                            if has_math_font and line_text.strip():
-                                line_formulas = self.extract(line_text)
-                                
-                                for formula in line_formulas:
-                                    formula['page'] = page_num + 1
-                                    formula['source'] = 'pdf_structure'
-                                    formula['font_based'] = True
-                                    formulas.append(formula)
-            
-            doc.close()
+            # Lines containing mathematical content
+            for page_number, line_text in math_lines:
+                for formula in self.extract(line_text)['formulas']:
+                    formula['page'] = page_number
+                    formula['source'] = 'pdf_structure'
+                    formula['font_based'] = True
+                    formulas.append(formula)
             
         except Exception as e:
             self.logger.error(f"Error extracting formulas from PDF {pdf_path}: {e}")
@@ -412,24 +605,32 @@ class FormulaExtractor:
         return formulas
     
     def extract_from_ocr(self, pdf_path: str) -> List[Dict[str, Any]]:
-        """Extract formulas from rendered page images using OCR."""
+        """Extract formulas from rendered page images using OCR.
+
+        Pages are rendered straight into images and recognised a batch at
+        a time by the shared OCR service.
+        """
         formulas = []
+        ocr = shared_ocr_service()
         try:
             doc = fitz.open(pdf_path)
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                pix = page.get_pixmap()
-                img = Image.open(BytesIO(pix.tobytes("png")))
-                ocr_text = pytesseract.image_to_string(img, config='--psm 6')
-                # Heuristic: look for math symbols or patterns
-                if any(sym in ocr_text for sym in ['=', '\\frac', '\\sum', '\\int', '+', '-', '*', '/', '^']):
-                    formulas.append({
-                        'formula': ocr_text.strip(),
-                        'type': 'ocr_image',
-                        'page': page_num + 1,
-                        'confidence': 0.5,  # Placeholder
-                        'source': 'ocr_image'
-                    })
+            for first in range(0, len(doc), ocr.batch_size):
+                page_nums = range(first, min(first + ocr.batch_size, len(doc)))
+                images = []
+                for page_num in page_nums:
+                    pix = doc.load_page(page_num).get_pixmap()
+                    mode = 'RGBA' if pix.alpha else 'RGB'
+                    images.append(Image.frombytes(mode, (pix.width, pix.height), pix.samples))
+                for page_num, ocr_text in zip(page_nums, ocr.images_to_strings(images)):
+                    # Heuristic: look for math symbols or patterns
+                    if any(sym in ocr_text for sym in ['=', '\\frac', '\\sum', '\\int', '+', '-', '*', '/', '^']):
+                        formulas.append({
+                            'formula': ocr_text.strip(),
+                            'type': 'ocr_image',
+                            'page': page_num + 1,
+                            'confidence': 0.5,  # Placeholder
+                            'source': 'ocr_image'
+                        })
             doc.close()
         except Exception as e:
             self.logger.error(f"Error extracting formulas via OCR from PDF {pdf_path}: {e}")
@@ -0,0 +1,30 @@
+"""
+Module: image_analysis_cache
+Purpose: Bounded, optionally persisted memo of embedded-image analyses
+(quality score, OCR text, chart detection, thumbnail) keyed by the digest
+of the image bytes, so logos, watermarks and figures that recur across
+pages and documents are analysed once.
+"""
+from pathlib import Path
+from typing import Optional, Union
+
+from .feature_cache import FeatureCache, shared_cache
+
+DEFAULT_MAX_ENTRIES = 5_000  # entries hold thumbnails, so fewer than for formulas
+
+
+class ImageAnalysisCache(FeatureCache):
+    """:class:`FeatureCache` of image analyses keyed by image content digest"""
+
+    table = 'image_analysis'
+    key_column = 'digest'
+
+
+def shared_image_analysis_cache(path: Optional[Union[str, Path]] = None, version: str = '1',
+                                max_entries: int = DEFAULT_MAX_ENTRIES) -> ImageAnalysisCache:
+    """Process-wide cache for ``path`` (or the in-memory one)
+
+    Extractors are created per document; sharing the cache lets images
+    repeated across documents hit it.
+    """
+    return shared_cache(ImageAnalysisCache, path, version, max_entries)
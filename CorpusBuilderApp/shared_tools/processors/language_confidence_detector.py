@@ -7,14 +7,45 @@ import json
 import logging
 from collections import Counter
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Iterable, List, Optional, Any, Union
 from langdetect import detect_langs, LangDetectException
 from shared_tools.project_config import ProjectConfig
 logger = logging.getLogger(__name__)
 
+class LanguageConfidenceStream:
+    """Incremental :meth:`LanguageConfidenceDetector.detect`
+    
+    Each metric is scored per fed piece and averaged weighted by piece
+    length, so the result does not depend on how the text was split into
+    pieces of similar quality.
+    """
+    
+    def __init__(self, detector: 'LanguageConfidenceDetector'):
+        self.detector = detector
+        self.length = 0
+        self._weighted: Dict[str, float] = {}
+    
+    def feed(self, text: str) -> 'LanguageConfidenceStream':
+        if not text:
+            return self
+        self.length += len(text)
+        for name, check in self.detector._metric_checks():
+            self._weighted[name] = self._weighted.get(name, 0.0) + check(text) * len(text)
+        return self
+    
+    def result(self) -> Dict[str, Any]:
+        metrics = {name: total / self.length for name, total in self._weighted.items()}
+        return self.detector._score(self.length, metrics)
+
 class LanguageConfidenceDetector:
     """Detect language confidence"""
     
+    # Bump when detect() scoring changes so cached verdicts are recomputed
+    VERDICT_VERSION = 2
+    # Metrics whose checks are implemented; the others are placeholders that
+    # would score every text 0.0, so they are left out of ``metrics``
+    SCORED_METRICS = ()
+    
     def __init__(self, project_config, *a, **kw):
         super().__init__(*a, **kw)
         self.project_config = project_config
@@ -152,6 +183,38 @@ class LanguageConfidenceDetector:
             dict: Detection results
         """
         if len(text) < self.config['min_text_length']:
+            return self._score(len(text), {})
+        return self._score(len(text), {name: check(text) for name, check in self._metric_checks()})
+    
+    def stream(self) -> 'LanguageConfidenceStream':
+        """Start scoring a text that is fed in pieces (see :class:`LanguageConfidenceStream`)"""
+        return LanguageConfidenceStream(self)
+    
+    def detect_stream(self, windows: Iterable[str]) -> Dict[str, Any]:
+        """:meth:`detect` for a text given as consecutive pieces, holding one at a time"""
+        stream = self.stream()
+        for window in windows:
+            stream.feed(window)
+        return stream.result()
+    
+    @property
+    def produces_signal(self) -> bool:
+        """Whether any text can get a non-empty ``metrics`` from :meth:`detect`"""
+        return bool(self._metric_checks())
+    
+    def _metric_checks(self):
+        """Implemented ``(metric, check)`` pairs enabled in the config, in scoring order"""
+        checks = (
+            ('grammar', 'grammar_check', self._check_grammar),
+            ('vocabulary', 'vocabulary_check', self._check_vocabulary),
+            ('fluency', 'fluency_check', self._check_fluency)
+        )
+        return [(name, check) for name, flag, check in checks
+                if name in self.SCORED_METRICS and self.config['metrics'][flag]]
+    
+    def _score(self, length: int, metrics: Dict[str, float]) -> Dict[str, Any]:
+        """Detection results for a text of ``length`` characters with per-metric scores"""
+        if length < self.config['min_text_length']:
             return {
                 'confidence': 0.0,
                 'reason': 'Text too short'
@@ -162,23 +225,9 @@ class LanguageConfidenceDetector:
             'metrics': {}
         }
         
-        # Check grammar
-        if self.config['metrics']['grammar_check']:
-            grammar_score = self._check_grammar(text)
-            results['metrics']['grammar'] = grammar_score
-            results['confidence'] = max(results['confidence'], grammar_score)
-        
-        # Check vocabulary
-        if self.config['metrics']['vocabulary_check']:
-            vocab_score = self._check_vocabulary(text)
-            results['metrics']['vocabulary'] = vocab_score
-            results['confidence'] = max(results['confidence'], vocab_score)
-        
-        # Check fluency
-        if self.config['metrics']['fluency_check']:
-            fluency_score = self._check_fluency(text)
-            results['metrics']['fluency'] = fluency_score
-            results['confidence'] = max(results['confidence'], fluency_score)
+        for name, score in metrics.items():
+            results['metrics'][name] = score
+            results['confidence'] = max(results['confidence'], score)
         
         return results
     
@@ -251,15 +300,111 @@ def main():
 if __name__ == "__main__":
     main()
 
-def detect_language_confidence(text, low_conf_threshold=0.85, mixed_lang_ratio=0.15):
+# Sampling limits for detect_language_confidence. langdetect itself only
+# reads the first 10000 characters, so the primary pass uses that many
+# characters spread across the document instead of the leading block.
+PRIMARY_WINDOWS = 5
+PRIMARY_WINDOW_CHARS = 2000
+DEFAULT_SEGMENT_BUDGET = 64
+EXHAUSTIVE_MAX_CHARS = 20000
+EARLY_EXIT_MIN_SEGMENTS = 16
+EARLY_EXIT_CHECK_EVERY = 8
+EARLY_EXIT_TOLERANCE = 0.05
+MIN_SEGMENT_WORDS = 5
+
+_SEGMENT_BOUNDARY_RE = re.compile(r'[.!?\n]')
+
+
+def _primary_sample(text):
+    """Return up to PRIMARY_WINDOWS evenly spaced windows of ``text``."""
+    if len(text) <= PRIMARY_WINDOWS * PRIMARY_WINDOW_CHARS:
+        return text
+    stride = (len(text) - PRIMARY_WINDOW_CHARS) / (PRIMARY_WINDOWS - 1)
+    return '\n'.join(
+        text[int(i * stride):int(i * stride) + PRIMARY_WINDOW_CHARS] for i in range(PRIMARY_WINDOWS)
+    )
+
+
+def _spread_order(n):
+    """Return ``range(n)`` reordered coarse-to-fine (0, n/2, n/4, 3n/4, ...)."""
+    bits = max(1, (n - 1).bit_length())
+    return sorted(range(n), key=lambda i: int(format(i, f'0{bits}b')[::-1], 2))
+
+
+def _sampled_segments(text, budget):
+    """Yield at most ``budget`` segments drawn from evenly sized strata of ``text``.
+
+    Each stratum contributes the first segment of MIN_SEGMENT_WORDS or more
+    that starts inside it. Strata are visited coarse-to-fine so that any
+    prefix of the output already covers the whole document.
+    """
+    stratum = len(text) / budget
+    for index in _spread_order(budget):
+        lo, hi = int(index * stratum), int((index + 1) * stratum)
+        pos = lo
+        if pos > 0:
+            boundary = _SEGMENT_BOUNDARY_RE.search(text, pos - 1)
+            pos = boundary.end() if boundary else len(text)
+        while pos < hi:
+            boundary = _SEGMENT_BOUNDARY_RE.search(text, pos)
+            end = boundary.start() if boundary else len(text)
+            seg = text[pos:end].strip()
+            if len(seg.split()) >= MIN_SEGMENT_WORDS:
+                yield seg
+                break
+            pos = end + 1
+
+
+def _segment_proportions(segment_langs):
+    total = len(segment_langs)
+    return {l: c / total for l, c in Counter(segment_langs).items()}
+
+
+def _detect_segment_languages(text, segment_budget):
+    """Return per-segment primary languages, sampled when the text is long."""
+    if segment_budget is None or len(text) <= EXHAUSTIVE_MAX_CHARS:
+        segments = (seg.strip() for seg in re.split(r'[.!?\n]', text))
+        segments = (seg for seg in segments if len(seg.split()) >= MIN_SEGMENT_WORDS)
+        early_exit = False
+    else:
+        segments = _sampled_segments(text, max(1, segment_budget))
+        early_exit = True
+
+    segment_langs = []
+    previous = None
+    for seg in segments:
+        try:
+            segment_langs.append(detect_langs(seg)[0].lang)
+        except Exception:
+            continue
+        n = len(segment_langs)
+        if early_exit and n >= EARLY_EXIT_MIN_SEGMENTS and n % EARLY_EXIT_CHECK_EVERY == 0:
+            current = _segment_proportions(segment_langs)
+            if previous is not None and all(
+                abs(current.get(l, 0.0) - previous.get(l, 0.0)) < EARLY_EXIT_TOLERANCE
+                for l in set(current) | set(previous)
+            ):
+                break
+            previous = current
+    return segment_langs
+
+
+def detect_language_confidence(text, low_conf_threshold=0.85, mixed_lang_ratio=0.15,
+                               segment_budget=DEFAULT_SEGMENT_BUDGET):
     """
     Detects language, confidence, and mixed-language content in text.
     Returns a dict with language, language_confidence, mixed_language_flag, mixed_languages, reasons, severity.
+
+    Texts longer than EXHAUSTIVE_MAX_CHARS are sampled: the primary language
+    comes from windows spread across the document, and at most
+    ``segment_budget`` stratified sentence segments are checked for mixed
+    languages, stopping early once the language proportions stabilise.
+    Pass ``segment_budget=None`` to check every segment.
     """
     reasons = []
     severity = 'ok'
     try:
-        langs = detect_langs(text)
+        langs = detect_langs(_primary_sample(text))
         if not langs:
             return {'language': 'unknown', 'language_confidence': 0.0, 'mixed_language_flag': False, 'mixed_languages': [], 'reasons': ['No language detected'], 'severity': 'critical'}
         primary = langs[0]
@@ -269,18 +414,8 @@ def detect_language_confidence(text, low_conf_threshold=0.85, mixed_lang_ratio=0
         if confidence is None:
             confidence = 1.0 if language != 'unknown' else 0.0
         # Mixed language detection: segment text and compare
-        segments = re.split(r'[.!?\n]', text)
-        segment_langs = []
-        for seg in segments:
-            seg = seg.strip()
-            if len(seg.split()) < 5:
-                continue
-            try:
-                seg_lang = detect_langs(seg)[0].lang
-                segment_langs.append(seg_lang)
-            except Exception:
-                continue
-        lang_counts = {l: segment_langs.count(l) for l in set(segment_langs)}
+        segment_langs = _detect_segment_languages(text, segment_budget)
+        lang_counts = Counter(segment_langs)
         if len(lang_counts) > 1:
             total = sum(lang_counts.values())
             mixed = [(l, c/total) for l, c in lang_counts.items() if c/total > mixed_lang_ratio]
@@ -1,14 +1,24 @@
+import os
 import re
+import copy
 import json
 import logging
+import threading
 from collections import Counter
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Iterable, List, Optional, Any, Union
 from shared_tools.project_config import ProjectConfig
 logger = logging.getLogger(__name__)
 
+# Parsed configs and their compiled disclaimer patterns, keyed by config path.
+# Each entry records the (mtime_ns, size) of the file it was read from so an
+# edited config is picked up on the next call without re-reading it every time.
+_CONFIG_CACHE: Dict[Optional[str], tuple] = {}
+_CONFIG_CACHE_LOCK = threading.Lock()
+
 # --- Load language/domain-specific config ---
-def load_mt_config(config_path=None):
+def _read_mt_config(config_path=None):
     default_config = {
         'disclaimer_patterns': [
             r'translated by', r'machine translation', r'automatic translation',
@@ -34,28 +44,311 @@ def load_mt_config(config_path=None):
         default_config.update(user_config)
     return default_config
 
+def _config_stamp(config_path):
+    """Return ``(mtime_ns, size)`` for ``config_path``, or None if it does not exist."""
+    if not config_path:
+        return None
+    try:
+        st = os.stat(config_path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def _get_mt_config(config_path=None):
+    """Return ``(config, disclaimer_regexes)`` for ``config_path``, loading at most once per file version.
+
+    The returned config is shared between callers and must not be mutated.
+    """
+    key = str(config_path) if config_path else None
+    stamp = _config_stamp(config_path)
+    with _CONFIG_CACHE_LOCK:
+        cached = _CONFIG_CACHE.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1], cached[2]
+    config = _read_mt_config(config_path if stamp is not None else None)
+    disclaimers = [re.compile(pat, re.IGNORECASE) for pat in config['disclaimer_patterns']]
+    with _CONFIG_CACHE_LOCK:
+        _CONFIG_CACHE[key] = (stamp, config, disclaimers)
+    return config, disclaimers
+
+def load_mt_config(config_path=None):
+    """Return a copy of the machine-translation config, read from disk only when the file changed."""
+    config, _ = _get_mt_config(config_path)
+    return copy.deepcopy(config)
+
+def clear_mt_config_cache():
+    """Drop all cached configs; the next call re-reads them from disk."""
+    with _CONFIG_CACHE_LOCK:
+        _CONFIG_CACHE.clear()
+
 # Legitimate repetition: only bullet points and numbered lists
 LEGITIMATE_REPETITION_PATTERNS = [
     r'^[0-9]+\. ', # Numbered lists
     r'^[\-\*] ',   # Bullet points
 ]
+_LEGITIMATE_REPETITION_RES = [re.compile(pat) for pat in LEGITIMATE_REPETITION_PATTERNS]
+
+# Patterns used by the heuristics below, compiled once per process
+_PHRASE_SPLIT_RE = re.compile(r'[.!?\n]')
+_WORD_RE = re.compile(r'\b\w+\b')
+_ARTICLE_START_RE = re.compile(r'^(the|a|an)\b')
+_PRESENT_CONTINUOUS_RE = re.compile(r'\b(am|is|are|was|were)\s+\w+ing\b')
+_PAST_PERFECT_RE = re.compile(r'\bhad\s+\w+ed\b')
+_VERB_FORM_RE = re.compile(r'\b\w+ed\b|\b\w+ing\b')
+# Verb patterns counted over line blocks; a match spans at most two tokens
+_VERB_COUNT_RES = (_PRESENT_CONTINUOUS_RE, _PAST_PERFECT_RE, _VERB_FORM_RE)
+_VERB_MATCH_TOKENS = 2
+_NGRAM_FREQ_RE = re.compile(r"\((\d+) times\)")
 
-def is_legitimate_repetition(text):
+def is_legitimate_repetition(text, features=None):
+    if features is not None:
+        return features.legitimate_repetition
     lines = text.splitlines()
-    for pat in LEGITIMATE_REPETITION_PATTERNS:
-        if all(re.match(pat, l.strip()) for l in lines if l.strip()):
+    for pat in _LEGITIMATE_REPETITION_RES:
+        if all(pat.match(l.strip()) for l in lines if l.strip()):
             return True
     return False
 
 # Exception for code patterns
 CODE_PATTERN = re.compile(r'^(def |class |[a-zA-Z_][a-zA-Z0-9_]* ?=)')
-def is_code_pattern(text):
+def is_code_pattern(text, features=None):
+    if features is not None:
+        return features.code_pattern
     lines = text.splitlines()
     return any(CODE_PATTERN.match(l.strip()) for l in lines if l.strip())
 
+# English stopwords as functional words (Heuristic 3)
+FUNCTIONAL_WORDS = frozenset([
+    'the', 'a', 'an', 'in', 'on', 'at', 'by', 'for', 'with', 'to', 'from', 'of', 'and', 'or', 'but', 'as', 'if', 'than', 'then', 'when', 'while', 'where', 'after', 'before', 'above', 'below', 'over', 'under', 'again', 'further', 'once', 'about', 'against', 'between', 'into', 'through', 'during', 'without', 'within', 'along', 'across', 'behind', 'beyond', 'plus', 'except', 'up', 'down', 'off', 'out', 'around', 'near'
+])
+# Small set of common English words; everything else counts as rare (Heuristic 6)
+COMMON_WORDS = frozenset([
+    'the', 'be', 'to', 'of', 'and', 'a', 'in', 'that', 'have', 'i', 'it', 'for', 'not', 'on', 'with', 'he', 'as', 'you', 'do', 'at'
+])
+
+MT_WINDOW_CHARS = 1 << 16
+MAX_TRACKED_NGRAMS = 200_000
+MAX_LINE_CHARS = 1 << 22
+
+class TextFeatures:
+    """Token statistics shared by the machine-translation heuristics.
+
+    Text is consumed in windows cut at whitespace, so a single pass fills
+    the word counts, the n-gram counts, the sentence/article counts and the
+    repeated-phrase run used by the individual checks. Apart from the word
+    vocabulary, memory is bounded by the window size and ``max_ngrams``:
+    when more distinct n-grams are seen, the least frequent ones are dropped
+    and ``ngrams_pruned`` is set, making n-gram counts approximate only for
+    very large documents.
+
+    The line-based signals (code lines, list-only repetition, disclaimers and
+    verb forms) are gathered from whole lines: :meth:`feed` holds back a
+    partial last line, up to ``MAX_LINE_CHARS``. The verb counts carry the
+    last tokens of each block into the next, so a match spanning two blocks,
+    such as "is" ending one line and "running" starting the next, is counted
+    exactly as in the whole text.
+    """
+
+    def __init__(self, ngram_size=3, phrase_repeats=3, max_ngrams=MAX_TRACKED_NGRAMS, disclaimer_patterns=()):
+        self.ngram_size = ngram_size
+        self.phrase_repeats = phrase_repeats
+        self.max_ngrams = max_ngrams
+        self.word_counts: Counter = Counter()   # Lowercased \w+ words
+        self.word_count = 0
+        self.token_count = 0                    # Whitespace-separated tokens
+        self.ngram_counts: Counter = Counter()  # Tuples of whitespace-separated tokens
+        self.ngrams_pruned = False
+        self.article_sentences = 0              # Sentences of 5+ words
+        self.missing_article_sentences = 0      # ... not starting with the/a/an
+        self.repeated_phrase = None             # (phrase, count) of the first run reaching phrase_repeats
+        self._carry = ''
+        self._tail_tokens: List[str] = []
+        self._pending_phrase = ''
+        self._prev_phrase = None
+        self._phrase_run = 1
+        self.code_pattern = False               # Some line looks like code
+        self._list_line_patterns = [True] * len(_LEGITIMATE_REPETITION_RES)
+        self.present_continuous_count = 0
+        self.past_perfect_count = 0
+        self.verb_form_count = 0
+        self._verb_tails = [''] * len(_VERB_COUNT_RES)  # Unmatched end of the text so far, per pattern
+        self.disclaimer_patterns = [
+            pat if isinstance(pat, re.Pattern) else re.compile(pat, re.IGNORECASE) for pat in disclaimer_patterns
+        ]
+        self._disclaimer_hit = None             # Index of the first pattern found so far
+        self._line_carry = ''
+
+    @classmethod
+    def from_text(cls, text, window_chars=MT_WINDOW_CHARS, **kwargs):
+        features = cls(**kwargs)
+        # The text is already in memory, so its lines are scanned in one go
+        features._consume_lines(text)
+        for start in range(0, len(text), window_chars):
+            features._feed_tokens(text[start:start + window_chars])
+        return features.finish()
+
+    @classmethod
+    def from_windows(cls, windows, **kwargs):
+        """Build features from consecutive pieces of text, e.g. :func:`iter_text_windows` output."""
+        features = cls(**kwargs)
+        for window in windows:
+            features.feed(window)
+        return features.finish()
+
+    @property
+    def legitimate_repetition(self):
+        """Every non-blank line is a list item of one kind (numbered or bulleted)."""
+        return any(self._list_line_patterns)
+
+    @property
+    def disclaimer_reason(self):
+        if self._disclaimer_hit is None:
+            return None
+        return f"Found translation disclaimer: '{self.disclaimer_patterns[self._disclaimer_hit].pattern}'"
+
+    @property
+    def unique_word_count(self):
+        return len(self.word_counts)
+
+    @property
+    def functional_word_count(self):
+        return sum(self.word_counts[w] for w in FUNCTIONAL_WORDS)
+
+    @property
+    def rare_word_count(self):
+        return self.word_count - sum(self.word_counts[w] for w in COMMON_WORDS)
+
+    def feed(self, chunk):
+        """Add the next piece of text; chunks may split words and lines anywhere."""
+        lines = self._line_carry + chunk
+        cut = lines.rfind('\n') + 1
+        if not cut and len(lines) > MAX_LINE_CHARS:
+            cut = len(lines)
+        self._line_carry = lines[cut:]
+        if cut:
+            self._consume_lines(lines[:cut])
+        return self._feed_tokens(chunk)
+
+    def _feed_tokens(self, chunk):
+        data = self._carry + chunk
+        cut = len(data)
+        while cut and not data[cut - 1].isspace():
+            cut -= 1
+        self._carry = data[cut:]
+        if cut:
+            self._consume(data[:cut])
+        return self
+
+    def finish(self):
+        """Flush the trailing word, line and phrase; call once after the last :meth:`feed`."""
+        if self._line_carry:
+            self._consume_lines(self._line_carry)
+            self._line_carry = ''
+        if self._carry:
+            self._consume(self._carry)
+            self._carry = ''
+        self._add_phrase(self._pending_phrase)
+        self._pending_phrase = ''
+        self._tail_tokens = []
+        return self
+
+    def _consume(self, window):
+        words = _WORD_RE.findall(window)
+        self.word_count += len(words)
+        self.word_counts.update(map(str.lower, words))
+
+        n = self.ngram_size
+        new_tokens = window.split()
+        self.token_count += len(new_tokens)
+        tokens = self._tail_tokens + new_tokens
+        if len(tokens) >= n:
+            self.ngram_counts.update(zip(*(islice(tokens, i, None) for i in range(n))))
+            if len(self.ngram_counts) > self.max_ngrams:
+                self._prune_ngrams()
+        self._tail_tokens = tokens[len(tokens) - n + 1:] if n > 1 else []
+
+        pieces = _PHRASE_SPLIT_RE.split(window)
+        pieces[0] = self._pending_phrase + pieces[0]
+        self._pending_phrase = pieces.pop()
+        for piece in pieces:
+            self._add_phrase(piece)
+
+    def _consume_lines(self, block):
+        lines = [line.strip() for line in block.splitlines()]
+        lines = [line for line in lines if line]
+        if not self.code_pattern:
+            self.code_pattern = any(CODE_PATTERN.match(line) for line in lines)
+        for i, pat in enumerate(_LEGITIMATE_REPETITION_RES):
+            if self._list_line_patterns[i]:
+                self._list_line_patterns[i] = all(pat.match(line) for line in lines)
+        self.present_continuous_count += self._count_verbs(0, block)
+        self.past_perfect_count += self._count_verbs(1, block)
+        self.verb_form_count += self._count_verbs(2, block)
+        # Only patterns listed before the first hit so far can change the reason
+        limit = len(self.disclaimer_patterns) if self._disclaimer_hit is None else self._disclaimer_hit
+        for i in range(limit):
+            if self.disclaimer_patterns[i].search(block):
+                self._disclaimer_hit = i
+                break
+
+    def _count_verbs(self, index, block):
+        """Matches of ``_VERB_COUNT_RES[index]`` ending in ``block``
+        
+        The block is scanned after the tail kept from the previous one: the
+        text since the last match, cut to the last ``_VERB_MATCH_TOKENS``
+        tokens and the whitespace before them. No match lies wholly in the
+        tail, and any match reaching into ``block`` starts inside it.
+        """
+        data = self._verb_tails[index] + block
+        count = 0
+        last_end = 0
+        for match in _VERB_COUNT_RES[index].finditer(data):
+            count += 1
+            last_end = match.end()
+        start = len(data)
+        for _ in range(_VERB_MATCH_TOKENS):
+            while start and data[start - 1].isspace():
+                start -= 1
+            while start and not data[start - 1].isspace():
+                start -= 1
+        self._verb_tails[index] = data[max(last_end, start - 1, 0):]
+        return count
+
+    def _prune_ngrams(self):
+        floor = 1
+        while len(self.ngram_counts) > self.max_ngrams // 2:
+            for key in [k for k, c in self.ngram_counts.items() if c <= floor]:
+                del self.ngram_counts[key]
+            floor += 1
+        self.ngrams_pruned = True
+
+    def _add_phrase(self, piece):
+        phrase = piece.strip()
+        if not phrase:
+            return
+        lowered = phrase.lower()
+        if len(lowered.split()) >= 5:
+            self.article_sentences += 1
+            if not _ARTICLE_START_RE.match(lowered):
+                self.missing_article_sentences += 1
+        if self.repeated_phrase is not None:
+            return
+        if phrase == self._prev_phrase:
+            self._phrase_run += 1
+            if self._phrase_run >= self.phrase_repeats:
+                self.repeated_phrase = (phrase, self._phrase_run)
+        else:
+            self._phrase_run = 1
+            self._prev_phrase = phrase
+
 # Strong repeated phrase check (e.g., "foo bar. foo bar. foo bar.")
-def check_repeated_phrase(text, min_repeats=3):
-    phrases = re.split(r'[.!?\n]', text)
+def check_repeated_phrase(text, min_repeats=3, features=None):
+    if features is not None and features.phrase_repeats == min_repeats:
+        if features.repeated_phrase:
+            p, count = features.repeated_phrase
+            return True, f"Exact phrase repetition: '{p}' repeated {count} times"
+        return False, None
+    phrases = _PHRASE_SPLIT_RE.split(text)
     phrases = [p.strip() for p in phrases if p.strip()]
     if not phrases:
         return False, None
@@ -72,23 +365,40 @@ def check_repeated_phrase(text, min_repeats=3):
     return False, None
 
 # --- Heuristic 1: Translation Disclaimers ---
-def check_disclaimers(text, patterns):
+def check_disclaimers(text, patterns, features=None):
+    """``patterns`` may be strings or regexes already compiled with ``re.IGNORECASE``.
+
+    With ``features`` built with the same ``disclaimer_patterns``, their
+    result is returned instead of searching ``text``.
+    """
+    if features is not None:
+        reason = features.disclaimer_reason
+        return reason is not None, reason
     for pat in patterns:
-        if re.search(pat, text, re.IGNORECASE):
+        if isinstance(pat, re.Pattern):
+            if pat.search(text):
+                return True, f"Found translation disclaimer: '{pat.pattern}'"
+        elif re.search(pat, text, re.IGNORECASE):
             return True, f"Found translation disclaimer: '{pat}'"
     return False, None
 
 # --- Heuristic 2: N-gram Repetition ---
-def check_ngram_repetition(text, n=3, threshold=4, text_len=None, verbose=False):
-    words = text.split()
-    if text_len is None:
-        text_len = len(words)
+def check_ngram_repetition(text, n=3, threshold=4, text_len=None, verbose=False, features=None):
+    if features is not None and features.ngram_size == n:
+        if text_len is None:
+            text_len = features.token_count
+        counts = features.ngram_counts
+        key = ' '.join
+    else:
+        words = text.split()
+        if text_len is None:
+            text_len = len(words)
+        counts = Counter(' '.join(words[i:i+n]) for i in range(len(words)-n+1))
+        key = str
     # Lower threshold for short texts
     if text_len < 200:
         threshold = max(2, threshold - 1)
-    ngrams = [' '.join(words[i:i+n]) for i in range(len(words)-n+1)]
-    counts = Counter(ngrams)
-    repeated = [(ng, c) for ng, c in counts.items() if c >= threshold]
+    repeated = [(key(ng), c) for ng, c in counts.items() if c >= threshold]
     if verbose:
         logger.debug(f"[MT-DEBUG] N-gram matches: {repeated}")
     if repeated:
@@ -96,16 +406,17 @@ def check_ngram_repetition(text, n=3, threshold=4, text_len=None, verbose=False)
     return False, []
 
 # --- Heuristic 3: Functional/Content Word Ratio ---
-def check_functional_content_ratio(text, ratio_threshold=0.7):
-    # English stopwords as functional words
-    functional = set([
-        'the', 'a', 'an', 'in', 'on', 'at', 'by', 'for', 'with', 'to', 'from', 'of', 'and', 'or', 'but', 'as', 'if', 'than', 'then', 'when', 'while', 'where', 'after', 'before', 'above', 'below', 'over', 'under', 'again', 'further', 'once', 'about', 'against', 'between', 'into', 'through', 'during', 'without', 'within', 'along', 'across', 'behind', 'beyond', 'plus', 'except', 'up', 'down', 'off', 'out', 'around', 'near'
-    ])
-    words = [w.lower() for w in re.findall(r'\b\w+\b', text)]
-    if not words:
+def check_functional_content_ratio(text, ratio_threshold=0.7, features=None):
+    if features is not None:
+        total = features.word_count
+        func_count = features.functional_word_count
+    else:
+        words = [w.lower() for w in _WORD_RE.findall(text)]
+        total = len(words)
+        func_count = sum(1 for w in words if w in FUNCTIONAL_WORDS)
+    if not total:
         return False, None
-    func_count = sum(1 for w in words if w in functional)
-    content_count = len(words) - func_count
+    content_count = total - func_count
     if content_count == 0:
         return False, None
     ratio = func_count / content_count
@@ -114,18 +425,22 @@ def check_functional_content_ratio(text, ratio_threshold=0.7):
     return False, None
 
 # --- Heuristic 4: Missing Articles/Determiners ---
-def check_missing_articles(text, threshold=0.08):
+def check_missing_articles(text, threshold=0.08, features=None):
     # Look for sentences missing 'the', 'a', 'an' at start
-    sentences = re.split(r'[.!?\n]', text)
-    missing = 0
-    total = 0
-    for s in sentences:
-        s = s.strip().lower()
-        if not s or len(s.split()) < 5:
-            continue
-        total += 1
-        if not re.match(r'^(the|a|an)\b', s):
-            missing += 1
+    if features is not None:
+        total = features.article_sentences
+        missing = features.missing_article_sentences
+    else:
+        sentences = _PHRASE_SPLIT_RE.split(text)
+        missing = 0
+        total = 0
+        for s in sentences:
+            s = s.strip().lower()
+            if not s or len(s.split()) < 5:
+                continue
+            total += 1
+            if not _ARTICLE_START_RE.match(s):
+                missing += 1
     if total == 0:
         return False, None
     ratio = missing / total
@@ -134,11 +449,16 @@ def check_missing_articles(text, threshold=0.08):
     return False, None
 
 # --- Heuristic 5: Unusual Verb Tense Patterns ---
-def check_unusual_verb_tense(text, threshold=0.12):
+def check_unusual_verb_tense(text, threshold=0.12, features=None):
     # Simple heuristic: look for overuse of present continuous or past perfect
-    present_cont = len(re.findall(r'\b(am|is|are|was|were)\s+\w+ing\b', text))
-    past_perfect = len(re.findall(r'\bhad\s+\w+ed\b', text))
-    total_verbs = len(re.findall(r'\b\w+ed\b|\b\w+ing\b', text))
+    if features is not None:
+        present_cont = features.present_continuous_count
+        past_perfect = features.past_perfect_count
+        total_verbs = features.verb_form_count
+    else:
+        present_cont = len(_PRESENT_CONTINUOUS_RE.findall(text))
+        past_perfect = len(_PAST_PERFECT_RE.findall(text))
+        total_verbs = len(_VERB_FORM_RE.findall(text))
     if total_verbs == 0:
         return False, None
     ratio = (present_cont + past_perfect) / total_verbs
@@ -147,16 +467,17 @@ def check_unusual_verb_tense(text, threshold=0.12):
     return False, None
 
 # --- Heuristic 6: Rare Word Ratio ---
-def check_rare_word_ratio(text, rare_word_ratio_threshold=0.15):
-    # Use a small set of common English words; flag if too many rare words
-    common = set([
-        'the', 'be', 'to', 'of', 'and', 'a', 'in', 'that', 'have', 'i', 'it', 'for', 'not', 'on', 'with', 'he', 'as', 'you', 'do', 'at'
-    ])
-    words = [w.lower() for w in re.findall(r'\b\w+\b', text)]
-    if not words:
+def check_rare_word_ratio(text, rare_word_ratio_threshold=0.15, features=None):
+    if features is not None:
+        total = features.word_count
+        rare_count = features.rare_word_count
+    else:
+        words = [w.lower() for w in _WORD_RE.findall(text)]
+        total = len(words)
+        rare_count = sum(1 for w in words if w not in COMMON_WORDS)
+    if not total:
         return False, None
-    rare_count = sum(1 for w in words if w not in common)
-    ratio = rare_count / len(words)
+    ratio = rare_count / total
     if ratio > rare_word_ratio_threshold:
         return True, f"High rare word ratio: {ratio:.2f}"
     return False, None
@@ -172,7 +493,19 @@ def detect_machine_translation(text, config_path=None, file_type=None, domain=No
     - Verbose: outputs detection scores and n-gram matches
     Returns a dict with machine_translated_flag, machine_translation_score, machine_translation_reasons, machine_translation_severity, machine_translation_confidence.
     """
-    config = load_mt_config(config_path)
+    return _detect_machine_translation(text, None, config_path, file_type, domain, verbose)
+
+def detect_machine_translation_stream(windows, config_path=None, file_type=None, domain=None, verbose=False):
+    """
+    detect_machine_translation for a text given as consecutive pieces
+    (pages, or iter_text_windows output), with the same result. Only TextFeatures are kept, so
+    memory is bounded by the piece size and the tracked n-grams rather than
+    the document size.
+    """
+    return _detect_machine_translation('', windows, config_path, file_type, domain, verbose)
+
+def _detect_machine_translation(text, windows, config_path, file_type, domain, verbose):
+    config, disclaimer_patterns = _get_mt_config(config_path)
     verbose = verbose or config.get('verbose', False)
     reasons = []
     score = 0
@@ -183,8 +516,13 @@ def detect_machine_translation(text, config_path=None, file_type=None, domain=No
     exclusions = set(config.get('domain_exclusions', []))
     if domain and domain in exclusions:
         return {'machine_translated_flag': False, 'machine_translation_score': 0, 'machine_translation_reasons': ['Domain excluded'], 'machine_translation_severity': 'ok', 'machine_translation_confidence': 0.0}
+    # One tokenization pass shared by the heuristics below
+    if windows is None:
+        features = TextFeatures.from_text(text, disclaimer_patterns=disclaimer_patterns)
+    else:
+        features = TextFeatures.from_windows(windows, disclaimer_patterns=disclaimer_patterns)
     # Code pattern exception
-    if is_code_pattern(text):
+    if is_code_pattern(text, features):
         return {'machine_translated_flag': False, 'machine_translation_score': 0, 'machine_translation_reasons': ['Code pattern detected'], 'machine_translation_severity': 'ok', 'machine_translation_confidence': 0.0}
     # Code comment thresholds
     if file_type and file_type in ['.py', '.ipynb']:
@@ -193,34 +531,31 @@ def detect_machine_translation(text, config_path=None, file_type=None, domain=No
     else:
         ngram_threshold = config['ngram_repetition_threshold']
         rare_word_threshold = config['rare_word_ratio_threshold']
-    # Text length adaptations
-    words = [w.lower() for w in re.findall(r'\b\w+\b', text)]
-    unique_words = set(words)
-    text_len = len(words)
+    text_len = features.word_count
     triggered = []
     ngram_score = 0
     # 1. Disclaimer
-    found, reason = check_disclaimers(text, config['disclaimer_patterns'])
+    found, reason = check_disclaimers(text, disclaimer_patterns, features=features)
     if found:
         reasons.append(reason)
         score += 50
         severity = 'critical'
         triggered.append(('disclaimer', 1.0))
     # 2. Strong repeated phrase
-    found, reason = check_repeated_phrase(text, min_repeats=3)
+    found, reason = check_repeated_phrase(text, min_repeats=3, features=features)
     if found:
         reasons.append(reason)
         score += 30
         severity = 'critical'
         triggered.append(('repeated_phrase', 0.9))
     # 3. N-gram repetition (skip if legitimate repetition)
-    found, ngram_reasons = check_ngram_repetition(text, n=3, threshold=ngram_threshold, text_len=text_len, verbose=verbose)
-    if found and not is_legitimate_repetition(text):
+    found, ngram_reasons = check_ngram_repetition(text, n=3, threshold=ngram_threshold, text_len=text_len, verbose=verbose, features=features)
+    if found and not is_legitimate_repetition(text, features):
         reasons.extend(ngram_reasons)
         # Weight n-gram score by max frequency found
         max_freq = 0
         for r in ngram_reasons:
-            match = re.search(r"\((\d+) times\)", r)
+            match = _NGRAM_FREQ_RE.search(r)
             if match:
                 freq = int(match.group(1))
                 if freq > max_freq:
@@ -237,7 +572,7 @@ def detect_machine_translation(text, config_path=None, file_type=None, domain=No
         scaled_ratio = config['functional_to_content_ratio']
         if text_len > 500:
             scaled_ratio *= 0.9  # Stricter for longer texts
-        found, reason = check_functional_content_ratio(text, scaled_ratio)
+        found, reason = check_functional_content_ratio(text, scaled_ratio, features=features)
         if found:
             reasons.append(reason)
             score += 10
@@ -245,7 +580,7 @@ def detect_machine_translation(text, config_path=None, file_type=None, domain=No
             triggered.append(('func_content', 0.5))
     # 5. Missing articles (only if text_len >= 25)
     if text_len >= 25:
-        found, reason = check_missing_articles(text, config['missing_article_threshold'])
+        found, reason = check_missing_articles(text, config['missing_article_threshold'], features=features)
         if found:
             reasons.append(reason)
             score += 10
@@ -256,15 +591,15 @@ def detect_machine_translation(text, config_path=None, file_type=None, domain=No
             else:
                 triggered.append(('missing_article', 0.5))
     # 6. Unusual verb tense
-    found, reason = check_unusual_verb_tense(text, config['unusual_verb_tense_threshold'])
+    found, reason = check_unusual_verb_tense(text, config['unusual_verb_tense_threshold'], features=features)
     if found:
         reasons.append(reason)
         score += 10
         severity = 'warning'
         triggered.append(('verb_tense', 0.5))
     # 7. Rare word ratio (only if unique_words >= 50)
-    if len(unique_words) >= 50:
-        found, reason = check_rare_word_ratio(text, rare_word_threshold)
+    if features.unique_word_count >= 50:
+        found, reason = check_rare_word_ratio(text, rare_word_threshold, features=features)
         if found:
             reasons.append(reason)
             score += 10
@@ -323,9 +658,34 @@ def detect_machine_translation(text, config_path=None, file_type=None, domain=No
         'machine_translation_confidence': confidence
     }
 
+class MTDetectorStream:
+    """Incremental :meth:`MachineTranslationDetector.detect`
+    
+    Every enabled pattern check scores each fed piece and the highest score
+    per pattern is kept: a pattern found anywhere in the document counts, as
+    the checks are already combined by their maximum.
+    """
+    
+    def __init__(self, detector: 'MachineTranslationDetector'):
+        self.detector = detector
+        self.length = 0
+        self.scores: Dict[str, float] = {}
+    
+    def feed(self, text: str) -> 'MTDetectorStream':
+        self.length += len(text)
+        for name, check in self.detector._pattern_checks():
+            self.scores[name] = max(self.scores.get(name, 0.0), check(text))
+        return self
+    
+    def result(self) -> Dict[str, Any]:
+        return self.detector._score(self.length, self.scores)
+
 class MachineTranslationDetector:
     """Detect machine-translated content"""
     
+    # Bump when detect() scoring changes so cached verdicts are recomputed
+    VERDICT_VERSION = 1
+    
     def __init__(self, project_config, *a, **kw):
         super().__init__(*a, **kw)
         self.project_config = project_config
@@ -474,6 +834,32 @@ class MachineTranslationDetector:
             dict: Detection results
         """
         if len(text) < self.config['min_text_length']:
+            return self._score(len(text), {})
+        return self._score(len(text), {name: check(text) for name, check in self._pattern_checks()})
+    
+    def stream(self) -> 'MTDetectorStream':
+        """Start scoring a text that is fed in pieces (see :class:`MTDetectorStream`)"""
+        return MTDetectorStream(self)
+    
+    def detect_stream(self, windows: Iterable[str]) -> Dict[str, Any]:
+        """:meth:`detect` for a text given as consecutive pieces, holding one at a time"""
+        stream = self.stream()
+        for window in windows:
+            stream.feed(window)
+        return stream.result()
+    
+    def _pattern_checks(self):
+        """``(pattern, check)`` pairs enabled in the config, in scoring order"""
+        checks = (
+            ('repetitive_phrases', self._check_repetitive_phrases),
+            ('unnatural_word_order', self._check_word_order),
+            ('literal_translations', self._check_literal_translations)
+        )
+        return [(name, check) for name, check in checks if self.config['patterns'][name]]
+    
+    def _score(self, length: int, scores: Dict[str, float]) -> Dict[str, Any]:
+        """Detection results for a text of ``length`` characters with per-pattern ``scores``"""
+        if length < self.config['min_text_length']:
             return {
                 'is_machine_translated': False,
                 'confidence': 0.0,
@@ -486,26 +872,10 @@ class MachineTranslationDetector:
             'patterns_found': []
         }
         
-        # Check for repetitive phrases
-        if self.config['patterns']['repetitive_phrases']:
-            repetitive_score = self._check_repetitive_phrases(text)
-            if repetitive_score > 0.7:
-                results['patterns_found'].append('repetitive_phrases')
-                results['confidence'] = max(results['confidence'], repetitive_score)
-        
-        # Check for unnatural word order
-        if self.config['patterns']['unnatural_word_order']:
-            word_order_score = self._check_word_order(text)
-            if word_order_score > 0.7:
-                results['patterns_found'].append('unnatural_word_order')
-                results['confidence'] = max(results['confidence'], word_order_score)
-        
-        # Check for literal translations
-        if self.config['patterns']['literal_translations']:
-            literal_score = self._check_literal_translations(text)
-            if literal_score > 0.7:
-                results['patterns_found'].append('literal_translations')
-                results['confidence'] = max(results['confidence'], literal_score)
+        for name, score in scores.items():
+            if score > 0.7:
+                results['patterns_found'].append(name)
+                results['confidence'] = max(results['confidence'], score)
         
         # Set final result
         results['is_machine_translated'] = results['confidence'] >= self.config['min_confidence']
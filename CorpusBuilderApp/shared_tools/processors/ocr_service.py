@@ -0,0 +1,191 @@
+"""
+Module: ocr_service
+Purpose: Batched OCR of in-memory images, either in process through
+libtesseract or with one tesseract run per batch instead of per image.
+"""
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import tesserocr  # in-process libtesseract binding
+    _HAS_TESSEROCR = True
+except ImportError:  # pragma: no cover - optional dependency
+    tesserocr = None
+    _HAS_TESSEROCR = False
+
+try:
+    import pytesseract
+except ImportError:  # pragma: no cover - optional dependency
+    pytesseract = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 16
+
+# tesseract's text renderer puts this between pages (here: images)
+_PAGE_SEPARATOR = '\f'
+
+_shared_services: Dict[Any, 'OCRService'] = {}
+
+
+class OCRService:
+    """OCR of batches of in-memory PIL images
+
+    Two backends, chosen once per service:
+
+    * ``tesserocr`` (when installed): each worker thread initialises one
+      libtesseract API on first use and keeps it for the life of the
+      service, so no process is started and no file written per image.
+    * ``tesseract-batch``: one tesseract run per batch of ``batch_size``
+      images, read from an image list. Images are written uncompressed
+      (PNM) to one temporary directory per batch.
+
+    Images of a batch the tesseract run cannot account for fall back to one
+    ``pytesseract.image_to_string`` call each. With ``max_workers`` above 1,
+    batches are recognised concurrently.
+    """
+
+    def __init__(self, psm: int = 6, lang: str = 'eng', max_workers: int = 1,
+                 batch_size: int = DEFAULT_BATCH_SIZE, timeout: float = 300.0,
+                 backend: Optional[str] = None):
+        self.psm = psm
+        self.lang = lang
+        self.max_workers = max(1, max_workers)
+        self.batch_size = max(1, batch_size)
+        self.timeout = timeout
+        self.backend = backend or ('tesserocr' if _HAS_TESSEROCR else 'tesseract-batch')
+        self.stats = {'images': 0, 'batches': 0, 'processes_started': 0, 'fallback_images': 0, 'seconds': 0.0}
+        self._local = threading.local()
+        self._apis: List[Any] = []
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def image_to_string(self, image) -> str:
+        return self.images_to_strings([image])[0]
+
+    def images_to_strings(self, images: Iterable) -> List[str]:
+        """Text of each image, in order; '' for images OCR failed on"""
+        images = list(images)
+        if not images:
+            return []
+        start = time.perf_counter()
+        batches = [images[i:i + self.batch_size] for i in range(0, len(images), self.batch_size)]
+        if self.max_workers > 1 and len(batches) > 1:
+            results = list(self._pool().map(self._run_batch, batches))
+        else:
+            results = [self._run_batch(batch) for batch in batches]
+        with self._lock:
+            self.stats['images'] += len(images)
+            self.stats['batches'] += len(batches)
+            self.stats['seconds'] += time.perf_counter() - start
+        return [text for texts in results for text in texts]
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='ocr')
+            return self._executor
+
+    def _run_batch(self, batch: List) -> List[str]:
+        if self.backend == 'tesserocr':
+            return [self._recognize(image) for image in batch]
+        texts = self._run_tesseract(batch)
+        if texts is None:
+            texts = [self._run_pytesseract(image) for image in batch]
+        return texts
+
+    def _recognize(self, image) -> str:
+        api = getattr(self._local, 'api', None)
+        if api is None:
+            api = tesserocr.PyTessBaseAPI(lang=self.lang, psm=self.psm)
+            self._local.api = api
+            with self._lock:
+                self._apis.append(api)
+        try:
+            api.SetImage(image)
+            return api.GetUTF8Text()
+        except Exception as e:
+            logger.warning(f"OCR failed: {e}")
+            return ''
+
+    def _tesseract_cmd(self) -> str:
+        # Honour a tesseract_cmd configured for pytesseract
+        module = getattr(pytesseract, 'pytesseract', None)
+        return getattr(module, 'tesseract_cmd', None) or 'tesseract'
+
+    def _run_tesseract(self, batch: List) -> Optional[List[str]]:
+        """Text of every image in ``batch`` from one tesseract run, or None"""
+        with tempfile.TemporaryDirectory(prefix='ocr_batch_') as tmp:
+            try:
+                paths = []
+                for i, image in enumerate(batch):
+                    if image.mode not in ('1', 'L', 'RGB'):
+                        image = image.convert('RGB')
+                    path = os.path.join(tmp, f'{i:05d}.pnm')
+                    image.save(path, format='PPM')
+                    paths.append(path)
+                list_path = os.path.join(tmp, 'images.txt')
+                with open(list_path, 'w', encoding='utf-8') as f:
+                    f.write('\n'.join(paths) + '\n')
+                result = subprocess.run(
+                    [self._tesseract_cmd(), list_path, 'stdout', '--psm', str(self.psm), '-l', self.lang],
+                    capture_output=True, timeout=self.timeout
+                )
+            except (OSError, subprocess.SubprocessError) as e:
+                logger.warning(f"Batch OCR failed, falling back to one call per image: {e}")
+                return None
+        with self._lock:
+            self.stats['processes_started'] += 1
+        if result.returncode != 0:
+            logger.warning(f"Batch OCR exited with {result.returncode}, falling back to one call per image: "
+                           f"{result.stderr.decode('utf-8', errors='ignore').strip()}")
+            return None
+        pages = result.stdout.decode('utf-8', errors='ignore').split(_PAGE_SEPARATOR)
+        # tesseract 4 also ends the last page with the separator, 5 only separates
+        if len(pages) == len(batch) + 1 and not pages[-1].strip():
+            pages.pop()
+        if len(pages) != len(batch):
+            logger.warning(f"Batch OCR returned {len(pages)} pages for {len(batch)} images, "
+                           f"falling back to one call per image")
+            return None
+        return pages
+
+    def _run_pytesseract(self, image) -> str:
+        with self._lock:
+            self.stats['processes_started'] += 1
+            self.stats['fallback_images'] += 1
+        try:
+            return pytesseract.image_to_string(image, lang=self.lang, config=f'--psm {self.psm}')
+        except Exception as e:
+            logger.warning(f"OCR failed: {e}")
+            return ''
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+            apis, self._apis = self._apis, []
+        if executor is not None:
+            executor.shutdown(wait=True)
+        for api in apis:
+            api.End()
+        self._local = threading.local()
+
+
+def shared_ocr_service(psm: int = 6, lang: str = 'eng', max_workers: int = 1,
+                       batch_size: int = DEFAULT_BATCH_SIZE) -> OCRService:
+    """Process-wide service for these settings
+
+    Extractors are created per document; sharing the service keeps its
+    tesseract APIs (and worker threads) alive across documents.
+    """
+    key = (psm, lang, max_workers, batch_size)
+    service = _shared_services.get(key)
+    if service is None:
+        service = _shared_services[key] = OCRService(psm, lang, max_workers, batch_size)
+    return service
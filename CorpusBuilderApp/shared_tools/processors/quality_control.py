@@ -4,24 +4,57 @@ Quality control module for corpus content
 
 import os
 import json
+import time
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Iterable, List, Optional, Any, Union
 from .machine_translation_detector import MachineTranslationDetector
 from .language_confidence_detector import LanguageConfidenceDetector
 from .corruption_detector import CorruptionDetector
+from .verdict_cache import VerdictCache, content_hash, content_hash_windows, detector_version
+from shared_tools.utils.extractor_utils import iter_text_windows
 from shared_tools.project_config import ProjectConfig
 logger = logging.getLogger(__name__)
 
+# Detectors in the order process_directory runs them: cheapest first, so the
+# expensive language detection is skipped once the score can no longer pass
+DETECTOR_ORDER = ('corruption', 'machine_translation', 'language_detection')
+# Quality (0-1, higher is better) each detector's verdict contributes to the
+# weighted score, or None when the verdict carries no signal
+VERDICT_SCORES = {
+    'machine_translation': lambda verdict: 1.0 - verdict.get('confidence', 0.0),
+    'language_detection': lambda verdict: verdict.get('confidence', 0.0) if verdict.get('metrics') else None,
+    'corruption': lambda verdict: 1.0 - verdict.get('corruption_score', 0.0)
+}
+THROUGHPUT_LOG_EVERY = 500
+# Detectors whose stream() verdict only approximates detect() (per-window
+# maximum, length-weighted mean); their streamed verdicts are stored apart
+APPROXIMATE_STREAMS = ('machine_translation', 'language_detection')
+STREAM_VERSION_SUFFIX = '/stream'
+# Files larger than this are scored in windows instead of being loaded whole
+STREAM_THRESHOLD_BYTES = 64 * 2**20
+
+_worker_qc = None  # QualityControl instance owned by each pool process
+
 class QualityControl:
     """Quality control for corpus content"""
     
-    def __init__(self, config: Optional[Dict] = None, project_config: Optional[Union[str, ProjectConfig]] = None):
+    QUALITY_WEIGHTS = {
+        'machine_translation': 0.3,
+        'language_detection': 0.3,
+        'corruption': 0.4
+    }
+    
+    def __init__(self, config: Optional[Dict] = None, project_config: Optional[Union[str, ProjectConfig]] = None,
+                 verdict_cache: Optional[Union[str, Path, VerdictCache]] = None):
         """Initialize quality control
         
         Args:
             config (dict): Optional configuration
             project_config: ProjectConfig instance or path to config file
+            verdict_cache: VerdictCache or database path for persisted detector
+                verdicts (default: the ``verdict_cache`` config entry, if any)
         """
         self.logger = logging.getLogger(self.__class__.__name__)
         
@@ -39,19 +72,45 @@ class QualityControl:
         else:
             self.config = config or self._get_default_config()
         
-        # Initialize detectors with their respective configs
-        self.mt_detector = MachineTranslationDetector(
-            config=self.config.get('checks', {}).get('translation', {}),
-            project_config=project_config
-        )
-        self.lang_detector = LanguageConfidenceDetector(
-            config=self.config.get('checks', {}).get('language', {}),
-            project_config=project_config
-        )
+        # Initialize detectors from the master config structure they all understand
+        detector_config = {'processors': {'quality_control': self.config}}
+        self.mt_detector = MachineTranslationDetector(detector_config)
+        self.lang_detector = LanguageConfidenceDetector(detector_config)
         self.corruption_detector = CorruptionDetector(
             config=self.config.get('checks', {}).get('corruption', {}),
-            project_config=project_config
+            project_config=detector_config
         )
+        self._detectors = {
+            'machine_translation': self.mt_detector.detect,
+            'language_detection': self.lang_detector.detect,
+            'corruption': self.corruption_detector.detect
+        }
+        self._streams = {
+            'machine_translation': self.mt_detector.stream,
+            'language_detection': self.lang_detector.stream,
+            'corruption': self.corruption_detector.stream
+        }
+        self.stream_threshold_bytes = self.config.get('processing', {}).get('stream_threshold_bytes', STREAM_THRESHOLD_BYTES)
+        
+        verdict_cache = verdict_cache or self.config.get('verdict_cache')
+        if verdict_cache and not isinstance(verdict_cache, VerdictCache):
+            verdict_cache = VerdictCache(verdict_cache)
+        self.verdict_cache = verdict_cache
+        self._detector_versions = {
+            'machine_translation': detector_version(self.mt_detector),
+            'language_detection': detector_version(self.lang_detector),
+            'corruption': detector_version(self.corruption_detector)
+        }
+        # Detectors able to score some text; the others never enter the weighted score
+        self._signalling = {
+            'machine_translation': getattr(self.mt_detector, 'produces_signal', True),
+            'language_detection': getattr(self.lang_detector, 'produces_signal', True),
+            'corruption': getattr(self.corruption_detector, 'produces_signal', True)
+        }
+        self._stream_versions = {
+            name: version + STREAM_VERSION_SUFFIX if name in APPROXIMATE_STREAMS else version
+            for name, version in self._detector_versions.items()
+        }
     
     def _get_default_config(self) -> Dict[str, Any]:
         """Get default configuration"""
@@ -97,12 +156,20 @@ class QualityControl:
             }
         }
     
-    def check_quality(self, text: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    def check_quality(self, text: str, metadata: Dict[str, Any], early_exit: bool = False) -> Dict[str, Any]:
         """Check quality of text content
         
+        With a verdict cache, detector verdicts for text seen before (same
+        content hash and detector version) are read back instead of
+        recomputed; their names are listed under ``cached_verdicts``.
+        
         Args:
             text (str): Text content to check
             metadata (dict): Document metadata
+            early_exit (bool): Run detectors cheapest first and stop once the
+                weighted score can no longer reach ``min_quality_score``. The
+                quality flag is the same as a full run; skipped detectors are
+                simply absent from ``quality_metrics``.
             
         Returns:
             dict: Quality check results
@@ -113,17 +180,21 @@ class QualityControl:
             'quality_metrics': {}
         }
         
-        # Check machine translation
-        mt_results = self.mt_detector.detect(text)
-        results['quality_metrics']['machine_translation'] = mt_results
+        digest = None
+        if self.verdict_cache is not None:
+            digest = content_hash(text)
+            results['cached_verdicts'] = []
         
-        # Check language confidence
-        lang_results = self.lang_detector.detect(text)
-        results['quality_metrics']['language_detection'] = lang_results
-        
-        # Check corruption
-        corruption_results = self.corruption_detector.detect(text)
-        results['quality_metrics']['corruption'] = corruption_results
+        order = DETECTOR_ORDER if early_exit else ('machine_translation', 'language_detection', 'corruption')
+        for name in order:
+            verdict = self._cached_verdict(results, digest, name)
+            if verdict is None:
+                verdict = self._detectors[name](text)
+                self._store_verdict(digest, name, verdict)
+            results['quality_metrics'][name] = verdict
+            if early_exit and self._score_upper_bound(results['quality_metrics']) < self.config['min_quality_score']:
+                results['short_circuit'] = f"score cannot reach {self.config['min_quality_score']} after {name}"
+                break
         
         # Calculate overall quality score
         quality_score = self._calculate_quality_score(results['quality_metrics'])
@@ -134,27 +205,286 @@ class QualityControl:
         
         return results
     
+    def check_quality_stream(self, windows: Iterable[str], metadata: Dict[str, Any],
+                             digest: Optional[str] = None) -> Dict[str, Any]:
+        """:meth:`check_quality` for a text given as consecutive pieces
+        
+        Every detector consumes the same single pass over ``windows`` through
+        its ``stream()`` accumulator, so memory is bounded by the window size
+        rather than the document; there is no early exit. With a verdict cache
+        and the text's ``digest`` (:func:`content_hash_windows`), stored
+        verdicts are reused and the windows are not read at all when every
+        verdict is stored. Detectors in ``APPROXIMATE_STREAMS`` store their
+        streamed verdicts under a version of their own, so they never stand
+        in for whole-text verdicts or the reverse.
+        
+        Args:
+            windows: Consecutive pieces of the text, e.g. :func:`iter_text_windows`
+            metadata (dict): Document metadata
+            digest (str, optional): Content hash of the whole text
+            
+        Returns:
+            dict: Quality check results
+        """
+        results = {
+            'quality_flag': True,
+            'quality_score': 0.0,
+            'quality_metrics': {}
+        }
+        if self.verdict_cache is not None and digest is not None:
+            results['cached_verdicts'] = []
+        else:
+            digest = None
+        
+        order = ('machine_translation', 'language_detection', 'corruption')
+        verdicts = {name: self._cached_verdict(results, digest, name, streamed=True) for name in order}
+        streams = {name: self._streams[name]() for name in order if verdicts[name] is None}
+        if streams:
+            for window in windows:
+                for stream in streams.values():
+                    stream.feed(window)
+            for name, stream in streams.items():
+                verdicts[name] = stream.result()
+                self._store_verdict(digest, name, verdicts[name], streamed=True)
+        results['quality_metrics'] = verdicts
+        
+        results['quality_score'] = self._calculate_quality_score(verdicts)
+        results['quality_flag'] = results['quality_score'] >= self.config['min_quality_score']
+        return results
+    
+    def _verdict_key(self, name: str, streamed: bool):
+        """``(detector, version)`` a verdict is stored under"""
+        if streamed and name in APPROXIMATE_STREAMS:
+            # A row of its own, so whole-text and streamed verdicts do not evict each other
+            return name + STREAM_VERSION_SUFFIX, self._stream_versions[name]
+        return name, self._detector_versions[name]
+    
+    def _cached_verdict(self, results: Dict[str, Any], digest: Optional[str], name: str,
+                        streamed: bool = False) -> Optional[Dict[str, Any]]:
+        if digest is None:
+            return None
+        verdict = self.verdict_cache.get(digest, *self._verdict_key(name, streamed))
+        if verdict is not None:
+            results['cached_verdicts'].append(name)
+        return verdict
+    
+    def _store_verdict(self, digest: Optional[str], name: str, verdict: Dict[str, Any],
+                       streamed: bool = False) -> None:
+        if digest is not None:
+            self.verdict_cache.put(digest, *self._verdict_key(name, streamed), verdict)
+    
     def _calculate_quality_score(self, metrics: Dict[str, Any]) -> float:
         """Calculate overall quality score
         
+        The weights are renormalised over the verdicts that carry a signal,
+        so a detector with nothing to say neither lowers nor raises the score.
+        
         Args:
-            metrics (dict): Quality metrics
+            metrics (dict): Detector verdicts, scored through ``VERDICT_SCORES``
             
         Returns:
             float: Quality score (0-1)
         """
-        weights = {
-            'machine_translation': 0.3,
-            'language_detection': 0.3,
-            'corruption': 0.4
-        }
-        
+        score, weight = self._weighted_sum(metrics)
+        return score / weight if weight else 0.0
+    
+    def _weighted_sum(self, metrics: Dict[str, Any]):
+        """``(sum of weighted scores, sum of weights)`` over the signalling verdicts"""
         score = 0.0
-        for metric, weight in weights.items():
+        total = 0.0
+        for metric, weight in self.QUALITY_WEIGHTS.items():
             if metric in metrics:
-                score += metrics[metric].get('score', 0.0) * weight
+                value = VERDICT_SCORES[metric](metrics[metric])
+                if value is not None:
+                    score += value * weight
+                    total += weight
+        return score, total
+    
+    def _score_upper_bound(self, metrics: Dict[str, Any]) -> float:
+        """Best score still reachable if every signalling detector not yet run scores 1.0"""
+        pending = sum(w for m, w in self.QUALITY_WEIGHTS.items() if m not in metrics and self._signalling[m])
+        score, weight = self._weighted_sum(metrics)
+        return (score + pending) / (weight + pending) if weight + pending else 1.0
+    
+    def cheap_check(self, text: str, metadata: Dict[str, Any]) -> Optional[str]:
+        """Return why ``text`` fails before any detector runs, or None"""
+        if not text.strip():
+            return 'empty text'
+        tokens = metadata.get('token_count')
+        if not isinstance(tokens, int):
+            tokens = len(text.split())
+        return self._token_count_check(tokens)
+    
+    def _token_count_check(self, tokens: int) -> Optional[str]:
+        min_tokens = self.config.get('min_token_count', 0)
+        if tokens < min_tokens:
+            return f"token count {tokens} below {min_tokens}"
+        return None
+    
+    def assess_document(self, text: str, metadata: Dict[str, Any], early_exit: bool = True) -> Dict[str, Any]:
+        """Cheap checks first, then the detectors via :meth:`check_quality`"""
+        reason = self.cheap_check(text, metadata)
+        if reason:
+            return {
+                'quality_flag': False,
+                'quality_score': 0.0,
+                'quality_metrics': {},
+                'short_circuit': reason
+            }
+        return self.check_quality(text, metadata, early_exit=early_exit)
+    
+    def assess_file_stream(self, path: Union[str, Path], metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """:meth:`assess_document` for a text file read in windows, never loaded whole
+        
+        A first pass hashes the text and counts tokens when a verdict cache is
+        set or the metadata has no ``token_count``; the detectors then run
+        through :meth:`check_quality_stream`.
+        """
+        tokens = metadata.get('token_count')
+        digest = None
+        if self.verdict_cache is not None or not isinstance(tokens, int):
+            counted = 0
+            
+            def counting(windows):
+                nonlocal counted
+                for window in windows:
+                    counted += len(window.split())
+                    yield window
+            
+            digest = content_hash_windows(counting(iter_text_windows(path=path)))
+            reason = 'empty text' if not counted else None
+            if not isinstance(tokens, int):
+                tokens = counted
+        else:
+            reason = None
+        reason = reason or self._token_count_check(tokens)
+        if reason:
+            return {
+                'quality_flag': False,
+                'quality_score': 0.0,
+                'quality_metrics': {},
+                'short_circuit': reason
+            }
+        return self.check_quality_stream(iter_text_windows(path=path), metadata, digest)
+    
+    def assess_file(self, path: Union[str, Path], early_exit: bool = True) -> Dict[str, Any]:
+        """:meth:`assess_document` for an extracted text file and its ``.json`` sidecar
+        
+        Files above ``processing.stream_threshold_bytes`` go through
+        :meth:`assess_file_stream` instead of being loaded whole.
+        """
+        path = Path(path)
+        metadata_path = path.with_suffix('.json')
+        metadata = {}
+        if metadata_path.exists():
+            with open(metadata_path, 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+        if os.path.getsize(path) > self.stream_threshold_bytes:
+            return self.assess_file_stream(path, metadata)
+        text = path.read_bytes().decode('utf-8', errors='ignore')
+        return self.assess_document(text, metadata, early_exit=early_exit)
+    
+    def process_directory(self, directory: Union[str, Path], pattern: str = '**/*.txt',
+                          max_workers: Optional[int] = None, early_exit: bool = True) -> Dict[str, Any]:
+        """Run quality control over every extracted text file in ``directory``
+        
+        Documents are spread over a process pool (``max_workers=1`` runs
+        in-process). Metadata is read from the ``.json`` file next to each
+        text file when present. Files above ``processing.stream_threshold_bytes``
+        are scored in windows by :meth:`assess_file_stream`.
+        
+        Args:
+            directory: Directory of extracted ``.txt`` files
+            pattern: Glob pattern for the files to check
+            max_workers: Worker processes (default: ``checks.processing.max_workers`` or CPU count)
+            early_exit: Short-circuit documents as described in :meth:`assess_document`
+            
+        Returns:
+            dict: Per-file results, pass/fail counts and throughput
+        """
+        directory = Path(directory)
+        paths = sorted(p for p in directory.glob(pattern) if p.is_file())
+        if max_workers is None:
+            max_workers = self.config.get('processing', {}).get('max_workers') or os.cpu_count() or 1
+        summary = {
+            'directory': str(directory),
+            'processed_files': [],
+            'passed_count': 0,
+            'failed_count': 0,
+            'short_circuited_count': 0,
+            'error_count': 0,
+            'cached_verdict_count': 0,
+            'results': {},
+            'errors': {}
+        }
         
-        return score
+        start = time.perf_counter()
+        total_bytes = 0
+        if max_workers <= 1 or len(paths) <= 1:
+            outcomes = (_assess_file(str(p), early_exit, self) for p in paths)
+            executor = None
+        else:
+            executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                           initargs=(self.config, self.verdict_cache))
+            chunksize = max(1, min(64, len(paths) // (max_workers * 4)))
+            outcomes = executor.map(_assess_file, map(str, paths), [early_exit] * len(paths), chunksize=chunksize)
+        try:
+            for path, result, size in outcomes:
+                total_bytes += size
+                summary['processed_files'].append(path)
+                if 'error' in result:
+                    summary['error_count'] += 1
+                    summary['errors'][path] = result['error']
+                    continue
+                summary['results'][path] = result
+                if result['quality_flag']:
+                    summary['passed_count'] += 1
+                else:
+                    summary['failed_count'] += 1
+                if 'short_circuit' in result:
+                    summary['short_circuited_count'] += 1
+                summary['cached_verdict_count'] += len(result.get('cached_verdicts', ()))
+                done = len(summary['processed_files'])
+                if done % THROUGHPUT_LOG_EVERY == 0:
+                    self.logger.info(f"Quality control: {done}/{len(paths)} files, {done / (time.perf_counter() - start):.1f} files/s")
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        
+        elapsed = time.perf_counter() - start
+        summary['elapsed_seconds'] = elapsed
+        summary['files_per_second'] = len(paths) / elapsed if elapsed else 0.0
+        summary['megabytes_per_second'] = total_bytes / 2**20 / elapsed if elapsed else 0.0
+        self.logger.info(
+            f"Quality control finished: {len(paths)} files in {elapsed:.2f}s "
+            f"({summary['files_per_second']:.1f} files/s, {summary['megabytes_per_second']:.2f} MB/s), "
+            f"{summary['passed_count']} passed, {summary['failed_count']} failed "
+            f"({summary['short_circuited_count']} short-circuited), {summary['error_count']} errors, "
+            f"{summary['cached_verdict_count']} cached verdicts reused"
+        )
+        return summary
+
+def _init_worker(config: Dict[str, Any], verdict_cache: Optional[VerdictCache] = None) -> None:
+    global _worker_qc
+    _worker_qc = QualityControl(config=config, verdict_cache=verdict_cache)
+
+def _assess_file(path: str, early_exit: bool, qc: Optional[QualityControl] = None):
+    """Pool task: check one extracted text file; returns ``(path, result, bytes_read)``"""
+    qc = qc or _worker_qc
+    try:
+        size = os.path.getsize(path)
+        return path, qc.assess_file(path, early_exit=early_exit), size
+    except Exception as e:
+        return path, {'error': str(e)}, 0
+
+def project_verdict_cache(project: ProjectConfig) -> Path:
+    """Verdict store shared by every quality pass over ``project``
+    
+    ``processors.quality_control.verdict_cache`` if set, else
+    ``verdict_cache.sqlite`` in the processed directory.
+    """
+    return Path(project.get('processors.quality_control.verdict_cache') or
+                Path(project.get_processed_dir()) / 'verdict_cache.sqlite')
 
 def run_with_project_config(project: Union[str, ProjectConfig], verbose: bool = False):
     """Run quality control with project configuration
@@ -169,12 +499,10 @@ def run_with_project_config(project: Union[str, ProjectConfig], verbose: bool =
     if isinstance(project, str):
         project = ProjectConfig(project)
     
-    qc = QualityControl(
-        project_config=project
-    )
+    qc = QualityControl(project_config=project, verdict_cache=project_verdict_cache(project))
     
-    # Process files
-    results = qc.process_directory(project.raw_data_dir)
+    # Process extracted text files
+    results = qc.process_directory(Path(project.get_processed_dir()) / '_extracted')
     
     if verbose:
         logger.info("\nQuality Control Results:")
@@ -196,7 +524,7 @@ def main():
     results = run_with_project_config(args.config, args.verbose)
     
     # Save results
-    output_file = Path(args.config) / 'quality_control_results.json'
+    output_file = Path(args.config).parent / 'quality_control_results.json'
     with open(output_file, 'w') as f:
         json.dump(results, f, indent=2)
     
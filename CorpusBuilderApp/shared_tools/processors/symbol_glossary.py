@@ -0,0 +1,328 @@
+"""
+Module: symbol_glossary
+Purpose: Corpus-level glossary of financial symbols (tickers, currency
+pairs, Greek letters, ratios and rates) with occurrence and document counts,
+built by a streaming map-reduce over the extracted texts.
+"""
+import logging
+import os
+import re
+import sqlite3
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from shared_tools.processors.financial_symbol_processor import FinancialSymbolProcessor
+from shared_tools.utils.extractor_utils import iter_text_windows
+
+if TYPE_CHECKING:
+    from shared_tools.project_config import ProjectConfig
+
+logger = logging.getLogger(__name__)
+
+# Numeric literals ("$1,250.00", "2.5%", "1e-3") are values rather than
+# vocabulary; every distinct amount would otherwise get its own entry
+DEFAULT_EXCLUDED_TYPES = ('currency_amount', 'percentage', 'scientific_notation')
+DEFAULT_MAX_SYMBOLS = 200_000
+DEFAULT_BATCH_FILES = 32
+
+_CURRENCY_PAIR_RE = re.compile(r'\b([A-Z]{2,10})/([A-Z]{2,10})\b')
+
+_SCHEMA = """
+CREATE TABLE symbols (
+    symbol TEXT NOT NULL,
+    type TEXT NOT NULL,
+    occurrences INTEGER NOT NULL,
+    documents INTEGER NOT NULL,
+    definition TEXT NOT NULL,
+    PRIMARY KEY (symbol, type)
+) WITHOUT ROWID;
+CREATE INDEX symbols_by_type ON symbols (type, occurrences DESC);
+CREATE INDEX symbols_by_occurrences ON symbols (occurrences DESC);
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+_worker_glossary = None
+
+
+class SymbolGlossary:
+    """Count financial symbols across the corpus in bounded memory.
+
+    Each document is read in windows from :func:`iter_text_windows` (which
+    only cuts at whitespace, so symbols are never split) and reduced to a
+    Counter of ``(symbol, type)``; only the running totals are kept. Symbols
+    are the non-overlapping spans of
+    :meth:`FinancialSymbolProcessor._preservation_spans`, plus currency
+    pairs such as ``BTC/USD`` whose legs are known currencies or crypto
+    symbols (a pair is counted instead of its legs).
+
+    With ``max_symbols`` set, the tables are pruned back to the most
+    frequent ``max_symbols`` entries whenever they grow to twice that size.
+    Counts of the surviving entries can then undercount by at most the
+    occurrences seen before an entry was last pruned; ``pruned_symbols``
+    records how many entries were dropped.
+    """
+
+    def __init__(self, processor: Optional[FinancialSymbolProcessor] = None,
+                 excluded_types: Iterable[str] = DEFAULT_EXCLUDED_TYPES,
+                 max_symbols: Optional[int] = DEFAULT_MAX_SYMBOLS):
+        """Initialize the glossary.
+
+        Args:
+            processor: Symbol processor used for extraction (default: a new one)
+            excluded_types: Symbol types left out of the glossary
+            max_symbols: Entries kept after pruning, or None for no limit
+        """
+        self.processor = processor or FinancialSymbolProcessor()
+        self.excluded_types = frozenset(excluded_types)
+        self.max_symbols = max_symbols
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.occurrences: Counter = Counter()  # Maps (symbol, type) to total occurrences
+        self.doc_frequency: Counter = Counter()  # Maps (symbol, type) to number of documents containing it
+        self.documents_scanned = 0
+        self.pruned_symbols = 0
+
+    def _currency_pairs(self, text: str) -> List[Tuple[int, int, str, str]]:
+        dictionaries = self.processor.symbol_dictionaries
+        pairs = []
+        for match in _CURRENCY_PAIR_RE.finditer(text):
+            legs = match.group(1), match.group(2)
+            if all(leg in dictionaries['currency_symbols'] or leg in dictionaries['crypto_symbols'] for leg in legs):
+                pairs.append((match.start(), match.end(), match.group(), 'currency_pair'))
+        return pairs
+
+    def count_text(self, text: str) -> Counter:
+        """Counter of ``(symbol, type)`` occurrences in ``text``."""
+        spans = self.processor._preservation_spans(text)
+        pairs = self._currency_pairs(text)
+        if pairs:
+            # A pair starts with its first leg and is longer, so it wins
+            spans = sorted(pairs + spans, key=lambda span: (span[0], -span[1]))
+        counts = Counter()
+        covered = 0
+        for start, end, symbol, symbol_type in spans:
+            if start >= covered:
+                covered = end
+                if symbol_type not in self.excluded_types:
+                    counts[symbol, symbol_type] += 1
+        return counts
+
+    def add_document(self, windows: Union[str, Iterable[str]]) -> None:
+        """Fold one document (a text or its windows) into the frequency tables."""
+        if isinstance(windows, str):
+            windows = (windows,)
+        counts = Counter()
+        for window in windows:
+            counts.update(self.count_text(window))
+        self.occurrences.update(counts)
+        self.doc_frequency.update(counts.keys())
+        self.documents_scanned += 1
+        self._prune()
+
+    def merge(self, occurrences: Counter, doc_frequency: Counter, documents: int) -> None:
+        """Fold partial counters (e.g. from a pool worker) into the totals."""
+        self.occurrences.update(occurrences)
+        self.doc_frequency.update(doc_frequency)
+        self.documents_scanned += documents
+        self._prune()
+
+    def _prune(self) -> None:
+        if self.max_symbols is None or len(self.occurrences) <= 2 * self.max_symbols:
+            return
+        keep = dict(self.occurrences.most_common(self.max_symbols))
+        self.pruned_symbols += len(self.occurrences) - len(keep)
+        self.occurrences = Counter(keep)
+        self.doc_frequency = Counter({key: self.doc_frequency[key] for key in keep})
+
+    def _add_file(self, path: Path) -> bool:
+        try:
+            self.add_document(iter_text_windows(path=path))
+        except Exception as e:
+            self.logger.error(f"Error reading {path}: {e}")
+            return False
+        return True
+
+    def scan_directory(self, directory: Union[str, Path], pattern: str = '**/*.txt',
+                       max_workers: int = 1, batch_files: int = DEFAULT_BATCH_FILES) -> int:
+        """Stream every matching text file into the glossary.
+
+        With ``max_workers`` above 1, batches of ``batch_files`` files are
+        counted in worker processes and their partial counters merged here
+        as they complete, so the parent holds the totals plus at most a
+        couple of batches per worker.
+        """
+        paths = [path for path in sorted(Path(directory).glob(pattern)) if path.is_file()]
+        count = 0
+        if max_workers <= 1 or len(paths) <= batch_files:
+            for path in paths:
+                count += self._add_file(path)
+        else:
+            batches = [paths[i:i + batch_files] for i in range(0, len(paths), batch_files)]
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                     initargs=(self.processor.config, tuple(self.excluded_types), self.max_symbols)) as executor:
+                pending = set()
+                for batch in batches:
+                    if len(pending) >= max_workers * 2:
+                        done = next(as_completed(pending))
+                        pending.remove(done)
+                        count += self._merge_batch(done.result())
+                    pending.add(executor.submit(_count_batch, [str(path) for path in batch]))
+                for done in as_completed(pending):
+                    count += self._merge_batch(done.result())
+        self.logger.info(f"Scanned {count} documents, {len(self.occurrences)} distinct symbols")
+        return count
+
+    def _merge_batch(self, partial: Tuple[Counter, Counter, int, int]) -> int:
+        occurrences, doc_frequency, documents, pruned = partial
+        self.pruned_symbols += pruned
+        self.merge(occurrences, doc_frequency, documents)
+        return documents
+
+    def definition(self, symbol: str, symbol_type: str) -> str:
+        if symbol_type == 'currency_pair':
+            base, quote = symbol.split('/')
+            return f"Currency pair: {self.processor._get_symbol_definition(base, 'currency')} / " \
+                   f"{self.processor._get_symbol_definition(quote, 'currency')}"
+        return self.processor._get_symbol_definition(symbol, symbol_type)
+
+    def get_entries(self, min_documents: int = 1) -> List[Dict[str, Any]]:
+        """Glossary entries, most frequent first."""
+        return [
+            {
+                'symbol': symbol,
+                'type': symbol_type,
+                'occurrences': occurrences,
+                'documents': self.doc_frequency[symbol, symbol_type],
+                'definition': self.definition(symbol, symbol_type),
+            }
+            for (symbol, symbol_type), occurrences in self.occurrences.most_common()
+            if self.doc_frequency[symbol, symbol_type] >= min_documents
+        ]
+
+    def save(self, glossary_path: Union[str, Path], min_documents: int = 1) -> Dict[str, Any]:
+        """Write the glossary to an indexed SQLite file, replacing any earlier one."""
+        glossary_path = Path(glossary_path)
+        glossary_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = glossary_path.with_name(glossary_path.name + '.tmp')
+        if tmp_path.exists():
+            tmp_path.unlink()
+        entries = self.get_entries(min_documents)
+        summary = {
+            'documents_scanned': self.documents_scanned,
+            'distinct_symbols': len(entries),
+            'total_occurrences': sum(entry['occurrences'] for entry in entries),
+            'pruned_symbols': self.pruned_symbols,
+            'min_documents': min_documents,
+            'created': time.time(),
+        }
+        conn = sqlite3.connect(str(tmp_path))
+        try:
+            conn.executescript(_SCHEMA)
+            conn.executemany(
+                'INSERT INTO symbols (symbol, type, occurrences, documents, definition) VALUES (?, ?, ?, ?, ?)',
+                ((e['symbol'], e['type'], e['occurrences'], e['documents'], e['definition']) for e in entries)
+            )
+            conn.executemany('INSERT INTO meta (key, value) VALUES (?, ?)',
+                             ((key, str(value)) for key, value in summary.items()))
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(tmp_path, glossary_path)
+        return summary
+
+
+def lookup_symbols(glossary_path: Union[str, Path], symbol: Optional[str] = None,
+                   symbol_type: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+    """Read entries from a saved glossary, most frequent first
+
+    Args:
+        glossary_path: File written by :meth:`SymbolGlossary.save`
+        symbol: Only return entries for this symbol
+        symbol_type: Only return entries of this type
+        limit: Maximum number of entries
+    """
+    clauses, params = [], []
+    if symbol is not None:
+        clauses.append('symbol = ?')
+        params.append(symbol)
+    if symbol_type is not None:
+        clauses.append('type = ?')
+        params.append(symbol_type)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+    conn = sqlite3.connect(f"file:{Path(glossary_path)}?mode=ro", uri=True)
+    try:
+        rows = conn.execute(
+            f'SELECT symbol, type, occurrences, documents, definition FROM symbols {where} '
+            'ORDER BY occurrences DESC, symbol LIMIT ?',
+            (*params, limit)
+        ).fetchall()
+    finally:
+        conn.close()
+    return [dict(zip(('symbol', 'type', 'occurrences', 'documents', 'definition'), row)) for row in rows]
+
+
+def _init_worker(config: Dict[str, Any], excluded_types: Tuple[str, ...], max_symbols: Optional[int]) -> None:
+    global _worker_glossary
+    _worker_glossary = SymbolGlossary(FinancialSymbolProcessor(config), excluded_types, max_symbols)
+
+
+def _count_batch(paths: List[str]) -> Tuple[Counter, Counter, int, int]:
+    """Partial counters for one batch of files (runs in a pool worker)"""
+    partial = SymbolGlossary(_worker_glossary.processor, _worker_glossary.excluded_types, _worker_glossary.max_symbols)
+    documents = sum(partial._add_file(Path(path)) for path in paths)
+    return partial.occurrences, partial.doc_frequency, documents, partial.pruned_symbols
+
+
+def run_with_project_config(project: 'ProjectConfig', verbose: bool = False):
+    """Build the corpus symbol glossary with project configuration
+
+    Args:
+        project (ProjectConfig): Project configuration
+        verbose (bool): Enable verbose output
+
+    Returns:
+        dict: Glossary summary
+    """
+    cfg = project.get('processors.symbol_glossary', {}) or {}
+    glossary = SymbolGlossary(
+        FinancialSymbolProcessor(project.get('processors.specialized.symbols')),
+        excluded_types=cfg.get('excluded_types', DEFAULT_EXCLUDED_TYPES),
+        max_symbols=cfg.get('max_symbols', DEFAULT_MAX_SYMBOLS),
+    )
+    processed_dir = Path(project.get_processed_dir())
+    glossary.scan_directory(processed_dir / '_extracted', max_workers=cfg.get('max_workers', os.cpu_count() or 1),
+                            batch_files=cfg.get('batch_files', DEFAULT_BATCH_FILES))
+    summary = glossary.save(processed_dir / 'symbol_glossary.sqlite', min_documents=cfg.get('min_documents', 1))
+
+    if verbose:
+        logger.info(f"Glossary symbols: {summary['distinct_symbols']}, documents: {summary['documents_scanned']}")
+    return summary
+
+
+def main():
+    """Main entry point when script is run directly"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Build a corpus-level glossary of financial symbols')
+    parser.add_argument('--input-dir', required=True, help='Directory of extracted .txt files')
+    parser.add_argument('--output', default='symbol_glossary.sqlite', help='Path to save the glossary')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes')
+    parser.add_argument('--max-symbols', type=int, default=DEFAULT_MAX_SYMBOLS, help='Entries kept when pruning rare symbols')
+    parser.add_argument('--min-documents', type=int, default=1, help='Documents a symbol must appear in to be saved')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    glossary = SymbolGlossary(max_symbols=args.max_symbols)
+    glossary.scan_directory(args.input_dir, max_workers=args.workers)
+    summary = glossary.save(args.output, min_documents=args.min_documents)
+    logger.info(f"Glossary symbols: {summary['distinct_symbols']}, documents: {summary['documents_scanned']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Module: verdict_cache
+Purpose: Persistent store of per-document detector verdicts (corruption,
+machine translation, language) keyed by content hash and detector version,
+so repeated quality passes only re-evaluate changed documents.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS verdicts (
+    content_hash TEXT NOT NULL,
+    detector TEXT NOT NULL,
+    version TEXT NOT NULL,
+    verdict TEXT NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (content_hash, detector)
+)
+"""
+
+
+def content_hash(text: str) -> str:
+    """Hex digest identifying a document's text"""
+    return hashlib.blake2b(text.encode('utf-8', errors='surrogatepass'), digest_size=16).hexdigest()
+
+
+def content_hash_windows(windows: Iterable[str]) -> str:
+    """:func:`content_hash` of the joined ``windows``, without joining them"""
+    digest = hashlib.blake2b(digest_size=16)
+    for window in windows:
+        digest.update(window.encode('utf-8', errors='surrogatepass'))
+    return digest.hexdigest()
+
+
+def detector_version(detector: Any) -> str:
+    """Version string for ``detector``'s verdicts
+
+    Combines the class name, its ``VERDICT_VERSION`` (bumped whenever the
+    scoring logic changes) and a digest of its ``config``, so changing
+    either invalidates earlier verdicts.
+    """
+    config = json.dumps(getattr(detector, 'config', None), sort_keys=True, default=str)
+    config_digest = hashlib.blake2b(config.encode('utf-8'), digest_size=6).hexdigest()
+    return f"{type(detector).__name__}/{getattr(detector, 'VERDICT_VERSION', 0)}/{config_digest}"
+
+
+class VerdictCache:
+    """SQLite-backed verdict store
+
+    One row per ``(content_hash, detector)``; a row written by another
+    detector version counts as a miss and is replaced on the next
+    :meth:`put`. Each process opens its own connection, so an instance can be
+    shared with (or recreated in) pool workers from the same ``path``.
+    """
+
+    def __init__(self, path: Union[str, Path], timeout: float = 30.0):
+        self.path = Path(path)
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=self.timeout, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(_SCHEMA)
+            conn.commit()
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, digest: str, detector: str, version: str) -> Optional[Dict[str, Any]]:
+        """Stored verdict, or None when missing or from another version"""
+        with self._lock:
+            row = self._connection().execute(
+                'SELECT version, verdict FROM verdicts WHERE content_hash = ? AND detector = ?',
+                (digest, detector)
+            ).fetchone()
+            if row is None or row[0] != version:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[1])
+
+    def put(self, digest: str, detector: str, version: str, verdict: Dict[str, Any]) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                'INSERT OR REPLACE INTO verdicts (content_hash, detector, version, verdict, updated) VALUES (?, ?, ?, ?, ?)',
+                (digest, detector, version, json.dumps(verdict, default=str), time.time())
+            )
+            conn.commit()
+
+    def get_or_compute(self, digest: str, detector: str, version: str,
+                       compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Return the stored verdict, or run ``compute`` and store its result"""
+        verdict = self.get(digest, detector, version)
+        if verdict is None:
+            verdict = compute()
+            self.put(digest, detector, version, verdict)
+        return verdict
+
+    def purge_stale(self, versions: Dict[str, str]) -> int:
+        """Delete rows of the given detectors written by other versions"""
+        with self._lock:
+            conn = self._connection()
+            removed = 0
+            for detector, version in versions.items():
+                removed += conn.execute(
+                    'DELETE FROM verdicts WHERE detector = ? AND version != ?', (detector, version)
+                ).rowcount
+            conn.commit()
+        if removed:
+            logger.info(f"Removed {removed} stale verdicts from {self.path}")
+        return removed
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+            self._pid = None
+
+    def __getstate__(self):
+        # Connections and locks stay behind; the copy reconnects lazily
+        return {'path': self.path, 'timeout': self.timeout}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'], state['timeout'])
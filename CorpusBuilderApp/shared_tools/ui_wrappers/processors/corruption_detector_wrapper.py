@@ -5,6 +5,7 @@ Provides comprehensive file corruption detection capabilities
 
 import os
 import json
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from typing import Dict, List, Optional, Any, Tuple
 from PySide6.QtCore import QObject, QThread, Signal as pyqtSignal, Slot as pyqtSlot, QMutex
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
@@ -12,12 +13,21 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                            QSpinBox, QGroupBox, QGridLayout, QComboBox, QListWidget,
                            QSplitter, QTabWidget, QTableWidget, QTableWidgetItem,
                            QHeaderView)
-from shared_tools.processors.corruption_detector import CorruptionDetector
+from shared_tools.processors.corruption_detector import CorruptionDetector, check_files
 from shared_tools.ui_wrappers.processors.processor_mixin import ProcessorMixin
 
+DEFAULT_SCAN_BATCH_SIZE = 16
+
 
 class CorruptionDetectorWorker(QThread):
-    """Worker thread for corruption detection operations"""
+    """Worker thread for corruption detection operations
+    
+    Files are checked in batches on a process pool (``max_workers`` option,
+    default: CPU count; 1 checks in this thread). Each finished batch is
+    reported through ``file_checked`` per file and one ``progress_updated``.
+    Only a few batches are queued ahead, so cancelling stops the scan after
+    the batches already running.
+    """
     
     progress_updated = pyqtSignal(int, str)  # progress percentage, current file
     file_checked = pyqtSignal(str, dict)  # file path, corruption report
@@ -37,6 +47,7 @@ class CorruptionDetectorWorker(QThread):
             'corrupted_files': 0,
             'suspicious_files': 0,
             'clean_files': 0,
+            'skipped_files': 0,
             'error_files': 0
         }
         
@@ -52,6 +63,7 @@ class CorruptionDetectorWorker(QThread):
                 validate_structure=self.options.get('validate_structure', True),
                 max_file_size=self.options.get('max_file_size', 100)
             )
+            check_options = dict(self.detector.file_options)
             
             # Get files to scan
             files_to_scan = self._get_files_to_scan()
@@ -60,57 +72,94 @@ class CorruptionDetectorWorker(QThread):
             if self.stats['total_files'] == 0:
                 self.error_occurred.emit("No Files", "No files found to scan")
                 return
-                
-            # Scan each file
-            for i, file_path in enumerate(files_to_scan):
-                if self._is_cancelled:
-                    break
-                    
-                # Update progress
-                progress = int((i / self.stats['total_files']) * 100)
-                filename = os.path.basename(file_path)
-                self.progress_updated.emit(progress, f"Scanning: {filename}")
-                
-                try:
-                    # Check file for corruption
-                    report = self.detector.check_file(file_path)
-                    self.file_checked.emit(file_path, report)
-                    
-                    # Update statistics
-                    if report['status'] == 'corrupted':
-                        self.stats['corrupted_files'] += 1
-                    elif report['status'] == 'suspicious':
-                        self.stats['suspicious_files'] += 1
-                    elif report['status'] == 'clean':
-                        self.stats['clean_files'] += 1
-                    else:
-                        self.stats['error_files'] += 1
-                        
-                    self.stats['checked_files'] += 1
-                    
-                except Exception as e:
-                    self.stats['error_files'] += 1
-                    self.stats['checked_files'] += 1
-                    error_report = {
-                        'status': 'error',
-                        'error': str(e),
-                        'checks': {},
-                        'confidence': 0.0
-                    }
-                    self.file_checked.emit(file_path, error_report)
+            
+            batch_size = max(1, int(self.options.get('batch_size', DEFAULT_SCAN_BATCH_SIZE)))
+            batches = [files_to_scan[i:i + batch_size] for i in range(0, len(files_to_scan), batch_size)]
+            max_workers = self.options.get('max_workers') or os.cpu_count() or 1
+            
+            if max_workers <= 1:
+                for batch in batches:
+                    if self._cancel_requested():
+                        break
+                    self._report_batch(check_files(batch, check_options))
+            else:
+                self._scan_in_pool(batches, check_options, max_workers)
                     
             # Final progress update
-            self.progress_updated.emit(100, "Corruption scan completed")
+            if self._cancel_requested():
+                self.progress_updated.emit(
+                    int(self.stats['checked_files'] / self.stats['total_files'] * 100),
+                    "Corruption scan cancelled"
+                )
+            else:
+                self.progress_updated.emit(100, "Corruption scan completed")
             self.scan_completed.emit(self.stats)
             
         except Exception as e:
             self.error_occurred.emit("Scan Error", str(e))
+    
+    def _scan_in_pool(self, batches: List[List[str]], check_options: Dict[str, Any], max_workers: int):
+        """Run batches on a process pool, keeping at most two per worker in flight"""
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+        queued = iter(batches)
+        in_flight = {}
+        try:
+            while True:
+                while len(in_flight) < max_workers * 2 and not self._cancel_requested():
+                    batch = next(queued, None)
+                    if batch is None:
+                        break
+                    in_flight[executor.submit(check_files, batch, check_options)] = batch
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch = in_flight.pop(future)
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        results = [
+                            (file_path, {'status': 'error', 'error': str(e), 'checks': {}, 'confidence': 0.0})
+                            for file_path in batch
+                        ]
+                    self._report_batch(results)
+                if self._cancel_requested():
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _report_batch(self, results: List[Tuple[str, dict]]):
+        """Emit one batch of reports and update statistics"""
+        for file_path, report in results:
+            self.file_checked.emit(file_path, report)
+            status = report.get('status')
+            if status == 'corrupted':
+                self.stats['corrupted_files'] += 1
+            elif status == 'suspicious':
+                self.stats['suspicious_files'] += 1
+            elif status == 'clean':
+                self.stats['clean_files'] += 1
+            elif status == 'skipped':
+                self.stats['skipped_files'] += 1
+            else:
+                self.stats['error_files'] += 1
+            self.stats['checked_files'] += 1
+        if results:
+            progress = int(self.stats['checked_files'] / self.stats['total_files'] * 100)
+            filename = os.path.basename(results[-1][0])
+            self.progress_updated.emit(progress, f"Scanned {self.stats['checked_files']}/{self.stats['total_files']}: {filename}")
             
     def cancel(self):
         """Cancel the current scan"""
         self._mutex.lock()
         self._is_cancelled = True
         self._mutex.unlock()
+    
+    def _cancel_requested(self) -> bool:
+        self._mutex.lock()
+        cancelled = self._is_cancelled
+        self._mutex.unlock()
+        return cancelled
         
     def _get_files_to_scan(self) -> List[str]:
         """Get list of files to scan for corruption"""
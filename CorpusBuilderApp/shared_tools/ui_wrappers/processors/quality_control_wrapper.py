@@ -2,7 +2,8 @@
 
 from PySide6.QtCore import Signal as pyqtSignal, QObject, QThread
 from PySide6.QtWidgets import QWidget
-from shared_tools.processors.quality_control import QualityControl
+from shared_tools.processors.quality_control import QualityControl, project_verdict_cache
+from shared_tools.project_config import ProjectConfig
 from shared_tools.ui_wrappers.processors.processor_mixin import ProcessorMixin
 import logging, traceback
 
@@ -50,7 +51,9 @@ class QualityControlWrapper(QWidget):
 
         self.task_queue_manager = task_queue_manager
         self.project_config = config  # Ensure attribute exists for tests
-        self.processor = QualityControl(config)
+        # Share stored detector verdicts with the other quality passes over the project
+        verdict_cache = project_verdict_cache(config) if isinstance(config, ProjectConfig) else None
+        self.processor = QualityControl(project_config=config, verdict_cache=verdict_cache)
         self._is_running = False
         self.worker_thread = None
         self.quality_threshold = 70  # Default threshold
@@ -201,8 +204,10 @@ class QCWorkerThread(QThread):
                 self.status_updated.emit(f"Processing {file_path}...")
                 
                 try:
-                    # Process the file
-                    score = self.processor.evaluate_quality(file_path, **self.kwargs)
+                    # Process the file; stored verdicts are reused through the processor's verdict cache
+                    result = self.processor.assess_file(file_path)
+                    # Percent, the scale of the wrapper's quality_threshold
+                    score = result['quality_score'] * 100
                     
                     # Emit the quality score
                     self.quality_score_calculated.emit(file_path, score)
@@ -210,7 +215,9 @@ class QCWorkerThread(QThread):
                     # Update results
                     results["processed_files"].append({
                         "file_path": file_path,
-                        "quality_score": score
+                        "quality_score": score,
+                        "quality_flag": result['quality_flag'],
+                        "cached_verdicts": result.get('cached_verdicts', [])
                     })
                     results["success_count"] += 1
                     
@@ -5,7 +5,7 @@ Purpose: Helper functions for text and metadata extraction.
 
 import re
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Union, Any
 import json
 import hashlib
 from datetime import datetime
@@ -151,6 +151,74 @@ def chunk_text(text: str,
     
     return chunks
 
+TEXT_WINDOW_CHARS = 1 << 20
+
+def iter_text_windows(pieces: Optional[Iterable[str]] = None, *, path: Optional[Union[str, Path]] = None,
+                      text: Optional[str] = None, window_chars: int = TEXT_WINDOW_CHARS) -> Iterator[str]:
+    """Yield a text as consecutive windows of at most ``window_chars`` characters.
+    
+    Windows end after the last newline they contain, or failing that after
+    the last whitespace, so lines (or at least words) are not split; only a
+    run of ``window_chars`` characters without whitespace is cut. Joining the
+    windows reproduces the text, and at most about two windows are held in
+    memory.
+    
+    Exactly one source must be given.
+    
+    Args:
+        pieces: Iterable of strings, such as pages
+        path: UTF-8 text file, read incrementally (undecodable bytes are dropped)
+        text: Text already in memory
+        window_chars: Maximum window size in characters
+        
+    Returns:
+        Iterator over the windows
+    
+    Raises:
+        ValueError: If not exactly one of ``pieces``, ``path`` and ``text`` is given
+        TypeError: If ``pieces`` is a single string
+    """
+    if sum(source is not None for source in (pieces, path, text)) != 1:
+        raise ValueError("iter_text_windows takes exactly one of pieces, path= or text=")
+    if isinstance(pieces, (str, Path)):
+        raise TypeError("iter_text_windows: pass a file as path= and a string as text=")
+    if path is not None:
+        return _iter_file_windows(path, window_chars)
+    if text is not None:
+        pieces = (text[i:i + window_chars] for i in range(0, len(text), window_chars))
+    return _iter_windows(pieces, window_chars)
+
+def _iter_file_windows(path: Union[str, Path], window_chars: int) -> Iterator[str]:
+    with open(path, 'r', encoding='utf-8', errors='ignore', newline='') as f:
+        yield from _iter_windows(iter(lambda: f.read(window_chars), ''), window_chars)
+
+def _iter_windows(pieces: Iterable[str], window_chars: int) -> Iterator[str]:
+    buffer: List[str] = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size < window_chars:
+            continue
+        data = ''.join(buffer)
+        start = 0
+        while len(data) - start >= window_chars:
+            end = start + window_chars
+            cut = data.rfind('\n', start, end) + 1
+            if not cut:
+                cut = end
+                while cut > start and not data[cut - 1].isspace():
+                    cut -= 1
+                if cut == start:
+                    cut = end
+            yield data[start:cut]
+            start = cut
+        rest = data[start:]
+        buffer = [rest] if rest else []
+        size = len(rest)
+    if buffer:
+        yield ''.join(buffer)
+
 def detect_file_type(file_path: Path) -> str:
     """Detect the type of a file based on its extension and content.
     
@@ -1,6 +1,6 @@
 import re
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Union, Any
 
 try:
     from shared_tools.project_config import ProjectConfig  # type: ignore
@@ -18,6 +18,8 @@ def calculate_hash(file_path: Union[str, Path]) -> str: ...
 def load_json_config(config_path: Union[str, Path, ProjectConfig]) -> Dict: ...
 def save_metadata(metadata: Dict, output_path: Union[str, Path, ProjectConfig]) -> None: ...
 def chunk_text(text: str, chunk_size: int = ..., overlap: int = ...) -> List[str]: ...
+TEXT_WINDOW_CHARS: int
+def iter_text_windows(source: Union[str, Path, Iterable[str]], window_chars: int = ...) -> Iterator[str]: ...
 def detect_file_type(file_path: Path) -> str: ...
 def normalize_text(text: str) -> str: ...
 def calculate_similarity(text1: str, text2: str) -> float: ... 
\ No newline at end of file
@@ -0,0 +1,24 @@
+import hashlib
+import pickle
+
+from shared_tools.processors.blob_store import BlobStore
+
+
+def test_content_is_written_once_under_its_digest(tmp_path):
+    store = BlobStore(tmp_path)
+    ref = store.put(b"chart bytes", ".PNG")
+    digest = hashlib.sha256(b"chart bytes").hexdigest()
+
+    assert ref == f"{digest[:2]}/{digest}.png"
+    assert store.put(b"chart bytes", "png") == ref
+    assert store.get(ref) == b"chart bytes"
+    assert store.stats == {"written": 1, "reused": 1, "bytes_written": len(b"chart bytes")}
+    assert [p.name for p in tmp_path.rglob("*") if p.is_file()] == [f"{digest}.png"]
+
+
+def test_store_pickles_without_its_counters(tmp_path):
+    store = BlobStore(tmp_path)
+    ref = store.put(b"x", "jpg")
+    copy = pickle.loads(pickle.dumps(store))
+    assert copy.exists(ref)
+    assert copy.stats["written"] == 0
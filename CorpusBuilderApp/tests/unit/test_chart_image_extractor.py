@@ -0,0 +1,83 @@
+import base64
+import types
+
+from shared_tools.processors import chart_image_extractor
+from shared_tools.processors.chart_image_extractor import ChartImageExtractor
+from shared_tools.processors.image_analysis_cache import ImageAnalysisCache
+
+
+class _Image:
+    size = (400, 300)
+    mode = "RGB"
+
+    def __init__(self, data):
+        self.data = data
+
+
+def _page(*xrefs):
+    images = {1: b"logo", 2: b"figure", 3: b"figure"}
+    document = types.SimpleNamespace(extract_image=lambda xref: {"image": images[xref], "ext": "png"})
+    return types.SimpleNamespace(get_images=lambda: [(xref,) for xref in xrefs], parent=document)
+
+
+def _extractor(monkeypatch, cache, blob_store=None):
+    monkeypatch.setattr(chart_image_extractor, "Image", types.SimpleNamespace(open=lambda buffer: _Image(buffer.read())))
+    extractor = ChartImageExtractor(analysis_cache=cache, blob_store=blob_store)
+    calls = {"quality": [], "ocr": []}
+    extractor._calculate_image_quality = lambda image: calls["quality"].append(image.data) or 0.9
+    extractor._create_thumbnail_png = lambda image, size=(150, 150): b"thumb-" + image.data
+    extractor._detect_chart_type = lambda image, text: {"is_chart": True, "chart_type": "line_chart", "confidence": 0.7}
+    extractor._extract_text_from_images = lambda images: calls["ocr"].append([i.data for i in images]) or [
+        f"{i.data.decode()} price" for i in images]
+    return extractor, calls
+
+
+def test_repeated_images_are_analysed_once(monkeypatch):
+    cache = ImageAnalysisCache()
+    extractor, calls = _extractor(monkeypatch, cache)
+
+    first = extractor._extract_page_images(_page(1, 2, 1), 0, "a.pdf", None)
+    second = extractor._extract_page_images(_page(3, 1), 0, "b.pdf", None)
+
+    assert calls["quality"] == [b"logo", b"figure"]
+    assert calls["ocr"] == [[b"logo", b"figure"]]
+    assert [image["ocr_text"] for image in first + second] == ["logo price", "figure price", "logo price",
+                                                              "figure price", "logo price"]
+    assert base64.b64decode(second[0]["base64_thumbnail"]) == b"thumb-figure"
+    assert second[0]["thumbnail_ref"] is None
+    assert second[1]["metadata"]["chart_type"] == "line_chart"
+    assert all(image["contains_financial_content"] for image in first + second)
+    assert cache.stats["hits"] == 2
+    assert cache.stats["entries"] == 2
+
+
+def test_analyses_persist_across_extractors(monkeypatch, tmp_path):
+    path = tmp_path / "image_analysis.sqlite"
+    extractor, _ = _extractor(monkeypatch, ImageAnalysisCache(path))
+    extractor._extract_page_images(_page(1), 0, "a.pdf", None)
+    extractor.analysis_cache.close()
+
+    extractor, calls = _extractor(monkeypatch, ImageAnalysisCache(path))
+    [image] = extractor._extract_page_images(_page(1), 4, "c.pdf", None)
+
+    assert calls == {"quality": [], "ocr": []}
+    assert (image["id"], image["size"], image["ocr_text"]) == ("c_p5_img0", (400, 300), "logo price")
+    assert extractor.analysis_cache.stats["hit_rate"] == 1.0
+
+
+def test_thumbnails_and_saved_images_go_to_the_blob_store(monkeypatch, tmp_path):
+    extractor, _ = _extractor(monkeypatch, ImageAnalysisCache(), blob_store=tmp_path / "blobs")
+    output_dir = tmp_path / "unused"
+
+    images = extractor._extract_page_images(_page(1, 2, 3, 1), 0, "a.pdf", output_dir)
+
+    store = extractor.blob_store
+    assert [image["base64_thumbnail"] for image in images] == [None] * 4
+    assert store.get(images[0]["thumbnail_ref"]) == b"thumb-logo"
+    assert images[0]["thumbnail_ref"] == images[3]["thumbnail_ref"]
+    assert images[1]["image_ref"] == images[2]["image_ref"]
+    assert images[1]["saved_path"] == str(store.path(images[1]["image_ref"]))
+    assert store.get(images[1]["image_ref"]) == b"figure"
+    assert not output_dir.exists()
+    # Two thumbnails and two images, each written once
+    assert store.stats["written"] == 4
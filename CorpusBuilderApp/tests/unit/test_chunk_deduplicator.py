@@ -0,0 +1,60 @@
+from shared_tools.processors.chunk_deduplicator import ChunkDeduplicator
+
+DISCLAIMER = (
+    "This material is provided for informational purposes only and does not "
+    "constitute investment advice. Past performance is not indicative of future results."
+)
+
+
+def _doc(i):
+    body = f"Document {i} discusses funding rates on perpetual swap venue number {i} in detail."
+    return f"{body}\n\n{DISCLAIMER}\n\nClosing remarks for document {i}."
+
+
+def test_reports_chunks_shared_across_documents(tmp_path):
+    for i in range(4):
+        (tmp_path / f"doc{i}.txt").write_text(_doc(i), encoding="utf-8")
+
+    detector = ChunkDeduplicator(min_chunk_chars=50, min_doc_frequency=3)
+    assert detector.scan_directory(tmp_path) == 4
+
+    repeated = detector.get_repeated_chunks()
+    assert len(repeated) == 1
+    assert repeated[0]["doc_frequency"] == 4
+    assert repeated[0]["sample"].startswith("This material is provided")
+    assert repeated[0]["redundant_tokens"] == 3 * len(DISCLAIMER.split())
+    assert repeated[0]["first_document"] == str(tmp_path / "doc0.txt")
+
+
+def test_text_is_kept_only_for_chunks_in_several_documents():
+    detector = ChunkDeduplicator(min_chunk_chars=50, min_doc_frequency=3)
+    for i in range(4):
+        detector.add_document(f"doc{i}", _doc(i))
+
+    # Four distinct bodies and the shared disclaimer, whose text alone is sampled
+    assert len(detector.doc_frequency) == 5
+    assert list(detector.samples.values()) == [DISCLAIMER]
+
+
+def test_strip_directory_removes_boilerplate(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    for i in range(3):
+        (src / f"doc{i}.txt").write_text(_doc(i), encoding="utf-8")
+
+    detector = ChunkDeduplicator(min_chunk_chars=50, min_doc_frequency=3)
+    detector.scan_directory(src)
+    stats = detector.strip_directory(src, tmp_path / "out")
+
+    stripped = (tmp_path / "out" / "doc1.txt").read_text(encoding="utf-8")
+    assert DISCLAIMER not in stripped
+    assert "perpetual swap venue number 1" in stripped
+    assert stats["files_changed"] == 3
+    # The source files are left untouched
+    assert DISCLAIMER in (src / "doc1.txt").read_text(encoding="utf-8")
+
+
+def test_iter_chunks_round_trips_text():
+    detector = ChunkDeduplicator(min_chunk_chars=10, chunk_size=40)
+    text = "First paragraph. It has sentences. More text here.\n\n\nSecond one.\n"
+    assert "".join(chunk for chunk, _ in detector.iter_chunks(text)) == text
@@ -0,0 +1,169 @@
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from shared_tools.processors import corruption_detector as cd
+
+
+def test_shared_detector_is_created_once_per_config(monkeypatch):
+    created = []
+    original = cd.CorruptionDetector.__init__
+
+    def counting_init(self, *args, **kwargs):
+        created.append(kwargs.get('config'))
+        original(self, *args, **kwargs)
+
+    monkeypatch.setattr(cd, "_SHARED_DETECTORS", {})
+    monkeypatch.setattr(cd.CorruptionDetector, "__init__", counting_init)
+    text = "plain readable sentence. " * 10
+    for _ in range(5):
+        cd.detect_corruption(text)
+        cd.detect_corruption(text, {'min_text_length': 10})
+    assert len(created) == 2
+
+
+def test_shared_detector_keeps_its_own_config(monkeypatch):
+    monkeypatch.setattr(cd, "_SHARED_DETECTORS", {})
+    config = {'min_text_length': 10}
+    detector = cd.get_corruption_detector(config)
+    config['min_text_length'] = 10_000
+
+    assert detector.config['min_text_length'] == 10
+    assert cd.get_corruption_detector({'min_text_length': 10}) is detector
+
+
+def test_default_config_detects_without_errors():
+    result = cd.detect_corruption("plain readable sentence. " * 10)
+    assert result == {'is_corrupted': False, 'corruption_score': 0.0, 'issues_found': []}
+
+
+def test_shared_detector_is_thread_safe():
+    detector = cd.get_corruption_detector()
+    texts = [f"document {i} " * 40 for i in range(200)]
+    expected = [cd.CorruptionDetector().detect(t) for t in texts]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert list(executor.map(detector.detect, texts)) == expected
+
+
+def test_char_stats_counts_classes_and_runs():
+    stats = cd.compute_char_stats("Ab1, é\x00� ******** ====    x")
+    assert stats.chars == 27
+    assert stats.control_chars == 1
+    assert stats.replacement_chars == 1
+    assert stats.letter_chars == 4
+    assert stats.digit_chars == 1
+    assert stats.long_run_bytes == 8  # the stars; '====' is too short, spaces are ignored
+    assert stats.longest_run == 8
+
+
+def test_char_stats_pieces_match_whole_text():
+    text = "intro " + "*" * 30 + " body\x01text " + "." * 12 + "end"
+    whole = cd.compute_char_stats(text)
+    pieces = cd.CharStats()
+    for i in range(0, len(text), 7):
+        pieces.update(text[i:i + 7])
+    pieces.finish()
+    assert pieces.as_dict() == whole.as_dict()
+    assert pieces.histogram == whole.histogram
+
+
+def test_detect_scores_character_level_corruption():
+    detector = cd.get_corruption_detector()
+    clean = detector.detect("The funding rate keeps the swap price near the index. " * 5)
+    garbled = detector.detect("�\x02" * 20 + "The funding rate keeps the price near the index. " * 3)
+    repeated = detector.detect("Table of contents " + "#" * 200)
+
+    assert clean['issues_found'] == []
+    assert 'encoding_errors' in garbled['issues_found'] and garbled['is_corrupted']
+    assert 'format_errors' in repeated['issues_found']
+
+
+def test_detect_accepts_tables_and_rules():
+    detector = cd.get_corruption_detector()
+    table = "Q1 revenue\n" + "".join(
+        f"| {m} | {r:,} | {g:+.1f}% | {c:.2f} |\n"
+        for m, r, g, c in [("Jan", 1204500, 3.2, 0.84), ("Feb", 1187250, -1.4, 0.81), ("Mar", 1320900, 11.3, 0.88)])
+    ruled = "Quarterly summary\n" + "-" * 80 + "\nRevenue grew on higher trading volume across all venues.\n"
+    toc = "Table of contents " + "." * 200
+
+    for text in (table, ruled, toc):
+        result = detector.detect(text)
+        assert result['issues_found'] == [], text
+        assert not result['is_corrupted']
+
+
+def test_check_files_reports_each_file(tmp_path):
+    clean = tmp_path / "notes.txt"
+    clean.write_text("plain readable sentence. " * 10, encoding="utf-8")
+    truncated = tmp_path / "paper.pdf"
+    truncated.write_bytes(b"%PDF-1.7\n1 0 obj\n")
+    bad_json = tmp_path / "meta.json"
+    bad_json.write_text("{not json", encoding="utf-8")
+    bad_utf8 = tmp_path / "broken.txt"
+    bad_utf8.write_bytes(b"caf\xe9 ol\xe9")
+    missing = tmp_path / "missing.txt"
+
+    paths = [str(p) for p in (clean, truncated, bad_json, bad_utf8, missing)]
+    results = dict(cd.check_files(paths, {'verify_checksums': False}))
+
+    assert list(results) == paths
+    assert results[str(clean)]['status'] == 'clean'
+    assert results[str(truncated)]['status'] == 'corrupted'
+    assert not results[str(truncated)]['checks']['structure']['passed']
+    assert results[str(bad_json)]['status'] == 'corrupted'
+    assert not results[str(bad_utf8)]['checks']['encoding']['passed']
+    assert results[str(missing)]['status'] == 'error'
+
+
+def test_check_file_skips_oversized_files(tmp_path, monkeypatch):
+    big = tmp_path / "big.pdf"
+    big.write_bytes(b"x" * (2 * 2**20 + 1))
+    detector = cd.CorruptionDetector()
+    detector.configure(max_file_size=2)
+    monkeypatch.setattr(cd.Path, "read_bytes", lambda self: pytest.fail("oversized file was read"))
+
+    report = detector.check_file(big)
+    assert report['status'] == 'skipped'
+    assert list(report['checks']) == ['size']
+    assert dict(cd.check_files([str(big)], {'max_file_size': 2}))[str(big)]['status'] == 'skipped'
+
+
+def test_check_file_verifies_sidecar_checksum(tmp_path):
+    doc = tmp_path / "doc.txt"
+    doc.write_text("plain readable sentence. " * 10, encoding="utf-8")
+    (tmp_path / "doc.json").write_text('{"sha256": "0000"}', encoding="utf-8")
+
+    report = cd.CorruptionDetector().check_file(doc)
+
+    assert report['status'] == 'corrupted'
+    assert not report['checks']['checksum']['passed']
+
+
+def test_check_file_ignores_source_document_checksum(tmp_path):
+    # Sidecar as BaseExtractor.process_file writes it: sha256 of the source PDF
+    text = "plain readable sentence. " * 10
+    pdf = tmp_path / "doc.pdf"
+    pdf.write_bytes(b"%PDF-1.4 source")
+    doc = tmp_path / "doc.txt"
+    doc.write_bytes(text.encode("utf-8"))
+    meta = {"source_file": str(pdf), "sha256": hashlib.sha256(pdf.read_bytes()).hexdigest()}
+    (tmp_path / "doc.json").write_text(json.dumps(meta), encoding="utf-8")
+
+    assert cd.CorruptionDetector().check_file(doc)['checks']['checksum']['passed']
+
+    for text_digest, passed in ((hashlib.sha256(text.encode("utf-8")).hexdigest(), True), ("0000", False)):
+        meta["text_sha256"] = text_digest
+        (tmp_path / "doc.json").write_text(json.dumps(meta), encoding="utf-8")
+
+        assert cd.CorruptionDetector().check_file(doc)['checks']['checksum']['passed'] is passed
+        assert cd.CorruptionDetector().check_file(pdf)['checks']['checksum']['passed']
+
+
+def test_detect_stream_matches_detect():
+    detector = cd.CorruptionDetector()
+    text = "readable text\n" * 20 + "\x00\x01" * 10 + "=" * 40 + "more text� " * 5
+    pieces = [text[i:i + 9] for i in range(0, len(text), 9)]
+    assert detector.detect_stream(pieces) == detector.detect(text)
+    assert detector.detect_stream(["too short"]) == detector.detect("too short")
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from shared_tools.processors.deduplicate_nonpdf_outputs import DeduplicateNonPDFOutputs
+
+
+@pytest.fixture
+def outputs(tmp_path):
+    docs = tmp_path / "docs"
+    extracted = tmp_path / "_extracted"
+    docs.mkdir()
+    extracted.mkdir()
+    for name, tokens in (("a", 10), ("b", 30), ("c", 5)):
+        content = "unique text" if name == "c" else "shared text"
+        (docs / f"{name}.txt").write_text(content, encoding="utf-8")
+        (extracted / f"{name}.json").write_text(json.dumps({"token_count": tokens}), encoding="utf-8")
+    return tmp_path
+
+
+def _read_journal(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_dry_run_only_writes_journal(outputs, tmp_path):
+    journal = tmp_path / "journal.jsonl"
+    report = DeduplicateNonPDFOutputs(
+        outputs, strategy="keep_largest", duplicate_action="delete", dry_run=True, journal_path=journal
+    ).run()
+
+    assert report["total_groups"] == 1
+    assert report["duplicate_groups"][0]["kept_file"].endswith("b.txt")
+    assert report["token_loss"] == 10
+    assert (outputs / "docs" / "a.txt").exists()
+    assert "deduplicated" not in json.loads((outputs / "_extracted" / "a.json").read_text())
+    entries = _read_journal(journal)
+    assert {e["status"] for e in entries} == {"planned"}
+    assert sorted(e["op"] for e in entries) == ["delete", "update_metadata", "update_metadata"]
+
+
+def test_move_applies_metadata_and_file_ops(outputs, tmp_path):
+    journal = tmp_path / "journal.jsonl"
+    DeduplicateNonPDFOutputs(
+        outputs, strategy="keep_largest", duplicate_action="move", batch_size=1, journal_path=journal
+    ).run()
+
+    meta = json.loads((outputs / "_extracted" / "a.json").read_text())
+    assert meta["is_duplicate_of"].endswith("b.txt")
+    assert meta["token_loss"] == 10
+    assert json.loads((outputs / "_extracted" / "b.json").read_text())["kept_file"] is True
+    assert not (outputs / "docs" / "a.txt").exists()
+    assert (outputs / "duplicates" / "dg-001_a.txt").exists()
+    applied = [e for e in _read_journal(journal) if e["status"] == "applied"]
+    assert len(applied) == 3
+
+
+def test_unknown_duplicate_action_rejected(outputs):
+    with pytest.raises(ValueError):
+        DeduplicateNonPDFOutputs(outputs, duplicate_action="archive")
@@ -0,0 +1,175 @@
+import json
+import random
+from unittest.mock import patch
+
+import pytest
+
+from shared_tools.processors.deduplicator import (
+    Deduplicator,
+    compute_simhash,
+    hamming_distance,
+    simhash_band_keys,
+    simhash_bands,
+    simhash_probe_keys,
+)
+
+
+class _Cfg:
+    def __init__(self, base):
+        self.base = base
+
+    def get_input_dir(self):
+        return self.base / "raw"
+
+    def get_logs_dir(self):
+        return self.base / "logs"
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    raw = tmp_path / "raw"
+    (raw / "papers").mkdir(parents=True)
+    (raw / "papers_extracted").mkdir()
+    for name in ("a", "b"):
+        (raw / "papers" / f"{name}.pdf").write_bytes(b"same pdf bytes")
+    (raw / "papers" / "c.pdf").write_bytes(b"unique pdf bytes")
+    (raw / "papers_extracted" / "a.txt").write_text("one two three", encoding="utf-8")
+    (raw / "papers_extracted" / "b.txt").write_text("one two three four five", encoding="utf-8")
+    (raw / "papers_extracted" / "c.txt").write_text("alpha beta", encoding="utf-8")
+    return tmp_path
+
+
+def test_scan_records_token_counts(corpus):
+    dedup = Deduplicator(_Cfg(corpus), use_minhash=False)
+    assert dedup.scan_corpus(rebuild_index=True)
+
+    raw = corpus / "raw" / "papers"
+    assert dedup.token_index[str(raw / "a.pdf")] == 3
+    assert dedup.token_index[str(raw / "b.pdf")] == 5
+    index = json.loads((corpus / "raw" / "deduplication_index.json").read_text())
+    assert index["token_index"] == dedup.token_index
+
+
+def test_deduplicate_uses_index_for_token_stats(corpus, tmp_path):
+    dedup = Deduplicator(_Cfg(corpus), use_minhash=False)
+    dedup.scan_corpus(rebuild_index=True)
+    report = tmp_path / "token_loss.json"
+
+    with patch.object(Deduplicator, "_get_file_token_count") as counter:
+        removed = dedup.deduplicate(strategy="keep_largest", token_loss_report=str(report))
+    counter.assert_not_called()
+
+    assert removed == [str(corpus / "raw" / "papers" / "a.pdf")]
+    stats = json.loads(report.read_text())
+    assert stats["papers"]["tokens_before"] == 10
+    assert stats["papers"]["tokens_after"] == 7
+    assert stats["TOTAL"]["tokens_lost"] == 3
+
+
+def test_deduplicate_saves_pruned_index(corpus):
+    dedup = Deduplicator(_Cfg(corpus), use_minhash=False)
+    dedup.scan_corpus(rebuild_index=True)
+    [removed] = dedup.deduplicate(strategy="keep_largest")
+
+    reloaded = Deduplicator(_Cfg(corpus), use_minhash=False)
+    assert reloaded.scan_corpus()
+    assert removed not in reloaded.token_index
+    assert sum(reloaded.token_index.values()) == 7
+    assert all(removed not in paths for paths in reloaded.file_hashes.values())
+    assert reloaded.deduplicate() == []
+
+
+def test_legacy_index_without_tokens_is_rebuilt(corpus):
+    index_path = corpus / "raw" / "deduplication_index.json"
+    index_path.write_text(json.dumps({"file_hashes": {}, "sha256_index": {}, "title_index": {}}))
+
+    dedup = Deduplicator(_Cfg(corpus), use_minhash=False)
+    dedup.scan_corpus()
+
+    assert len(dedup.token_index) == 3
+
+
+def test_simhash_groups_near_duplicates(corpus):
+    dedup = Deduplicator(_Cfg(corpus), near_duplicate_method="simhash", simhash_max_distance=6)
+    base = " ".join(f"word{i}" for i in range(200))
+    near = base.replace("word17 ", "changed ")
+    other = " ".join(f"other{i}" for i in range(200))
+
+    groups = dedup._group_by_simhash({"a": base, "b": near, "c": other})
+
+    assert groups == [["a", "b"]]
+
+
+def test_simhash_bands_cover_all_bits():
+    bands = simhash_bands(6)
+    assert len(bands) == 4
+    assert sum(bin(mask).count("1") for _, mask in bands) == 64
+    assert len(simhash_bands(2)) == 3
+    assert compute_simhash("same text here") == compute_simhash("same text here")
+    assert hamming_distance(0b1011, 0b0001) == 2
+
+
+@pytest.mark.parametrize("max_distance", [0, 3, 6, 9])
+def test_simhash_probes_find_every_fingerprint_within_distance(max_distance):
+    rng = random.Random(max_distance)
+    bands = simhash_bands(max_distance)
+    for _ in range(200):
+        fp = rng.getrandbits(64)
+        near = fp
+        for bit in rng.sample(range(64), max_distance):
+            near ^= 1 << bit
+        assert set(simhash_band_keys(near, bands)) & set(simhash_probe_keys(fp, bands, max_distance))
+
+
+def test_simhash_probes_bound_candidates_per_document():
+    rng = random.Random(0)
+    bands = simhash_bands(6)
+    fingerprints = [rng.getrandbits(64) for _ in range(4000)]
+    buckets = {}
+    for i, fp in enumerate(fingerprints):
+        for key in simhash_band_keys(fp, bands):
+            buckets.setdefault(key, set()).add(i)
+
+    candidates = [
+        len(set().union(*(buckets.get(key, ()) for key in simhash_probe_keys(fp, bands, 6))) - {i})
+        for i, fp in enumerate(fingerprints)
+    ]
+    # About N/960 for unrelated fingerprints; seven 9-bit bands gave about N/75
+    assert sum(candidates) / len(candidates) < 10
+    assert max(candidates) < 30
+
+
+def test_unknown_near_duplicate_method_rejected(corpus):
+    with pytest.raises(ValueError):
+        Deduplicator(_Cfg(corpus), near_duplicate_method="bloom")
+
+
+def test_snapshot_fingerprints_detect_exported_documents(corpus, tmp_path):
+    import zipfile
+
+    exported = " ".join(f"token{i}" for i in range(100))
+    archive = tmp_path / "corpus_export_20250101.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("manifest.json", json.dumps({"corpus_version": "20250101T000000Z"}))
+        zf.writestr("processed/_extracted/papers/old.txt", exported)
+        zf.writestr("metadata/papers/old.json", "{}")
+
+    dedup = Deduplicator(_Cfg(corpus))
+    assert dedup.register_snapshot(archive) == 1
+
+    new_dir = tmp_path / "new"
+    new_dir.mkdir()
+    (new_dir / "same.txt").write_text(exported, encoding="utf-8")
+    (new_dir / "near.txt").write_text(exported.replace("token5 ", "edited "), encoding="utf-8")
+    (new_dir / "fresh.txt").write_text(" ".join(f"fresh{i}" for i in range(100)), encoding="utf-8")
+
+    # A fresh instance relies only on the persisted fingerprints
+    reloaded = Deduplicator(_Cfg(corpus))
+    matches = reloaded.check_against_snapshots([str(p) for p in sorted(new_dir.iterdir())])
+
+    by_file = {m["files"][0].rsplit("/", 1)[-1]: m for m in matches}
+    assert set(by_file) == {"same.txt", "near.txt"}
+    assert by_file["same.txt"]["type"] == "snapshot_hash"
+    assert by_file["near.txt"]["type"] == "snapshot_similar_content"
+    assert by_file["near.txt"]["snapshot_file"] == "processed/_extracted/papers/old.txt"
+    assert reloaded.snapshot_index["corpus_export_20250101"]["corpus_version"] == "20250101T000000Z"
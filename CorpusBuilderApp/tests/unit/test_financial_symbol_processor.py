@@ -0,0 +1,141 @@
+from shared_tools.processors import financial_symbol_processor as fsp
+
+
+def _paper(body_paragraphs):
+    head = "Abstract\nWe study funding rates.\n\n1. Introduction\nPrior work (Smith et al., 2021) [1].\n\n"
+    body = "The perpetual swap market is liquid and prices move quickly. " * 40 + "\n\n"
+    tail = "\n\n5. Conclusion\nFunding matters.\n\nReferences\n" + "".join(
+        f"[{i}] Author {i}. Title. doi: 10.{1000 + i}/x (2020)\n" for i in range(1, 40)
+    )
+    return head + body * body_paragraphs + tail
+
+
+def test_bounded_detection_matches_full_scan_verdict():
+    processor = fsp.AcademicPaperProcessor()
+    text = _paper(500)
+    assert len(text) > fsp.ACADEMIC_SAMPLE_MAX_CHARS
+
+    full = processor.detect_academic_paper(text, {}, bounded=False)
+    bounded = processor.detect_academic_paper(text, {})
+
+    assert bounded['bounded'] and not full['bounded']
+    assert bounded['is_academic_paper'] == full['is_academic_paper'] is True
+    assert bounded['indicators_found'] == full['indicators_found']
+    assert sum(map(len, processor._sample_regions(text))) <= fsp.ACADEMIC_SAMPLE_MAX_CHARS
+
+
+def test_short_texts_are_scanned_whole():
+    processor = fsp.AcademicPaperProcessor()
+    text = _paper(2)
+    result = processor.detect_academic_paper(text, {})
+    assert not result['bounded']
+    assert processor._sample_regions(text) == [text]
+
+
+def test_bounded_validation_estimates_tokens():
+    processor = fsp.AcademicPaperProcessor()
+    text = _paper(500)
+    full = processor.validate_academic_content(text, {}, bounded=False)
+    bounded = processor.validate_academic_content(text, {})
+    assert bounded['passes_academic_standards'] == full['passes_academic_standards']
+    assert not any(issue.startswith('Insufficient') for issue in bounded['issues'])
+
+
+def test_bounded_validation_weighs_reference_list_by_its_share():
+    processor = fsp.AcademicPaperProcessor()
+    text = _paper(100).replace("References\n", "References\n" + "".join(f"[{i}] Lee (2020)\n" for i in range(1200)))
+    assert len(text) > fsp.ACADEMIC_SAMPLE_MAX_CHARS
+
+    full = processor.validate_academic_content(text, {}, bounded=False)
+    bounded = processor.validate_academic_content(text, {})
+    assert bounded['issues'] == full['issues'] == []
+    tokens, references, _ = processor._estimate_counts(text)
+    assert abs(tokens - len(text.split())) < 0.01 * tokens
+    assert references / tokens < 0.15
+
+
+def _separate_scans(processor, text):
+    found = []
+    for name, pattern in processor.preservation_patterns.items():
+        found.extend((m.start(), m.end(), name) for m in pattern.finditer(text))
+    return sorted(found, key=lambda item: item[0])
+
+
+def test_fused_scan_matches_separate_pattern_passes():
+    processor = fsp.FinancialSymbolProcessor()
+    text = (
+        "BTC and ETH rose; BRK.B P/E of 12, P&L in $1,250.00 and €300. "
+        "Fees 15 bps, 2.5% APY on DeFi, σ ≈ 0.2 and Δ ≤ ∞. $1.234 USD, 1,2345 USD, 1.2.3% "
+        "and 3E+5 (TSLA) VaR/CVaR, x5 USD, ABCDEF."
+    )
+    result = processor.extract_symbols(text)
+
+    fused = [(s['position']['start'], s['position']['end'], s['pattern']) for s in result['symbols_by_position']]
+    assert fused == _separate_scans(processor, text)
+    assert list(result['symbols_by_type']) == [
+        name for name in processor.preservation_patterns if name in result['symbols_by_type']
+    ]
+    first = result['symbols_by_position'][0]
+    assert first['symbol'] == 'BTC' and first['context'] == text[:33]
+
+
+def test_replaced_pattern_gets_its_own_pass():
+    processor = fsp.FinancialSymbolProcessor()
+    processor.preservation_patterns['percentage'] = fsp.re.compile(r'\d+ percent')
+    text = "Yield 5 percent on BTC, 2.5% otherwise"
+
+    result = processor.extract_symbols(text)
+
+    fused = [(s['position']['start'], s['position']['end'], s['pattern']) for s in result['symbols_by_position']]
+    assert fused == _separate_scans(processor, text)
+    assert [s['symbol'] for s in result['symbols_by_type']['percentage']] == ['5 percent']
+
+
+def _symbol_text():
+    return " ".join(
+        f"Section {i}: BTC traded at $1,2{i % 10}0.50 with σ ≈ 0.{i} and 2.{i}% APY on DeFi (P/E {i})."
+        for i in range(300)
+    )
+
+
+def test_chunked_extraction_matches_whole_text():
+    processor = fsp.FinancialSymbolProcessor()
+    text = _symbol_text()
+    whole = processor.extract_symbols(text)
+
+    # An odd chunk size cuts through symbols
+    optimizer = fsp.MemoryOptimizer(chunk_size=997, overlap=128)
+    chunked = optimizer.process_large_text_in_chunks(text, processor.extract_symbols)
+
+    assert chunked['symbols_by_position'] == whole['symbols_by_position']
+    assert dict(chunked['symbols_by_type']) == whole['symbols_by_type']
+    assert chunked['preservation_map'] == whole['preservation_map']
+    assert chunked['statistics']['total_symbols'] == whole['statistics']['total_symbols']
+
+
+def test_parallel_chunks_match_sequential():
+    processor = fsp.FinancialSymbolProcessor()
+    text = _symbol_text()
+    sequential = fsp.MemoryOptimizer(chunk_size=4000).process_large_text_in_chunks(text, processor.extract_symbols)
+    parallel = fsp.MemoryOptimizer(chunk_size=4000, max_workers=2).process_large_text_in_chunks(
+        text, processor.extract_symbols
+    )
+    assert parallel['symbols_by_position'] == sequential['symbols_by_position']
+    assert parallel['preservation_map'] == sequential['preservation_map']
+
+
+def test_preserve_restore_round_trip_with_overlapping_symbols():
+    processor = fsp.FinancialSymbolProcessor()
+    text = "BTC rose 2.5% while P/E hit 12 and $1,250.00 USD moved σ."
+
+    preserved, preservation_map = processor.preserve_symbols_in_text(text)
+
+    assert preserved == "__SYMBOL_0__ rose __SYMBOL_1__ while __SYMBOL_2__ hit 12 and __SYMBOL_3__ __SYMBOL_4__ moved __SYMBOL_5__."
+    assert list(preservation_map.values()) == ['BTC', '2.5%', 'P/E', '$1,250.00', 'USD', 'σ']
+    assert processor.restore_symbols_in_text(preserved, preservation_map) == text
+    assert processor.restore_symbols_in_text(_symbol_text(), {}) == _symbol_text()
+
+
+def test_restore_accepts_custom_placeholders():
+    processor = fsp.FinancialSymbolProcessor()
+    assert processor.restore_symbols_in_text("<<A>> and <<B>>", {'<<A>>': 'BTC', '<<B>>': 'ETH'}) == "BTC and ETH"
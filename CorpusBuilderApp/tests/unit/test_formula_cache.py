@@ -0,0 +1,40 @@
+from shared_tools.processors.formula_cache import FormulaFeatureCache
+
+
+def _features(formula):
+    return {"length": len(formula)}
+
+
+def test_whitespace_variants_share_an_entry():
+    cache = FormulaFeatureCache()
+    first = cache.get_or_compute("x^2 +  y", _features)
+    assert cache.get_or_compute("  x^2 +\ny ", _features) is first
+    assert first == {"length": len("x^2 + y")}
+    assert cache.stats == {"hits": 1, "misses": 1, "hit_rate": 0.5, "entries": 1}
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = FormulaFeatureCache(max_entries=2)
+    for formula in ("a", "b", "a", "c"):
+        cache.get_or_compute(formula, _features)
+    assert cache.stats["entries"] == 2
+    cache.get_or_compute("a", _features)
+    cache.get_or_compute("b", _features)
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
+def test_features_persist_across_instances(tmp_path):
+    path = tmp_path / "formula_features.sqlite"
+    cache = FormulaFeatureCache(path, version="1")
+    cache.get_or_compute(r"\frac{a}{b}", _features)
+    assert cache.flush() == 1
+    cache.close()
+
+    reloaded = FormulaFeatureCache(path, version="1")
+    reloaded.get_or_compute(r"\frac{a}{b}", lambda formula: {"length": -1})
+    assert reloaded.stats["hits"] == 1
+
+    # Features stored by another version are recomputed
+    bumped = FormulaFeatureCache(path, version="2")
+    assert bumped.get_or_compute(r"\frac{a}{b}", lambda formula: {"length": -1}) == {"length": -1}
+    assert bumped.stats["misses"] == 1
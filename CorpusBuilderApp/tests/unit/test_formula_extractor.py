@@ -0,0 +1,112 @@
+import re
+
+import pytest
+
+from shared_tools.processors.formula_cache import FormulaFeatureCache
+from shared_tools.processors.formula_extractor import FormulaExtractor, math_font_lines
+
+TEXT = (
+    "The model $\\alpha + \\beta x_t$ is fitted daily.\n"
+    "\\begin{equation}\n\\sigma_t^2 = \\omega + \\alpha \\epsilon_{t-1}^2\n\\end{equation}\n"
+    "Returns R_{t+1} satisfy $$\\sum_{i=1}^{n} w_i r_i$$ where P(X > x) falls by 1.2e-4 "
+    "and E[X_t] grows at 3:1 with \\(\\frac{dS}{S}\\) and Var(R_p). Fees cost $1,250.00 here."
+)
+
+
+def _per_pattern_matches(extractor, text):
+    return {
+        (name, m.start(), m.end())
+        for name, pattern in extractor.formula_patterns.items()
+        for m in re.finditer(pattern, text, re.DOTALL | re.IGNORECASE)
+    }
+
+
+def test_single_pass_finds_non_overlapping_pattern_matches():
+    extractor = FormulaExtractor()
+    formulas = extractor._extract_latex(TEXT)
+    spans = [(f["position"]["start"], f["position"]["end"]) for f in formulas]
+
+    assert spans == sorted(spans)
+    assert all(end <= next_start for (_, end), (next_start, _) in zip(spans, spans[1:]))
+    legacy = _per_pattern_matches(extractor, TEXT)
+    assert all((f["type"], *span) in legacy for f, span in zip(formulas, spans))
+    assert {f["type"] for f in formulas} >= {
+        "inline_latex", "equation_env", "display_latex", "probability", "scientific_notation",
+        "expectation", "ratios", "bracket_inline", "variance", "currency", "returns",
+    }
+
+
+def test_overlaps_resolve_to_leftmost_then_earliest_pattern():
+    extractor = FormulaExtractor()
+    [formula] = extractor._extract_latex("see \\begin{equation} x = \\alpha + 5:2 \\end{equation} ok")
+    assert formula["type"] == "equation_env"
+    [formula] = extractor._extract_latex("so $$x^2 + y$$ holds")
+    assert formula["type"] == "display_latex"
+    assert formula["formula"] == "x^2 + y"
+
+
+def test_invalid_match_gives_way_to_later_pattern():
+    extractor = FormulaExtractor()
+    # The inline match "50 {x" has unbalanced braces, so the currency amount is kept
+    [formula] = extractor._extract_latex("it costs $50 {x$ now")
+    assert formula["type"] == "currency"
+    assert formula["formula"] == "$50"
+
+
+def test_dollar_amounts_are_not_read_as_inline_latex():
+    extractor = FormulaExtractor()
+    formulas = extractor._extract_latex("Returns of $1,000 and $2,000 and $3,000 were seen.")
+    assert [(f["type"], f["formula"]) for f in formulas] == [
+        ("currency", "$1,000"), ("currency", "$2,000"), ("currency", "$3,000")]
+    formulas = extractor._extract_latex("Fees rose from $100 to $2,500.00")
+    assert [(f["type"], f["formula"]) for f in formulas] == [("currency", "$100"), ("currency", "$2,500.00")]
+
+
+@pytest.mark.parametrize("body", ["x + y = z", "p < 0.05", "n = 100", "r = R/N"])
+def test_plain_inline_math_is_kept(body):
+    [formula] = FormulaExtractor()._extract_latex(f"we find ${body}$ here")
+    assert (formula["type"], formula["formula"]) == ("inline_latex", body)
+
+
+def test_repeated_formulas_are_reported_once():
+    extractor = FormulaExtractor()
+    formulas = extractor._extract_latex("P(X > x) and later p(x > X) again P(X  > x)")
+    assert [f["position"]["start"] for f in formulas] == [0]
+
+
+def test_changed_patterns_are_recompiled():
+    extractor = FormulaExtractor()
+    assert extractor._extract_latex("risk ES@97 today") == []
+    extractor.formula_patterns["expected_shortfall"] = r"\bES@\d+"
+    [formula] = extractor._extract_latex("risk ES@97 today")
+    assert formula["type"] == "expected_shortfall"
+
+
+def test_math_font_lines_keeps_lines_with_a_math_span():
+    page_dict = {"blocks": [
+        {"lines": [
+            {"spans": [{"text": "Plain prose", "font": "Helvetica"}]},
+            {"spans": [{"text": "where ", "font": "Helvetica"}, {"text": "$\\alpha + \\beta$", "font": "CMMI10-Math"}]},
+            {"spans": [{"text": "  ", "font": "Symbol"}]},
+        ]},
+        {"type": 1, "image": b""},
+    ]}
+    assert math_font_lines(page_dict) == ["where $\\alpha + \\beta$"]
+
+
+def test_extract_from_pdf_uses_captured_lines_without_opening_the_pdf():
+    extractor = FormulaExtractor()
+    formulas = extractor.extract_from_pdf("missing.pdf", math_lines=[(3, "where $\\alpha + \\beta x$ holds")])
+    assert [(f["formula"], f["page"], f["source"]) for f in formulas] == [("\\alpha + \\beta x", 3, "pdf_structure")]
+
+
+def test_repeated_formulas_are_scored_once_across_extractors():
+    cache = FormulaFeatureCache()
+    text = "where $\\alpha + \\beta x$ and E[X_t] hold"
+    first = FormulaExtractor(metadata_cache=cache)._extract_latex(text)
+    second = FormulaExtractor(metadata_cache=cache)._extract_latex(text.replace("+ ", "+  "))
+
+    assert [f["metadata"]["length"] for f in second] == [17, 6]
+    assert [dict(f["metadata"], length=0) for f in second] == [dict(f["metadata"], length=0) for f in first]
+    assert cache.stats["misses"] == 2
+    assert cache.stats["hits"] == 2
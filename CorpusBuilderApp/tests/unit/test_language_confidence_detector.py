@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+
+import pytest
+
+from shared_tools.processors import language_confidence_detector as lcd
+
+
+@pytest.fixture
+def fake_langdetect(monkeypatch):
+    calls = []
+
+    def detect_langs(text):
+        calls.append(text)
+        lang = "de" if "und" in text.split() else "en"
+        return [SimpleNamespace(lang=lang, prob=0.99)]
+
+    monkeypatch.setattr(lcd, "detect_langs", detect_langs)
+    return calls
+
+
+def _long_text(sentences, german_every=0):
+    parts = []
+    for i in range(sentences):
+        if german_every and i % german_every == 0:
+            parts.append("die Rate und der Preis bleiben nahe am Index")
+        else:
+            parts.append("the funding rate keeps the perpetual price near the index")
+    return ". ".join(parts) + "."
+
+
+def test_long_text_detection_is_bounded(fake_langdetect):
+    text = _long_text(5000)
+    result = lcd.detect_language_confidence(text, segment_budget=32)
+
+    assert result["language"] == "en"
+    assert result["mixed_language_flag"] is False
+    # One primary call plus at most the segment budget
+    assert len(fake_langdetect) <= 33
+    assert len(fake_langdetect[0]) <= lcd.PRIMARY_WINDOWS * (lcd.PRIMARY_WINDOW_CHARS + 1)
+
+
+def test_early_exit_once_proportions_stabilise(fake_langdetect):
+    lcd.detect_language_confidence(_long_text(5000), segment_budget=64)
+    assert len(fake_langdetect) - 1 == lcd.EARLY_EXIT_MIN_SEGMENTS + lcd.EARLY_EXIT_CHECK_EVERY
+
+
+def test_sampling_still_finds_mixed_languages(fake_langdetect):
+    result = lcd.detect_language_confidence(_long_text(5000, german_every=3), segment_budget=64)
+    assert result["mixed_language_flag"] is True
+    assert set(result["mixed_languages"]) == {"en", "de"}
+
+
+def test_exhaustive_mode_checks_every_segment(fake_langdetect):
+    lcd.detect_language_confidence(_long_text(3000), segment_budget=None)
+    assert len(fake_langdetect) == 3001
@@ -0,0 +1,124 @@
+import json
+import os
+import random
+
+import pytest
+
+from shared_tools.processors import machine_translation_detector as mtd
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    mtd.clear_mt_config_cache()
+    yield
+    mtd.clear_mt_config_cache()
+
+
+def test_config_is_read_once_until_file_changes(tmp_path, monkeypatch):
+    config_path = tmp_path / "mt.json"
+    config_path.write_text(json.dumps({"ngram_repetition_threshold": 5}), encoding="utf-8")
+    reads = []
+    original = mtd._read_mt_config
+    monkeypatch.setattr(mtd, "_read_mt_config", lambda path=None: reads.append(path) or original(path))
+
+    for _ in range(3):
+        mtd.detect_machine_translation("A short sentence about markets.", config_path=str(config_path))
+    assert len(reads) == 1
+    assert mtd.load_mt_config(str(config_path))["ngram_repetition_threshold"] == 5
+
+    config_path.write_text(json.dumps({"ngram_repetition_threshold": 7}), encoding="utf-8")
+    stat = config_path.stat()
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert mtd.load_mt_config(str(config_path))["ngram_repetition_threshold"] == 7
+    assert len(reads) == 2
+
+
+def test_load_mt_config_returns_independent_copies():
+    config = mtd.load_mt_config()
+    config["disclaimer_patterns"].append("mutated")
+    assert "mutated" not in mtd.load_mt_config()["disclaimer_patterns"]
+
+
+def test_compiled_disclaimers_keep_reason_text():
+    result = mtd.detect_machine_translation("This report was Translated By an online service.")
+    assert result["machine_translation_reasons"][0] == "Found translation disclaimer: 'translated by'"
+    assert mtd.check_disclaimers("google translate output", ["google translate"])[0]
+
+
+def _sample_text():
+    sentences = [
+        "the funding rate keeps the perpetual price near the index",
+        "market makers quote both sides of the book",
+        "same phrase here",
+        "same phrase here",
+        "same phrase here",
+        "liquidity was being provided by pools that had walked away",
+    ]
+    return ". ".join(sentences * 5) + ".\n"
+
+
+def test_features_match_independent_tokenization():
+    text = _sample_text()
+    features = mtd.TextFeatures.from_text(text, window_chars=17)
+    checks = [
+        lambda f: mtd.check_repeated_phrase(text, features=f),
+        lambda f: mtd.check_ngram_repetition(text, features=f),
+        lambda f: mtd.check_functional_content_ratio(text, 0.3, features=f),
+        lambda f: mtd.check_missing_articles(text, features=f),
+        lambda f: mtd.check_rare_word_ratio(text, features=f),
+    ]
+    for check in checks:
+        assert check(features) == check(None)
+    assert features.word_count == len(text.split())
+
+
+def test_ngram_counts_are_bounded():
+    text = " ".join(f"w{i}" for i in range(5000))
+    features = mtd.TextFeatures.from_text(text, window_chars=1000, max_ngrams=500)
+    assert len(features.ngram_counts) <= 500
+    assert features.ngrams_pruned
+    assert features.token_count == 5000
+
+
+def test_stream_detection_matches_whole_text():
+    text = (
+        "This document was automatically translated.\n"
+        "- first item of the list\n"
+        "def helper():\n"
+        + "The market is moving and prices had changed after the report. " * 40
+        + "\nthe value of the token the value of the token the value of the token.\n"
+    )
+    whole = mtd.detect_machine_translation(text)
+    for size in (7, 64, 1000):
+        pieces = [text[i:i + size] for i in range(0, len(text), size)]
+        assert mtd.detect_machine_translation_stream(pieces) == whole
+
+
+def test_stream_counts_verb_forms_across_pieces():
+    text = "prices had\nchanged and the market was\n\nrunning while volume is\tgrowing\n" * 3
+    whole = mtd.TextFeatures.from_text(text)
+    rng = random.Random(7)
+    for _ in range(200):
+        size = rng.randint(1, 30)
+        pieces = mtd.TextFeatures.from_windows([text[i:i + size] for i in range(0, len(text), size)])
+        assert (pieces.present_continuous_count, pieces.past_perfect_count, pieces.verb_form_count) == (
+            whole.present_continuous_count, whole.past_perfect_count, whole.verb_form_count)
+    assert (whole.present_continuous_count, whole.past_perfect_count) == (6, 3)
+
+
+def test_stream_detection_matches_fuzzed_texts():
+    words = "is was are had the token running moved changed of and . \n - translated by".split(" ")
+    for seed in range(300):
+        rng = random.Random(seed)
+        text = "".join(rng.choice(words) + rng.choice([" ", "\n", "\n\n"]) for _ in range(rng.randint(20, 200)))
+        size = rng.randint(1, 40)
+        pieces = [text[i:i + size] for i in range(0, len(text), size)]
+        assert mtd.detect_machine_translation_stream(pieces) == mtd.detect_machine_translation(text), seed
+
+
+def test_stream_features_keep_line_signals():
+    text = "1. first\n2. second\n3. third\n"
+    features = mtd.TextFeatures.from_windows([text[i:i + 4] for i in range(0, len(text), 4)])
+    assert features.legitimate_repetition
+    assert not features.code_pattern
+    assert mtd.TextFeatures.from_windows(["intro\nx = 1\n"]).code_pattern
@@ -0,0 +1,99 @@
+import subprocess
+import types
+from pathlib import Path
+
+from shared_tools.processors import ocr_service
+from shared_tools.processors.chart_image_extractor import ChartImageExtractor
+from shared_tools.processors.ocr_service import OCRService
+
+
+class _Image:
+    mode = "L"
+
+    def __init__(self, text):
+        self.text = text
+
+    def save(self, path, format=None):
+        Path(path).write_text(self.text)
+
+
+def _fake_tesseract(calls, separator="\f"):
+    def run(args, capture_output, timeout):
+        paths = Path(args[1]).read_text().split()
+        calls.append(args)
+        stdout = separator.join(Path(p).read_text() for p in paths)
+        return subprocess.CompletedProcess(args, 0, stdout.encode(), b"")
+    return run
+
+
+def test_one_tesseract_run_per_batch(monkeypatch):
+    calls = []
+    monkeypatch.setattr(ocr_service.subprocess, "run", _fake_tesseract(calls))
+    service = OCRService(batch_size=2, backend="tesseract-batch")
+
+    texts = service.images_to_strings(_Image(f"page {i}\n") for i in range(5))
+
+    assert texts == [f"page {i}\n" for i in range(5)]
+    assert len(calls) == 3
+    assert calls[0][2:] == ["stdout", "--psm", "6", "-l", "eng"]
+    assert service.stats["processes_started"] == 3
+    assert service.stats["fallback_images"] == 0
+
+
+def test_trailing_page_separator_is_dropped(monkeypatch):
+    run = _fake_tesseract([])
+    monkeypatch.setattr(ocr_service.subprocess, "run", lambda args, **kwargs: subprocess.CompletedProcess(
+        args, 0, run(args, **kwargs).stdout + b"\f", b""))
+
+    assert OCRService(backend="tesseract-batch").images_to_strings([_Image("a"), _Image("b")]) == ["a", "b"]
+
+
+def test_unaccounted_batch_falls_back_to_one_call_per_image(monkeypatch):
+    monkeypatch.setattr(ocr_service.subprocess, "run", _fake_tesseract([], separator=""))
+    monkeypatch.setattr(ocr_service, "pytesseract", types.SimpleNamespace(
+        image_to_string=lambda image, lang, config: image.text.upper()))
+    service = OCRService(backend="tesseract-batch")
+
+    assert service.images_to_strings([_Image("a"), _Image("b")]) == ["A", "B"]
+    assert service.stats["fallback_images"] == 2
+
+
+def test_in_process_api_is_initialised_once(monkeypatch):
+    created = []
+
+    class _API:
+        def __init__(self, lang, psm):
+            created.append((lang, psm))
+
+        def SetImage(self, image):
+            self.image = image
+
+        def GetUTF8Text(self):
+            return self.image.text
+
+        def End(self):
+            created.remove(("eng", 6))
+
+    monkeypatch.setattr(ocr_service, "tesserocr", types.SimpleNamespace(PyTessBaseAPI=_API))
+    service = OCRService(batch_size=2, backend="tesserocr")
+
+    assert service.images_to_strings(_Image(t) for t in "abc") == ["a", "b", "c"]
+    assert service.image_to_string(_Image("d")) == "d"
+    assert created == [("eng", 6)]
+    service.close()
+    assert created == []
+
+
+def test_chart_images_are_recognised_in_one_batch():
+    extractor = ChartImageExtractor()
+    batches = []
+    extractor.ocr = types.SimpleNamespace(
+        images_to_strings=lambda images: batches.append(images) or ["price  volume\n"] * len(images))
+    extractor._enhance_image_for_ocr = lambda image: image
+    vector = {"type": "vector_graphic", "ocr_text": "", "contains_financial_content": False}
+
+    extractor._apply_ocr([(vector, "chart 1", None), (dict(vector), "chart 2", None)])
+
+    assert batches == [["chart 1", "chart 2"]]
+    assert vector["ocr_text"] == "price volume"
+    assert vector["contains_financial_content"]
@@ -0,0 +1,207 @@
+import json
+import types
+
+import pytest
+
+from shared_tools.processors.quality_control import DETECTOR_ORDER, QualityControl, project_verdict_cache
+
+
+def _verdict(name, score):
+    """A verdict shaped like the real detector's, contributing ``score``"""
+    if name == 'corruption':
+        return {'is_corrupted': score < 0.7, 'corruption_score': 1.0 - score}
+    if name == 'machine_translation':
+        return {'is_machine_translated': score < 0.1, 'confidence': 1.0 - score}
+    return {'confidence': score, 'metrics': {'fluency': score}}
+
+
+def _fake_detectors(qc, scores):
+    calls = []
+
+    def make(name):
+        def detect(text):
+            calls.append(name)
+            return _verdict(name, scores[name])
+        return detect
+
+    qc._detectors = {name: make(name) for name in scores}
+    qc._signalling = {name: True for name in scores}
+    return calls
+
+
+@pytest.mark.parametrize("scores", [
+    {'corruption': 0.0, 'machine_translation': 1.0, 'language_detection': 1.0},
+    {'corruption': 1.0, 'machine_translation': 0.5, 'language_detection': 1.0},
+    {'corruption': 1.0, 'machine_translation': 1.0, 'language_detection': 0.9},
+])
+def test_early_exit_keeps_quality_flag(scores):
+    qc = QualityControl()
+    _fake_detectors(qc, scores)
+    full = qc.check_quality("text", {})
+    calls = _fake_detectors(qc, scores)
+    early = qc.check_quality("text", {}, early_exit=True)
+
+    assert early['quality_flag'] == full['quality_flag']
+    if full['quality_flag']:
+        assert early['quality_score'] == full['quality_score']
+        assert len(calls) == 3
+    else:
+        assert 'short_circuit' in early
+
+
+def test_early_exit_skips_expensive_detector():
+    qc = QualityControl()
+    calls = _fake_detectors(qc, {'corruption': 0.0, 'machine_translation': 1.0, 'language_detection': 1.0})
+    qc.check_quality("text", {}, early_exit=True)
+    assert calls == ['corruption']
+
+
+def test_mildly_flagged_document_passes_with_real_detectors():
+    qc = QualityControl()
+    text = "The market maker quotes both sides of the order book and adjusts spreads as volatility changes. " * 20
+    result = qc.check_quality(text + "\ufffd" * 12, {})
+
+    assert result['quality_metrics']['corruption']['issues_found'] == ['encoding_errors']
+    # No language check is implemented yet, so that verdict carries no weight
+    assert result['quality_metrics']['language_detection']['metrics'] == {}
+    assert 0.7 < result['quality_score'] < 1.0
+    assert result['quality_flag']
+    assert qc.check_quality(text + "\ufffd" * 32, {})['quality_flag'] is False
+
+
+def test_early_exit_bound_ignores_detectors_without_signal():
+    qc = QualityControl()
+    calls = []
+    for name, score in (('corruption', 0.3), ('machine_translation', 1.0)):
+        qc._detectors[name] = lambda text, name=name, score=score: calls.append(name) or _verdict(name, score)
+
+    early = qc.check_quality("text", {}, early_exit=True)
+    assert calls == ['corruption']
+    assert early['quality_flag'] is qc.check_quality("text", {})['quality_flag'] is False
+
+
+def _write_docs(directory):
+    directory.mkdir()
+    long_text = "The market maker quotes both sides of the order book. " * 40
+    for i in range(4):
+        (directory / f"doc{i}.txt").write_text(long_text, encoding="utf-8")
+    (directory / "short.txt").write_text("too short", encoding="utf-8")
+    (directory / "meta.txt").write_text(long_text, encoding="utf-8")
+    (directory / "meta.json").write_text(json.dumps({"token_count": 3}), encoding="utf-8")
+
+
+def test_process_directory_short_circuits_cheap_failures(tmp_path):
+    _write_docs(tmp_path / "extracted")
+    qc = QualityControl()
+    summary = qc.process_directory(tmp_path / "extracted", max_workers=1)
+
+    assert len(summary['processed_files']) == 6
+    assert summary['error_count'] == 0
+    short = summary['results'][str(tmp_path / "extracted" / "short.txt")]
+    assert short['short_circuit'].startswith("token count 2")
+    meta = summary['results'][str(tmp_path / "extracted" / "meta.txt")]
+    assert meta['quality_metrics'] == {}
+    assert summary['passed_count'] + summary['failed_count'] == 6
+    assert summary['files_per_second'] > 0
+
+
+def test_process_directory_scores_real_detector_verdicts(tmp_path):
+    _write_docs(tmp_path / "extracted")
+    garbled = tmp_path / "extracted" / "garbled.txt"
+    garbled.write_text("\x00\x01\ufffd " * 300, encoding="utf-8")
+    summary = QualityControl().process_directory(tmp_path / "extracted", max_workers=1)
+
+    assert summary['error_count'] == 0
+    assert summary['passed_count'] == 4
+    assert summary['failed_count'] == 3
+    # short.txt and meta.txt fail the token count, garbled.txt the corruption check
+    assert summary['short_circuited_count'] == 3
+    assert list(summary['results'][str(garbled)]['quality_metrics']) == ['corruption']
+    clean = summary['results'][str(tmp_path / "extracted" / "doc0.txt")]
+    assert list(clean['quality_metrics']) == list(DETECTOR_ORDER)
+
+
+def test_process_directory_pool_matches_serial(tmp_path):
+    _write_docs(tmp_path / "extracted")
+    qc = QualityControl()
+    serial = qc.process_directory(tmp_path / "extracted", max_workers=1)
+    pooled = qc.process_directory(tmp_path / "extracted", max_workers=2)
+
+    assert pooled['results'] == serial['results']
+    assert pooled['processed_files'] == serial['processed_files']
+
+
+def test_verdict_cache_skips_repeated_detection(tmp_path):
+    scores = {'corruption': 1.0, 'machine_translation': 1.0, 'language_detection': 1.0}
+    qc = QualityControl(verdict_cache=tmp_path / "verdicts.sqlite")
+    calls = _fake_detectors(qc, scores)
+    first = qc.check_quality("some text", {})
+    second = qc.check_quality("some text", {})
+
+    assert len(calls) == 3
+    assert first['cached_verdicts'] == []
+    assert sorted(second['cached_verdicts']) == sorted(scores)
+    assert second['quality_metrics'] == first['quality_metrics']
+
+    qc._detector_versions['corruption'] = 'changed'
+    qc.check_quality("some text", {})
+    assert calls[3:] == ['corruption']
+
+
+def test_project_passes_share_one_verdict_store(tmp_path):
+    project = types.SimpleNamespace(get=lambda key: None, get_processed_dir=lambda: str(tmp_path / "processed"))
+    path = project_verdict_cache(project)
+    assert path == tmp_path / "processed" / "verdict_cache.sqlite"
+
+    scores = {'corruption': 1.0, 'machine_translation': 1.0, 'language_detection': 1.0}
+    first = QualityControl(verdict_cache=path)
+    _fake_detectors(first, scores)
+    first.check_quality("some text", {})
+    second = QualityControl(verdict_cache=path)
+    calls = _fake_detectors(second, scores)
+
+    assert sorted(second.check_quality("some text", {})['cached_verdicts']) == sorted(scores)
+    assert calls == []
+
+
+def test_iter_text_windows_cuts_at_line_breaks():
+    from shared_tools.utils.extractor_utils import iter_text_windows
+
+    text = "first line\nsecond line here\n" + "word " * 10 + "x" * 30
+    windows = list(iter_text_windows([text[i:i + 3] for i in range(0, len(text), 3)], window_chars=20))
+    assert ''.join(windows) == text
+    assert all(len(w) <= 20 for w in windows)
+    assert windows[0] == "first line\n"
+    assert list(iter_text_windows(text=text, window_chars=20)) == windows
+
+
+def test_iter_text_windows_takes_one_explicit_source(tmp_path):
+    from shared_tools.utils.extractor_utils import iter_text_windows
+
+    path = tmp_path / "doc.txt"
+    path.write_text("one line\n", encoding="utf-8")
+    assert list(iter_text_windows(path=path)) == list(iter_text_windows(path=str(path))) == ["one line\n"]
+    with pytest.raises(TypeError):
+        iter_text_windows(str(path))
+    with pytest.raises(ValueError):
+        iter_text_windows(["a"], text="b")
+
+
+def test_large_files_are_scored_in_windows(tmp_path):
+    path = tmp_path / "big.txt"
+    path.write_text("A plain sentence about token markets.\n" * 200, encoding="utf-8")
+    qc = QualityControl(verdict_cache=tmp_path / "verdicts.sqlite")
+    qc.config['min_token_count'] = 10
+    whole = qc.check_quality(path.read_text(encoding="utf-8"), {})
+
+    streamed = qc.assess_file_stream(path, {})
+    assert streamed['quality_metrics'] == whole['quality_metrics']
+    # Streamed MT and language verdicts are approximations, stored apart from whole-text ones
+    assert streamed['cached_verdicts'] == ['corruption']
+    assert sorted(qc.assess_file_stream(path, {})['cached_verdicts']) == sorted(whole['quality_metrics'])
+    assert sorted(qc.check_quality(path.read_text(encoding="utf-8"), {})['cached_verdicts']) == sorted(whole['quality_metrics'])
+
+    uncached = QualityControl()
+    uncached.config['min_token_count'] = 10
+    assert uncached.assess_file_stream(path, {})['quality_metrics'] == whole['quality_metrics']
+    assert uncached.assess_file_stream(path, {'token_count': 3})['short_circuit'] == "token count 3 below 10"
@@ -1,9 +1,13 @@
 # File: tests/unit/test_quality_control_wrapper.py
 
 import pytest
+import yaml
 from unittest.mock import MagicMock, patch
 from PySide6.QtCore import Qt
-from shared_tools.ui_wrappers.processors.quality_control_wrapper import QualityControlWrapper
+from shared_tools.project_config import ProjectConfig
+from shared_tools.processors.quality_control import project_verdict_cache
+from shared_tools.processors.verdict_cache import VerdictCache, content_hash
+from shared_tools.ui_wrappers.processors.quality_control_wrapper import QualityControlWrapper, QCWorkerThread
 
 class TestQualityControlWrapper:
     """Unit tests for the QualityControlWrapper class."""
@@ -95,3 +99,32 @@ class TestQualityControlWrapper:
         assert wrapper._is_running == False
         wrapper.batch_completed.emit.assert_called_once_with(results)
         wrapper.status_updated.emit.assert_called_once()
+
+
+def test_worker_uses_project_verdict_store(qapp, tmp_path, monkeypatch):
+    processed = tmp_path / "corpus" / "processed"
+    monkeypatch.setenv("PROCESSED_DIR", str(processed))
+    cfg_path = tmp_path / "cfg.yaml"
+    cfg_path.write_text(yaml.safe_dump({
+        "environment": {"active": "test"},
+        "environments": {"test": {"corpus_dir": str(tmp_path / "corpus")}},
+    }))
+    config = ProjectConfig(str(cfg_path))
+    doc = tmp_path / "doc.txt"
+    text = "The market maker quotes both sides of the order book. " * 40
+    doc.write_text(text, encoding="utf-8")
+
+    runs = []
+    for _ in range(2):
+        wrapper = QualityControlWrapper(config)
+        worker = QCWorkerThread(wrapper.processor, [str(doc)])
+        worker.processing_completed.connect(runs.append)
+        worker.run()
+
+    assert [run["success_count"] for run in runs] == [1, 1]
+    first, second = (run["processed_files"][0] for run in runs)
+    assert first["cached_verdicts"] == []
+    assert sorted(second["cached_verdicts"]) == ["corruption", "language_detection", "machine_translation"]
+    assert second["quality_score"] == first["quality_score"]
+    store = VerdictCache(project_verdict_cache(config))
+    assert store.get(content_hash(text), "corruption", wrapper.processor._detector_versions["corruption"]) is not None
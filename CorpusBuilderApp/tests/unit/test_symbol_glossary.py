@@ -0,0 +1,70 @@
+from shared_tools.processors.symbol_glossary import SymbolGlossary, lookup_symbols
+
+DOCS = [
+    "We trade BTC/USD perpetuals and hedge with ETH. Volatility σ rose 2.5% while the P/E held.",
+    "ETH funding on BTC/USD was $1,250.00 higher; σ and β are estimated daily.",
+    "The TVL of the AMM pool grew while ETH fees fell.",
+]
+
+
+def _write_docs(directory, copies=1):
+    for copy in range(copies):
+        for i, doc in enumerate(DOCS):
+            (directory / f"doc{copy}_{i}.txt").write_text(doc, encoding="utf-8")
+
+
+def _counts(glossary):
+    return {
+        symbol: (glossary.occurrences[symbol, symbol_type], glossary.doc_frequency[symbol, symbol_type])
+        for symbol, symbol_type in glossary.occurrences
+    }
+
+
+def test_counts_occurrences_and_documents(tmp_path):
+    _write_docs(tmp_path)
+    glossary = SymbolGlossary()
+    assert glossary.scan_directory(tmp_path) == 3
+
+    counts = _counts(glossary)
+    assert counts["ETH"] == (3, 3)
+    assert counts["σ"] == (2, 2)
+    assert counts["BTC/USD"] == (2, 2)
+    # Pair legs are not counted separately, numeric literals are left out
+    assert "USD" not in counts
+    assert not any(symbol in counts for symbol in ("2.5%", "$1,250.00"))
+    assert glossary.occurrences["BTC/USD", "currency_pair"] == 2
+
+
+def test_parallel_scan_matches_sequential(tmp_path):
+    _write_docs(tmp_path, copies=5)
+    sequential = SymbolGlossary()
+    sequential.scan_directory(tmp_path)
+    parallel = SymbolGlossary()
+    assert parallel.scan_directory(tmp_path, max_workers=2, batch_files=4) == 15
+
+    assert parallel.occurrences == sequential.occurrences
+    assert parallel.doc_frequency == sequential.doc_frequency
+
+
+def test_pruning_keeps_most_frequent_symbols():
+    glossary = SymbolGlossary(max_symbols=2)
+    for doc in DOCS:
+        glossary.add_document(doc)
+    assert len(glossary.occurrences) <= 4
+    assert glossary.pruned_symbols > 0
+    assert ("ETH", "crypto_symbol") in glossary.occurrences
+
+
+def test_saved_glossary_is_queryable(tmp_path):
+    _write_docs(tmp_path)
+    glossary = SymbolGlossary()
+    glossary.scan_directory(tmp_path)
+    summary = glossary.save(tmp_path / "glossary.sqlite")
+
+    assert summary["documents_scanned"] == 3
+    assert summary["distinct_symbols"] == len(glossary.occurrences)
+    [eth] = lookup_symbols(tmp_path / "glossary.sqlite", symbol="ETH")
+    assert (eth["occurrences"], eth["documents"]) == (3, 3)
+    [pair] = lookup_symbols(tmp_path / "glossary.sqlite", symbol_type="currency_pair")
+    assert pair["symbol"] == "BTC/USD"
+    assert pair["definition"].startswith("Currency pair:")
@@ -0,0 +1,49 @@
+import pickle
+
+from shared_tools.processors.corruption_detector import CorruptionDetector
+from shared_tools.processors.verdict_cache import VerdictCache, content_hash, detector_version
+
+
+def test_verdicts_persist_per_version(tmp_path):
+    path = tmp_path / "verdicts.sqlite"
+    cache = VerdictCache(path)
+    digest = content_hash("some document")
+    cache.put(digest, "corruption", "v1", {'score': 0.9})
+    cache.close()
+
+    reopened = VerdictCache(path)
+    assert reopened.get(digest, "corruption", "v1") == {'score': 0.9}
+    assert reopened.get(digest, "corruption", "v2") is None
+    assert reopened.get(content_hash("other document"), "corruption", "v1") is None
+    assert reopened.stats['hits'] == 1
+    assert reopened.stats['misses'] == 2
+
+
+def test_get_or_compute_and_purge(tmp_path):
+    cache = VerdictCache(tmp_path / "verdicts.sqlite")
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {'score': 0.5}
+
+    for _ in range(3):
+        assert cache.get_or_compute("abc", "language_detection", "v1", compute) == {'score': 0.5}
+    assert len(calls) == 1
+
+    cache.put("def", "language_detection", "v0", {'score': 0.1})
+    assert cache.purge_stale({'language_detection': 'v1'}) == 1
+    assert cache.get("abc", "language_detection", "v1") == {'score': 0.5}
+
+
+def test_cache_pickles_without_connection(tmp_path):
+    cache = VerdictCache(tmp_path / "verdicts.sqlite")
+    cache.put("abc", "corruption", "v1", {'score': 1.0})
+    copy = pickle.loads(pickle.dumps(cache))
+    assert copy.get("abc", "corruption", "v1") == {'score': 1.0}
+
+
+def test_detector_version_follows_config():
+    base = detector_version(CorruptionDetector())
+    assert base == detector_version(CorruptionDetector())
+    assert base != detector_version(CorruptionDetector(config={**CorruptionDetector()._get_default_config(), 'min_text_length': 5}))
@@ -0,0 +1,82 @@
+"""Benchmark full-scan vs bounded-region academic paper detection as papers grow."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+from pathlib import Path
+from typing import Iterable, List
+
+from shared_tools.processors.financial_symbol_processor import AcademicPaperProcessor
+
+logger = logging.getLogger(__name__)
+
+HEAD = (
+    "Abstract\nWe study funding rates on perpetual swaps.\n\n1. Introduction\n"
+    "Prior work (Smith et al., 2021) documents the basis [1], [2].\n\n2. Methodology\n"
+)
+PARAGRAPH = (
+    "The perpetual swap market is liquid and prices move quickly after funding payments. "
+    "We estimate the model with hourly returns (2022) and compare it with the spot index.\n"
+)
+TAIL = "\n4. Results\nFunding predicts returns.\n\n5. Conclusion\nFunding matters.\n\nReferences\n" + "".join(
+    f"[{i}] Author {i}. Title of the paper. doi: 10.{1000 + i}/x (2020)\n" for i in range(1, 60)
+)
+
+
+def build_paper(megabytes: float) -> str:
+    repeats = max(1, int(megabytes * 2**20 / len(PARAGRAPH)))
+    return HEAD + PARAGRAPH * repeats + TAIL
+
+
+def _time(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def run_benchmark(papers: List[str], repeat: int = 3) -> List[dict]:
+    processor = AcademicPaperProcessor()
+    rows = []
+    for text in papers:
+        full = processor.detect_academic_paper(text, {}, bounded=False)
+        bounded = processor.detect_academic_paper(text, {}, bounded=True)
+        rows.append({
+            "mb": len(text) / 2**20,
+            "same_verdict": full["is_academic_paper"] == bounded["is_academic_paper"],
+            "full_ms": _time(lambda text=text: processor.detect_academic_paper(text, {}, bounded=False), repeat) * 1000,
+            "bounded_ms": _time(lambda text=text: processor.detect_academic_paper(text, {}, bounded=True), repeat) * 1000,
+        })
+    return rows
+
+
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare full-scan and bounded academic paper detection")
+    parser.add_argument("--input-dir", help="Directory of extracted .txt files (default: synthetic papers)")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[0.25, 1, 4, 16], help="Synthetic paper sizes in MB")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per paper")
+    return parser.parse_args(list(argv) if argv is not None else None)
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s", force=True)
+    if args.input_dir:
+        papers = [
+            p.read_text(encoding="utf-8", errors="ignore")
+            for p in sorted(Path(args.input_dir).rglob("*.txt"))
+        ]
+    else:
+        papers = [build_paper(size) for size in args.sizes]
+    logger.info("%10s %14s %10s %12s", "size_mb", "same_verdict", "full_ms", "bounded_ms")
+    for row in run_benchmark(papers, args.repeat):
+        logger.info("%10.2f %14s %10.1f %12.2f", row["mb"], row["same_verdict"], row["full_ms"], row["bounded_ms"])
+
+
+if __name__ == "__main__":
+    main()
+
+# Example usage:
+# PYTHONPATH=CorpusBuilderApp python -m tools.benchmarks.academic_detection --sizes 1 8 32
@@ -0,0 +1,63 @@
+"""Benchmark whole-text vs chunked (optionally parallel) financial symbol extraction."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Iterable, List
+
+from shared_tools.processors.financial_symbol_processor import FinancialSymbolProcessor, MemoryOptimizer
+from tools.benchmarks.symbol_extraction import build_papers
+
+logger = logging.getLogger(__name__)
+
+
+def run_benchmark(text: str, chunk_size: int, workers: List[int]) -> List[dict]:
+    processor = FinancialSymbolProcessor()
+    start = time.perf_counter()
+    whole = processor.extract_symbols(text)
+    rows = [{"mode": "whole", "workers": 1, "seconds": time.perf_counter() - start, "identical": True}]
+    for count in workers:
+        optimizer = MemoryOptimizer(chunk_size=chunk_size, max_workers=count)
+        start = time.perf_counter()
+        chunked = optimizer.process_large_text_in_chunks(text, processor.extract_symbols)
+        rows.append({
+            "mode": "chunked",
+            "workers": count,
+            "seconds": time.perf_counter() - start,
+            "identical": (chunked["symbols_by_position"] == whole["symbols_by_position"]
+                          and chunked["preservation_map"] == whole["preservation_map"]),
+        })
+    return rows
+
+
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare whole-text and chunked symbol extraction")
+    parser.add_argument("--file", help="Extracted .txt file (default: synthetic document)")
+    parser.add_argument("--docs", type=int, default=200, help="Synthetic papers joined into one document")
+    parser.add_argument("--chunk-size", type=int, default=1_000_000, help="Characters per chunk")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, os.cpu_count() or 1], help="Worker counts to try")
+    return parser.parse_args(list(argv) if argv is not None else None)
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s", force=True)
+    if args.file:
+        text = Path(args.file).read_text(encoding="utf-8", errors="ignore")
+    else:
+        text = "\n".join(build_papers(args.docs, 8000))
+    logger.info("document: %.1f MB, cpus: %s", len(text) / 2**20, os.cpu_count())
+    logger.info("%8s %8s %10s %10s", "mode", "workers", "seconds", "identical")
+    for row in run_benchmark(text, args.chunk_size, args.workers):
+        logger.info("%8s %8d %10.3f %10s", row["mode"], row["workers"], row["seconds"], row["identical"])
+
+
+if __name__ == "__main__":
+    main()
+
+# Example usage:
+# PYTHONPATH=CorpusBuilderApp:. python -m tools.benchmarks.chunked_symbols --file ~/crypto_corpus/processed/_extracted/large_dump.txt --workers 1 4 8
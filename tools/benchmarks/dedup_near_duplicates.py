@@ -0,0 +1,131 @@
+"""Benchmark MinHash vs SimHash near-duplicate detection on a synthetic corpus."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import time
+from itertools import combinations
+from typing import Dict, Iterable, List, Set, Tuple
+
+from shared_tools.processors.deduplicator import Deduplicator
+
+logger = logging.getLogger(__name__)
+
+_LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def build_corpus(
+    num_docs: int,
+    num_near_dups: int,
+    doc_words: int,
+    edit_rate: float,
+    seed: int = 7,
+) -> Tuple[Dict[str, str], Set[frozenset]]:
+    """Return ``(texts, positive_pairs)`` with planted near-duplicates.
+
+    Each planted document copies a random original and replaces
+    ``edit_rate`` of its words. Documents derived from the same original
+    form one cluster; every pair inside a cluster is a positive.
+    """
+    rng = random.Random(seed)
+    vocab = [
+        "".join(rng.choice(_LETTERS) for _ in range(rng.randint(3, 9)))
+        for _ in range(5000)
+    ]
+    texts: Dict[str, str] = {}
+    cluster: Dict[str, int] = {}
+    for i in range(num_docs):
+        texts[f"doc{i}"] = " ".join(rng.choice(vocab) for _ in range(doc_words))
+        cluster[f"doc{i}"] = i
+    for j in range(num_near_dups):
+        source = rng.randrange(num_docs)
+        words = texts[f"doc{source}"].split()
+        for _ in range(max(1, int(len(words) * edit_rate))):
+            words[rng.randrange(len(words))] = rng.choice(vocab)
+        texts[f"dup{j}"] = " ".join(words)
+        cluster[f"dup{j}"] = source
+
+    members: Dict[int, List[str]] = {}
+    for doc_id, cid in cluster.items():
+        members.setdefault(cid, []).append(doc_id)
+    positives = {
+        frozenset(pair)
+        for docs in members.values()
+        for pair in combinations(docs, 2)
+    }
+    return texts, positives
+
+
+def score_groups(groups: List[List[str]], positives: Set[frozenset]) -> Tuple[float, float]:
+    """Return pairwise ``(precision, recall)`` of duplicate groups."""
+    found = {frozenset(pair) for group in groups for pair in combinations(group, 2)}
+    true_pos = len(found & positives)
+    precision = true_pos / len(found) if found else 1.0
+    recall = true_pos / len(positives) if positives else 1.0
+    return precision, recall
+
+
+def run_benchmark(texts: Dict[str, str], positives: Set[frozenset], threshold: float, max_distance: int) -> List[dict]:
+    """Run both near-duplicate paths over ``texts`` and collect metrics."""
+    dedup = Deduplicator.__new__(Deduplicator)
+    dedup.similarity_threshold = threshold
+    dedup.simhash_max_distance = max_distance
+
+    results = []
+    for method, grouper in (
+        ("simhash", dedup._group_by_simhash),
+        ("minhash", dedup._group_by_minhash),
+    ):
+        start = time.perf_counter()
+        try:
+            groups = grouper(texts)
+        except ImportError as exc:
+            logger.warning("Skipping %s: %s", method, exc)
+            continue
+        elapsed = time.perf_counter() - start
+        precision, recall = score_groups(groups, positives)
+        results.append({
+            "method": method,
+            "precision": precision,
+            "recall": recall,
+            "seconds": elapsed,
+            "docs_per_second": len(texts) / elapsed if elapsed else float("inf"),
+        })
+    return results
+
+
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare MinHash and SimHash near-duplicate detection")
+    parser.add_argument("--docs", type=int, default=1000, help="Number of original documents")
+    parser.add_argument("--near-dups", type=int, default=500, help="Number of planted near-duplicates")
+    parser.add_argument("--words", type=int, default=150, help="Words per document")
+    parser.add_argument("--edit-rate", type=float, default=0.02, help="Fraction of words changed per near-duplicate")
+    parser.add_argument("--similarity-threshold", type=float, default=0.8, help="MinHash Jaccard threshold")
+    parser.add_argument("--max-distance", type=int, default=6, help="SimHash Hamming distance threshold")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed")
+    return parser.parse_args(list(argv) if argv is not None else None)
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s", force=True)
+    texts, positives = build_corpus(args.docs, args.near_dups, args.words, args.edit_rate, args.seed)
+    logger.info("Corpus: %d documents, %d positive pairs", len(texts), len(positives))
+    for row in run_benchmark(texts, positives, args.similarity_threshold, args.max_distance):
+        logger.info(
+            "%-8s precision=%.3f recall=%.3f time=%.2fs throughput=%.0f docs/s",
+            row["method"],
+            row["precision"],
+            row["recall"],
+            row["seconds"],
+            row["docs_per_second"],
+        )
+
+
+if __name__ == "__main__":
+    main()
+
+# Example usage:
+# PYTHONPATH=CorpusBuilderApp python -m tools.benchmarks.dedup_near_duplicates --docs 2000 --near-dups 1000
@@ -0,0 +1,100 @@
+"""Benchmark formula scoring with and without the shared formula feature cache."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterable, List
+
+from shared_tools.processors.formula_cache import FormulaFeatureCache
+from shared_tools.processors.formula_extractor import FormulaExtractor
+from tools.benchmarks.formula_scan import FORMULAS, WORDS
+
+logger = logging.getLogger(__name__)
+
+
+def _unique_formula(rng: random.Random) -> str:
+    i, j, k = rng.randint(1, 999), rng.randint(1, 99), rng.randint(2, 9)
+    return rf"$\frac{{x_{{{i}}}}}{{\sigma_{{{j}}}}} + \beta_{{{j}}} y^{{{k}}}$"
+
+
+def build_papers(num_docs: int, words_per_doc: int, seed: int = 23,
+                 formula_rate: float = 0.08, unique_rate: float = 0.3) -> List[str]:
+    """Papers whose formulas are common across the corpus, or with probability ``unique_rate`` one-offs."""
+    rng = random.Random(seed)
+    docs = []
+    for _ in range(num_docs):
+        words = []
+        for _ in range(words_per_doc):
+            if rng.random() >= formula_rate:
+                words.append(rng.choice(WORDS))
+            elif rng.random() < unique_rate:
+                words.append(_unique_formula(rng))
+            else:
+                words.append(rng.choice(FORMULAS))
+        docs.append(" ".join(words))
+    return docs
+
+
+def _run(documents: List[str], cache: FormulaFeatureCache) -> float:
+    """Score every document with a fresh extractor, as the PDF pipeline does."""
+    start = time.perf_counter()
+    for doc in documents:
+        FormulaExtractor(metadata_cache=cache).extract(doc)
+    cache.flush()
+    return time.perf_counter() - start
+
+
+def run_benchmark(documents: List[str]) -> dict:
+    uncached = _run(documents, FormulaFeatureCache(max_entries=0))
+    memory = FormulaFeatureCache()
+    cached = _run(documents, memory)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "formula_features.sqlite"
+        _run(documents, FormulaFeatureCache(path))
+        warm = FormulaFeatureCache(path)
+        persisted = _run(documents, warm)
+    return {
+        "documents": len(documents),
+        "uncached_seconds": uncached,
+        "cached_seconds": cached,
+        "cached_hit_rate": memory.stats["hit_rate"],
+        "warm_persisted_seconds": persisted,
+        "warm_hit_rate": warm.stats["hit_rate"],
+        "speedup": uncached / cached,
+    }
+
+
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare formula scoring with and without the feature cache")
+    parser.add_argument("--input-dir", help="Directory of extracted .txt files (default: synthetic papers)")
+    parser.add_argument("--docs", type=int, default=200, help="Number of synthetic papers")
+    parser.add_argument("--words", type=int, default=3000, help="Words per synthetic paper")
+    parser.add_argument("--unique-rate", type=float, default=0.3, help="Share of synthetic formulas that occur once")
+    parser.add_argument("--seed", type=int, default=23, help="Random seed")
+    return parser.parse_args(list(argv) if argv is not None else None)
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s", force=True)
+    if args.input_dir:
+        documents = [
+            p.read_text(encoding="utf-8", errors="ignore")
+            for p in sorted(Path(args.input_dir).rglob("*.txt"))
+        ]
+    else:
+        documents = build_papers(args.docs, args.words, args.seed, unique_rate=args.unique_rate)
+    for key, value in run_benchmark(documents).items():
+        logger.info("%-24s %s", key, f"{value:.3f}" if isinstance(value, float) else value)
+
+
+if __name__ == "__main__":
+    main()
+
+# Example usage:
+# PYTHONPATH=CorpusBuilderApp:. python -m tools.benchmarks.formula_metadata --input-dir ~/crypto_corpus/processed/_extracted/papers
@@ -0,0 +1,120 @@
+"""Benchmark per-pattern vs single-alternation LaTeX formula extraction on math-heavy text."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import re
+import time
+from pathlib import Path
+from typing import Callable, Iterable, List
+
+from shared_tools.processors.formula_extractor import FormulaExtractor
+
+logger = logging.getLogger(__name__)
+
+WORDS = (
+    "we define the estimator under the measure and show that the process converges "
+    "for every horizon where returns follow a diffusion with drift and volatility"
+).split()
+FORMULAS = (
+    r"$\alpha + \beta x_t$",
+    r"$$\sum_{i=1}^{n} w_i r_i$$",
+    "\\begin{equation}\n\\sigma_t^2 = \\omega + \\alpha \\epsilon_{t-1}^2 + \\beta \\sigma_{t-1}^2\n\\end{equation}",
+    "\\begin{align*}\nE[R] &= r_f + \\beta (E[R_m] - r_f) \\\\\n\\mathrm{Var}(R) &= \\beta^2 \\sigma_m^2\n\\end{align*}",
+    r"\(\frac{dS}{S} = \mu dt + \sigma dW\)",
+    r"\[\int_0^T e^{-rt} dt\]",
+    r"\lambda", r"\theta", "P(X > x)", "E[X_t]", "Var(R_p)", "Corr(X, Y)",
+    "12.5%", "$1,250.00", "1.2e-4", "3:1", "1/2", "σ²", "R_{t+1}", "dS/dt",
+)
+
+
+def build_papers(num_docs: int, words_per_doc: int, seed: int = 17, formula_rate: float = 0.08) -> List[str]:
+    rng = random.Random(seed)
+    docs = []
+    for _ in range(num_docs):
+        words = [rng.choice(FORMULAS) if rng.random() < formula_rate else rng.choice(WORDS)
+                 for _ in range(words_per_doc)]
+        docs.append(" ".join(words))
+    return docs
+
+
+def per_pattern(extractor: FormulaExtractor, text: str) -> list:
+    """_extract_latex as it was: one re.finditer pass per pattern string."""
+    formulas = []
+    for pattern_name, pattern in extractor.formula_patterns.items():
+        for match in re.finditer(pattern, text, re.DOTALL | re.IGNORECASE):
+            formula_text = match.group(1) if match.groups() else match.group(0)
+            if not extractor._validate_formula(formula_text, pattern_name):
+                continue
+            formulas.append({
+                'formula': formula_text.strip(),
+                'type': pattern_name,
+                'position': {'start': match.start(), 'end': match.end()},
+                'context': "",
+                'confidence': extractor._calculate_confidence(formula_text, pattern_name),
+                'metadata': extractor._extract_formula_metadata(formula_text, pattern_name),
+            })
+    formulas = extractor._deduplicate_formulas(formulas)
+    formulas.sort(key=lambda x: x['position']['start'])
+    return formulas
+
+
+def _time(func: Callable[[str], list], documents: List[str], repeat: int):
+    """Return the results and the best wall time over ``repeat`` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [func(doc) for doc in documents]
+        best = min(best, time.perf_counter() - start)
+    return results, best
+
+
+def run_benchmark(documents: List[str], repeat: int = 3) -> dict:
+    extractor = FormulaExtractor()
+    legacy, legacy_seconds = _time(lambda doc: per_pattern(extractor, doc), documents, repeat)
+    single, single_seconds = _time(extractor._extract_latex, documents, repeat)
+    chars = sum(len(doc) for doc in documents)
+    return {
+        "documents": len(documents),
+        "per_pattern_formulas": sum(len(r) for r in legacy),
+        "single_pass_formulas": sum(len(r) for r in single),
+        "per_pattern_seconds": legacy_seconds,
+        "single_pass_seconds": single_seconds,
+        "per_pattern_mb_per_s": chars / 2**20 / legacy_seconds,
+        "single_pass_mb_per_s": chars / 2**20 / single_seconds,
+        "speedup": legacy_seconds / single_seconds,
+    }
+
+
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare per-pattern and single-pass formula extraction")
+    parser.add_argument("--input-dir", help="Directory of extracted .txt files, e.g. arXiv sources (default: synthetic papers)")
+    parser.add_argument("--docs", type=int, default=30, help="Number of synthetic papers")
+    parser.add_argument("--words", type=int, default=6000, help="Words per synthetic paper")
+    parser.add_argument("--formula-rate", type=float, default=0.08, help="Share of synthetic words that are formulas")
+    parser.add_argument("--seed", type=int, default=17, help="Random seed")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per variant; the best is reported")
+    return parser.parse_args(list(argv) if argv is not None else None)
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s", force=True)
+    if args.input_dir:
+        documents = [
+            p.read_text(encoding="utf-8", errors="ignore")
+            for p in sorted(Path(args.input_dir).rglob("*.txt"))
+        ]
+    else:
+        documents = build_papers(args.docs, args.words, args.seed, args.formula_rate)
+    for key, value in run_benchmark(documents, args.repeat).items():
+        logger.info("%-22s %s", key, f"{value:.3f}" if isinstance(value, float) else value)
+
+
+if __name__ == "__main__":
+    main()
+
+# Example usage:
+# PYTHONPATH=CorpusBuilderApp:. python -m tools.benchmarks.formula_scan --input-dir ~/crypto_corpus/processed/_extracted/papers
@@ -0,0 +1,119 @@
+"""Benchmark chart image extraction with and without the image analysis cache."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import time
+from io import BytesIO
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Iterable, List
+
+import fitz  # PyMuPDF
+import numpy as np
+from PIL import Image
+
+from shared_tools.processors.chart_image_extractor import ChartImageExtractor
+from shared_tools.processors.image_analysis_cache import ImageAnalysisCache
+
+logger = logging.getLogger(__name__)
+
+
+def _png(rng: random.Random, size: int = 480) -> bytes:
+    """A noisy line-chart-like image, so quality and chart analysis do real work."""
+    pixels = np.full((size, size), 255, dtype=np.uint8)
+    level = size // 2
+    for x in range(size):
+        level = min(size - 1, max(0, level + rng.randint(-6, 6)))
+        pixels[level, x] = 0
+    pixels[size - 20, :] = 0
+    pixels[:, 20] = 0
+    buffer = BytesIO()
+    Image.fromarray(pixels).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def build_pages(num_pages: int, images_per_page: int = 3, recurring: int = 5,
+                recurring_rate: float = 0.7, seed: int = 31) -> List[SimpleNamespace]:
+    """Pages whose images are, with probability ``recurring_rate``, one of a few recurring logos and figures."""
+    rng = random.Random(seed)
+    shared = [_png(rng) for _ in range(recurring)]
+    images = {}
+    pages = []
+    for _ in range(num_pages):
+        xrefs = []
+        for _ in range(images_per_page):
+            xref = len(images) + 1
+            images[xref] = rng.choice(shared) if rng.random() < recurring_rate else _png(rng)
+            xrefs.append(xref)
+        pages.append(xrefs)
+    document = SimpleNamespace(extract_image=lambda xref: {"image": images[xref], "ext": "png"})
+    return [SimpleNamespace(get_images=lambda xrefs=xrefs: [(x,) for x in xrefs], parent=document)
+            for xrefs in pages]
+
+
+def _run(pages: List, cache: ImageAnalysisCache, ocr: bool) -> float:
+    config = dict(ChartImageExtractor()._get_default_config(), ocr_enabled=ocr, extract_text_from_images=ocr)
+    extractor = ChartImageExtractor(config=config, analysis_cache=cache)
+    start = time.perf_counter()
+    for page_num, page in enumerate(pages):
+        extractor._extract_page_images(page, page_num, "bench.pdf", None)
+    return time.perf_counter() - start
+
+
+def _run_pdfs(paths: List[Path], cache: ImageAnalysisCache, ocr: bool) -> float:
+    config = dict(ChartImageExtractor()._get_default_config(), ocr_enabled=ocr, extract_text_from_images=ocr)
+    start = time.perf_counter()
+    for path in paths:
+        with fitz.open(path) as doc:
+            extractor = ChartImageExtractor(config=config, analysis_cache=cache)
+            for page_num in range(len(doc)):
+                extractor._extract_page_images(doc.load_page(page_num), page_num, str(path), None)
+    return time.perf_counter() - start
+
+
+def run_benchmark(pages: List | None = None, pdfs: List[Path] | None = None, ocr: bool = False) -> dict:
+    run = (lambda cache: _run_pdfs(pdfs, cache, ocr)) if pdfs else (lambda cache: _run(pages, cache, ocr))
+    uncached = run(ImageAnalysisCache(max_entries=0))
+    cache = ImageAnalysisCache()
+    cached = run(cache)
+    return {
+        "pages": len(pages) if pages else None,
+        "documents": len(pdfs) if pdfs else None,
+        "uncached_seconds": uncached,
+        "cached_seconds": cached,
+        "hit_rate": cache.stats["hit_rate"],
+        "speedup": uncached / cached,
+    }
+
+
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare image analysis with and without the content-hash cache")
+    parser.add_argument("--input-dir", help="Directory of PDFs (default: synthetic pages)")
+    parser.add_argument("--pages", type=int, default=200, help="Number of synthetic pages")
+    parser.add_argument("--recurring-rate", type=float, default=0.7, help="Share of synthetic images that recur")
+    parser.add_argument("--ocr", action="store_true", help="Include OCR (needs tesseract)")
+    parser.add_argument("--seed", type=int, default=31, help="Random seed")
+    return parser.parse_args(list(argv) if argv is not None else None)
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s", force=True)
+    if args.input_dir:
+        result = run_benchmark(pdfs=sorted(Path(args.input_dir).rglob("*.pdf")), ocr=args.ocr)
+    else:
+        pages = build_pages(args.pages, recurring_rate=args.recurring_rate, seed=args.seed)
+        result = run_benchmark(pages=pages, ocr=args.ocr)
+    for key, value in result.items():
+        if value is not None:
+            logger.info("%-18s %s", key, f"{value:.3f}" if isinstance(value, float) else value)
+
+
+if __name__ == "__main__":
+    main()
+
+# Example usage:
+# PYTHONPATH=CorpusBuilderApp:. python -m tools.benchmarks.image_analysis_cache --input-dir ~/crypto_corpus/raw/reports --ocr
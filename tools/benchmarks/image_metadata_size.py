@@ -0,0 +1,131 @@
+"""Benchmark metadata size and scan time with embedded base64 thumbnails vs blob store references."""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterable, List
+
+from shared_tools.processors.blob_store import BlobStore
+
+logger = logging.getLogger(__name__)
+
+
+def _record(index: int, page: int) -> dict:
+    """An image record as ChartImageExtractor returns it, without the thumbnail."""
+    return {
+        "id": f"report_p{page}_img{index}",
+        "page": page,
+        "type": "raster_image",
+        "format": "png",
+        "size": [640, 480],
+        "quality_score": 0.82,
+        "ocr_text": "price volatility 2021 2022 2023",
+        "is_chart": True,
+        "chart_type": "line_chart",
+        "chart_confidence": 0.7,
+        "contains_financial_content": True,
+        "metadata": {"source": "raster_image", "chart_type": "line_chart", "chart_confidence": 0.7},
+    }
+
+
+def build_documents(num_docs: int, images_per_doc: int, thumbnail_bytes: int = 12_000,
+                    recurring_rate: float = 0.5, seed: int = 37) -> List[List[tuple]]:
+    """Per document, (record, thumbnail PNG bytes) pairs; some thumbnails recur across documents."""
+    rng = random.Random(seed)
+
+    def thumbnail() -> bytes:
+        return rng.getrandbits(8 * thumbnail_bytes).to_bytes(thumbnail_bytes, "little")
+
+    shared = [thumbnail() for _ in range(8)]
+    return [
+        [(_record(i, i // 3 + 1),
+          rng.choice(shared) if rng.random() < recurring_rate else thumbnail())
+         for i in range(images_per_doc)]
+        for _ in range(num_docs)
+    ]
+
+
+def _write(documents: List[List[tuple]], directory: Path, store: BlobStore | None) -> int:
+    total = 0
+    for n, images in enumerate(documents):
+        records = []
+        for record, thumbnail in images:
+            if store is None:
+                record = dict(record, base64_thumbnail=base64.b64encode(thumbnail).decode("utf-8"), thumbnail_ref=None)
+            else:
+                record = dict(record, base64_thumbnail=None, thumbnail_ref=store.put(thumbnail, "png"))
+            records.append(record)
+        path = directory / f"doc_{n:05d}.json"
+        path.write_text(json.dumps({"images": records}, indent=2), encoding="utf-8")
+        total += path.stat().st_size
+    return total
+
+
+def _scan(directory: Path, repeat: int) -> float:
+    """Best time to load every metadata file and count charts, as corpus-wide scans do."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        charts = 0
+        for path in sorted(directory.glob("*.json")):
+            charts += sum(image["is_chart"] for image in json.loads(path.read_text(encoding="utf-8"))["images"])
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(documents: List[List[tuple]], repeat: int = 3) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        embedded_dir, ref_dir = Path(tmp) / "embedded", Path(tmp) / "refs"
+        embedded_dir.mkdir()
+        ref_dir.mkdir()
+        store = BlobStore(Path(tmp) / "blobs")
+        embedded_bytes = _write(documents, embedded_dir, None)
+        ref_bytes = _write(documents, ref_dir, store)
+        blob_bytes = sum(os.path.getsize(p) for p in store.root.rglob("*.png"))
+        embedded_seconds = _scan(embedded_dir, repeat)
+        ref_seconds = _scan(ref_dir, repeat)
+    return {
+        "documents": len(documents),
+        "embedded_metadata_mb": embedded_bytes / 2**20,
+        "ref_metadata_mb": ref_bytes / 2**20,
+        "blob_store_mb": blob_bytes / 2**20,
+        "blobs_written": store.stats["written"],
+        "blobs_reused": store.stats["reused"],
+        "embedded_scan_seconds": embedded_seconds,
+        "ref_scan_seconds": ref_seconds,
+        "scan_speedup": embedded_seconds / ref_seconds,
+    }
+
+
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare image metadata with embedded thumbnails and blob references")
+    parser.add_argument("--docs", type=int, default=300, help="Number of synthetic documents")
+    parser.add_argument("--images", type=int, default=20, help="Images per document")
+    parser.add_argument("--thumbnail-bytes", type=int, default=12_000, help="Size of each PNG thumbnail")
+    parser.add_argument("--recurring-rate", type=float, default=0.5, help="Share of thumbnails that recur")
+    parser.add_argument("--seed", type=int, default=37, help="Random seed")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed scans per variant; the best is reported")
+    return parser.parse_args(list(argv) if argv is not None else None)
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s", force=True)
+    documents = build_documents(args.docs, args.images, args.thumbnail_bytes, args.recurring_rate, args.seed)
+    for key, value in run_benchmark(documents, args.repeat).items():
+        logger.info("%-22s %s", key, f"{value:.3f}" if isinstance(value, float) else value)
+
+
+if __name__ == "__main__":
+    main()
+
+# Example usage:
+# PYTHONPATH=CorpusBuilderApp:. python -m tools.benchmarks.image_metadata_size --docs 1000
@@ -0,0 +1,116 @@
+"""Benchmark sampled vs exhaustive language detection for long documents."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from langdetect import DetectorFactory
+
+from shared_tools.processors.language_confidence_detector import detect_language_confidence
+
+logger = logging.getLogger(__name__)
+
+SENTENCES: Dict[str, List[str]] = {
+    "en": [
+        "The funding rate on perpetual swaps keeps the contract price close to the spot index",
+        "Market makers quote both sides of the order book and earn the spread over time",
+        "Liquidity providers deposit pairs of tokens into the pool and receive a share of the fees",
+        "The volatility surface of bitcoin options shows a pronounced skew towards puts",
+        "Regulators have asked exchanges to publish proof of reserves on a regular basis",
+        "High frequency strategies depend on low latency connections to the matching engine",
+        "The paper estimates the model with daily returns from the largest cryptocurrencies",
+        "Risk managers monitor margin requirements and liquidation thresholds every hour",
+    ],
+    "de": [
+        "Die Finanzierungsrate bei unbefristeten Kontrakten hält den Preis nahe am Kassakurs",
+        "Marktmacher stellen Kurse auf beiden Seiten des Orderbuchs und verdienen die Spanne",
+        "Die Aufsichtsbehörden verlangen von den Börsen regelmäßige Nachweise ihrer Reserven",
+        "Das Risikomanagement überwacht die Sicherheitsleistungen und Liquidationsschwellen",
+        "Die Studie schätzt das Modell mit täglichen Renditen der größten Kryptowährungen",
+        "Hochfrequenzstrategien hängen von sehr schnellen Verbindungen zur Handelsplattform ab",
+    ],
+    "fr": [
+        "Le taux de financement des contrats perpétuels maintient le prix proche de l'indice",
+        "Les teneurs de marché affichent des prix des deux côtés du carnet d'ordres",
+        "Les régulateurs demandent aux plateformes de publier régulièrement leurs réserves",
+        "La surface de volatilité des options sur bitcoin montre une asymétrie marquée",
+        "Les gestionnaires de risques surveillent les appels de marge toutes les heures",
+        "Cette étude estime le modèle avec les rendements quotidiens des principales cryptomonnaies",
+    ],
+}
+
+
+def build_document(rng: random.Random, sentences: int, mix: Dict[str, float]) -> str:
+    langs = list(mix)
+    weights = [mix[l] for l in langs]
+    return ". ".join(
+        rng.choice(SENTENCES[rng.choices(langs, weights)[0]]) for _ in range(sentences)
+    ) + "."
+
+
+def build_corpus(num_docs: int, sentences: int, seed: int = 7) -> List[str]:
+    """Return documents cycling through pure and mixed language profiles."""
+    rng = random.Random(seed)
+    profiles = [{"en": 1.0}, {"en": 0.7, "de": 0.3}, {"fr": 1.0}, {"en": 0.9, "fr": 0.1}]
+    return [build_document(rng, sentences, profiles[i % len(profiles)]) for i in range(num_docs)]
+
+
+def run_benchmark(documents: List[str], segment_budget: int) -> dict:
+    """Compare exhaustive and sampled detection over ``documents``."""
+    timings = {}
+    outputs = {}
+    for label, budget in (("exhaustive", None), ("sampled", segment_budget)):
+        DetectorFactory.seed = 0
+        start = time.perf_counter()
+        outputs[label] = [detect_language_confidence(doc, segment_budget=budget) for doc in documents]
+        timings[label] = time.perf_counter() - start
+
+    pairs = list(zip(outputs["exhaustive"], outputs["sampled"]))
+    return {
+        "documents": len(documents),
+        "language_agreement": sum(a["language"] == b["language"] for a, b in pairs) / len(pairs),
+        "mixed_flag_agreement": sum(a["mixed_language_flag"] == b["mixed_language_flag"] for a, b in pairs) / len(pairs),
+        "mixed_languages_agreement": sum(
+            set(a["mixed_languages"]) == set(b["mixed_languages"]) for a, b in pairs
+        ) / len(pairs),
+        "exhaustive_seconds": timings["exhaustive"],
+        "sampled_seconds": timings["sampled"],
+        "speedup": timings["exhaustive"] / timings["sampled"] if timings["sampled"] else float("inf"),
+    }
+
+
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare sampled and exhaustive language detection")
+    parser.add_argument("--input-dir", help="Directory of extracted .txt files (default: synthetic corpus)")
+    parser.add_argument("--docs", type=int, default=20, help="Synthetic documents to generate")
+    parser.add_argument("--sentences", type=int, default=1500, help="Sentences per synthetic document")
+    parser.add_argument("--segment-budget", type=int, default=64, help="Segment budget for the sampled run")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed")
+    return parser.parse_args(list(argv) if argv is not None else None)
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s", force=True)
+    if args.input_dir:
+        documents = [
+            p.read_text(encoding="utf-8", errors="ignore")
+            for p in sorted(Path(args.input_dir).rglob("*.txt"))
+        ]
+    else:
+        documents = build_corpus(args.docs, args.sentences, args.seed)
+    result = run_benchmark(documents, args.segment_budget)
+    for key, value in result.items():
+        logger.info("%-26s %s", key, f"{value:.3f}" if isinstance(value, float) else value)
+
+
+if __name__ == "__main__":
+    main()
+
+# Example usage:
+# PYTHONPATH=CorpusBuilderApp python -m tools.benchmarks.language_sampling --input-dir ~/crypto_corpus/processed/_extracted
@@ -0,0 +1,114 @@
+"""Benchmark shared vs per-heuristic tokenization in the machine-translation detector."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Iterable, List
+
+from shared_tools.processors import machine_translation_detector as mtd
+
+logger = logging.getLogger(__name__)
+
+WORDS = (
+    "the a of and in to market price rate funding perpetual index liquidity pool token "
+    "exchange order book spread volatility option margin risk was were is had walked quoting"
+).split()
+
+
+def build_documents(num_docs: int, words_per_doc: int, seed: int = 11) -> List[str]:
+    rng = random.Random(seed)
+    docs = []
+    for _ in range(num_docs):
+        sentences = []
+        remaining = words_per_doc
+        while remaining > 0:
+            length = min(remaining, rng.randint(6, 18))
+            sentences.append(" ".join(rng.choice(WORDS) for _ in range(length)))
+            remaining -= length
+        docs.append(". ".join(sentences) + ".")
+    return docs
+
+
+def independent_checks(text: str) -> list:
+    """The heuristics as called before, each tokenizing ``text`` on its own."""
+    return [
+        mtd.check_repeated_phrase(text),
+        mtd.check_ngram_repetition(text),
+        mtd.check_functional_content_ratio(text),
+        mtd.check_missing_articles(text),
+        mtd.check_rare_word_ratio(text),
+    ]
+
+
+def shared_checks(text: str) -> list:
+    features = mtd.TextFeatures.from_text(text)
+    return [
+        mtd.check_repeated_phrase(text, features=features),
+        mtd.check_ngram_repetition(text, features=features),
+        mtd.check_functional_content_ratio(text, features=features),
+        mtd.check_missing_articles(text, features=features),
+        mtd.check_rare_word_ratio(text, features=features),
+    ]
+
+
+def _measure(func: Callable[[str], list], documents: List[str]):
+    """Return results, wall time and peak traced memory; timing runs without tracing."""
+    start = time.perf_counter()
+    results = [func(doc) for doc in documents]
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    for doc in documents:
+        func(doc)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return results, seconds, peak
+
+
+def run_benchmark(documents: List[str]) -> dict:
+    independent, independent_seconds, independent_peak = _measure(independent_checks, documents)
+    shared, shared_seconds, shared_peak = _measure(shared_checks, documents)
+    return {
+        "documents": len(documents),
+        "identical_results": independent == shared,
+        "independent_seconds": independent_seconds,
+        "shared_seconds": shared_seconds,
+        "speedup": independent_seconds / shared_seconds if shared_seconds else float("inf"),
+        "independent_peak_mb": independent_peak / 2**20,
+        "shared_peak_mb": shared_peak / 2**20,
+    }
+
+
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare shared and per-heuristic tokenization")
+    parser.add_argument("--input-dir", help="Directory of extracted .txt files (default: synthetic corpus)")
+    parser.add_argument("--docs", type=int, default=10, help="Synthetic documents to generate")
+    parser.add_argument("--words", type=int, default=200_000, help="Words per synthetic document")
+    parser.add_argument("--seed", type=int, default=11, help="Random seed")
+    return parser.parse_args(list(argv) if argv is not None else None)
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s", force=True)
+    if args.input_dir:
+        documents = [
+            p.read_text(encoding="utf-8", errors="ignore")
+            for p in sorted(Path(args.input_dir).rglob("*.txt"))
+        ]
+    else:
+        documents = build_documents(args.docs, args.words, args.seed)
+    result = run_benchmark(documents)
+    for key, value in result.items():
+        logger.info("%-22s %s", key, f"{value:.3f}" if isinstance(value, float) else value)
+
+
+if __name__ == "__main__":
+    main()
+
+# Example usage:
+# PYTHONPATH=CorpusBuilderApp python -m tools.benchmarks.mt_tokenization --input-dir ~/crypto_corpus/processed/_extracted
@@ -0,0 +1,86 @@
+"""Benchmark per-image pytesseract calls against the batched OCR service."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import time
+from pathlib import Path
+from typing import Iterable, List
+
+import pytesseract
+from PIL import Image, ImageDraw
+
+from shared_tools.processors.ocr_service import OCRService
+from tools.benchmarks.formula_scan import WORDS
+
+logger = logging.getLogger(__name__)
+
+
+def build_images(count: int, seed: int = 29, size: tuple = (600, 200)) -> List[Image.Image]:
+    """Chart-label sized greyscale images with a few lines of text each."""
+    rng = random.Random(seed)
+    images = []
+    for _ in range(count):
+        image = Image.new("L", size, 255)
+        draw = ImageDraw.Draw(image)
+        for line in range(4):
+            draw.text((10, 10 + 40 * line), " ".join(rng.choice(WORDS) for _ in range(6)), fill=0)
+        images.append(image)
+    return images
+
+
+def per_image(images: List[Image.Image]) -> List[str]:
+    """OCR as the extractors did it: one pytesseract call (and tesseract process) per image."""
+    return [pytesseract.image_to_string(image, config="--psm 6") for image in images]
+
+
+def run_benchmark(images: List[Image.Image], batch_size: int = 16, max_workers: int = 1) -> dict:
+    start = time.perf_counter()
+    legacy = per_image(images)
+    legacy_seconds = time.perf_counter() - start
+
+    service = OCRService(batch_size=batch_size, max_workers=max_workers)
+    start = time.perf_counter()
+    batched = service.images_to_strings(images)
+    batched_seconds = time.perf_counter() - start
+    service.close()
+
+    return {
+        "images": len(images),
+        "backend": service.backend,
+        "same_text": sum(a.split() == b.split() for a, b in zip(legacy, batched)),
+        "processes_started": service.stats["processes_started"],
+        "per_image_seconds": legacy_seconds,
+        "batched_seconds": batched_seconds,
+        "speedup": legacy_seconds / batched_seconds,
+    }
+
+
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare per-image and batched OCR")
+    parser.add_argument("--input-dir", help="Directory of .png images, e.g. extracted charts (default: synthetic images)")
+    parser.add_argument("--images", type=int, default=64, help="Number of synthetic images")
+    parser.add_argument("--batch-size", type=int, default=16, help="Images per batch")
+    parser.add_argument("--workers", type=int, default=1, help="Batches recognised concurrently")
+    parser.add_argument("--seed", type=int, default=29, help="Random seed")
+    return parser.parse_args(list(argv) if argv is not None else None)
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s", force=True)
+    if args.input_dir:
+        images = [Image.open(p).convert("L") for p in sorted(Path(args.input_dir).rglob("*.png"))]
+    else:
+        images = build_images(args.images, args.seed)
+    for key, value in run_benchmark(images, args.batch_size, args.workers).items():
+        logger.info("%-18s %s", key, f"{value:.3f}" if isinstance(value, float) else value)
+
+
+if __name__ == "__main__":
+    main()
+
+# Example usage:
+# PYTHONPATH=CorpusBuilderApp:. python -m tools.benchmarks.ocr_batch --input-dir ~/crypto_corpus/processed/extracted_images
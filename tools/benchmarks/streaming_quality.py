@@ -0,0 +1,104 @@
+"""Benchmark whole-text vs windowed quality scoring of one large extracted text."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Iterable
+
+from shared_tools.processors import machine_translation_detector as mtd
+from shared_tools.processors.quality_control import QualityControl
+from shared_tools.utils.extractor_utils import iter_text_windows
+
+logger = logging.getLogger(__name__)
+
+WORDS = (
+    "the a of and in to market price rate funding perpetual index liquidity pool token "
+    "exchange order book spread volatility option margin risk was were is had walked quoting"
+).split()
+
+
+def write_document(path: Path, megabytes: int, seed: int = 5) -> None:
+    rng = random.Random(seed)
+    target = megabytes * 2**20
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while written < target:
+            line = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 18))) + ".\n"
+            f.write(line)
+            written += len(line)
+
+
+def whole_text(path: Path, qc: QualityControl) -> dict:
+    text = path.read_text(encoding="utf-8", errors="ignore")
+    return {
+        "quality": qc.check_quality(text, {})["quality_metrics"],
+        "machine_translation": mtd.detect_machine_translation(text),
+    }
+
+
+def windowed(path: Path, qc: QualityControl) -> dict:
+    return {
+        "quality": qc.check_quality_stream(iter_text_windows(path=path), {})["quality_metrics"],
+        "machine_translation": mtd.detect_machine_translation_stream(iter_text_windows(path=path)),
+    }
+
+
+def _measure(func: Callable[[Path, QualityControl], dict], path: Path, qc: QualityControl):
+    """Return the result, wall time and peak traced memory; timing runs without tracing."""
+    start = time.perf_counter()
+    result = func(path, qc)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    func(path, qc)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def run_benchmark(path: Path) -> dict:
+    qc = QualityControl()
+    whole, whole_seconds, whole_peak = _measure(whole_text, path, qc)
+    streamed, streamed_seconds, streamed_peak = _measure(windowed, path, qc)
+    return {
+        "file_mb": path.stat().st_size / 2**20,
+        "identical_results": whole == streamed,
+        "whole_seconds": whole_seconds,
+        "windowed_seconds": streamed_seconds,
+        "whole_peak_mb": whole_peak / 2**20,
+        "windowed_peak_mb": streamed_peak / 2**20,
+    }
+
+
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare whole-text and windowed quality scoring")
+    parser.add_argument("--file", help="Extracted .txt file to score (default: synthetic document)")
+    parser.add_argument("--megabytes", type=int, default=64, help="Size of the synthetic document")
+    parser.add_argument("--seed", type=int, default=5, help="Random seed")
+    return parser.parse_args(list(argv) if argv is not None else None)
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s", force=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.file:
+            path = Path(args.file)
+        else:
+            path = Path(tmp) / "synthetic.txt"
+            write_document(path, args.megabytes, args.seed)
+        result = run_benchmark(path)
+    for key, value in result.items():
+        logger.info("%-20s %s", key, f"{value:.3f}" if isinstance(value, float) else value)
+
+
+if __name__ == "__main__":
+    main()
+
+# Example usage:
+# PYTHONPATH=CorpusBuilderApp python -m tools.benchmarks.streaming_quality --file ~/crypto_corpus/processed/_extracted/large_dump.txt
@@ -0,0 +1,102 @@
+"""Benchmark building a corpus symbol glossary: per-document glossaries vs streaming map-reduce."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Iterable, List
+
+from shared_tools.processors.financial_symbol_processor import FinancialSymbolProcessor
+from shared_tools.processors.symbol_glossary import SymbolGlossary
+from tools.benchmarks.symbol_extraction import build_papers
+
+logger = logging.getLogger(__name__)
+
+
+def write_corpus(directory: Path, num_docs: int, words_per_doc: int, seed: int = 13) -> None:
+    for i, doc in enumerate(build_papers(num_docs, words_per_doc, seed)):
+        (directory / f"paper_{i:05d}.txt").write_text(doc, encoding="utf-8")
+
+
+def per_document(directory: Path) -> dict:
+    """Merge generate_symbol_glossary of every whole document, as callers had to."""
+    processor = FinancialSymbolProcessor()
+    corpus = {}
+    for path in sorted(directory.glob("*.txt")):
+        text = path.read_text(encoding="utf-8", errors="ignore")
+        for symbol, entry in processor.generate_symbol_glossary(processor.extract_symbols(text)).items():
+            merged = corpus.setdefault(symbol, {"occurrences": 0, "documents": 0, "contexts": []})
+            merged["occurrences"] += entry["occurrences"]
+            merged["documents"] += 1
+            merged["contexts"].extend(entry["contexts"])
+    return corpus
+
+
+def streaming(directory: Path, max_workers: int) -> SymbolGlossary:
+    glossary = SymbolGlossary()
+    glossary.scan_directory(directory, max_workers=max_workers)
+    glossary.save(directory / "glossary.sqlite")
+    return glossary
+
+
+def _measure(func: Callable[[], object]):
+    """Return wall time, then peak traced memory of the calling process from a second run."""
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def run_benchmark(corpus_sizes: List[int], words_per_doc: int, workers: int) -> List[dict]:
+    rows = []
+    for num_docs in corpus_sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            write_corpus(directory, num_docs, words_per_doc)
+            legacy_seconds, legacy_peak = _measure(lambda directory=directory: per_document(directory))
+            serial_seconds, serial_peak = _measure(lambda directory=directory: streaming(directory, 1))
+            parallel_seconds, _ = _measure(lambda directory=directory: streaming(directory, workers))
+            glossary_kb = (directory / "glossary.sqlite").stat().st_size / 1024
+        rows.append({
+            "docs": num_docs,
+            "legacy_s": legacy_seconds,
+            "legacy_peak_mb": legacy_peak / 2**20,
+            "stream_s": serial_seconds,
+            "stream_peak_mb": serial_peak / 2**20,
+            "parallel_s": parallel_seconds,
+            "glossary_kb": glossary_kb,
+        })
+    return rows
+
+
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare per-document and streaming corpus glossaries")
+    parser.add_argument("--docs", type=int, nargs="+", default=[50, 200, 800], help="Synthetic corpus sizes")
+    parser.add_argument("--words", type=int, default=4000, help="Words per synthetic paper")
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes for the parallel run")
+    return parser.parse_args(list(argv) if argv is not None else None)
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s", force=True)
+    logger.info("%6s %9s %15s %9s %15s %11s %12s", "docs", "legacy_s", "legacy_peak_mb",
+                "stream_s", "stream_peak_mb", "parallel_s", "glossary_kb")
+    for row in run_benchmark(args.docs, args.words, args.workers):
+        logger.info("%6d %9.2f %15.1f %9.2f %15.1f %11.2f %12.1f", row["docs"], row["legacy_s"], row["legacy_peak_mb"],
+                    row["stream_s"], row["stream_peak_mb"], row["parallel_s"], row["glossary_kb"])
+
+
+if __name__ == "__main__":
+    main()
+
+# Example usage:
+# PYTHONPATH=CorpusBuilderApp:. python -m tools.benchmarks.symbol_glossary --docs 100 1000 --workers 8
@@ -0,0 +1,93 @@
+"""Benchmark symbol preserve/restore round trips as texts grow."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from shared_tools.processors.financial_symbol_processor import FinancialSymbolProcessor
+from tools.benchmarks.symbol_extraction import build_papers
+
+logger = logging.getLogger(__name__)
+
+
+def legacy_round_trip(processor: FinancialSymbolProcessor, text: str) -> Tuple[str, Dict[str, str]]:
+    """preserve/restore as they were: one string rebuild per symbol and per placeholder."""
+    positions = processor.extract_symbols(text)['symbols_by_position']
+    positions.sort(key=lambda x: x['position']['start'], reverse=True)
+    preserved = text
+    preservation_map = {}
+    for i, symbol_data in enumerate(positions):
+        placeholder = f"__SYMBOL_{i}__"
+        start, end = symbol_data['position']['start'], symbol_data['position']['end']
+        preserved = preserved[:start] + placeholder + preserved[end:]
+        preservation_map[placeholder] = symbol_data['symbol']
+    restored = preserved
+    for placeholder, symbol in preservation_map.items():
+        restored = restored.replace(placeholder, symbol)
+    return restored, preservation_map
+
+
+def round_trip(processor: FinancialSymbolProcessor, text: str) -> Tuple[str, Dict[str, str]]:
+    preserved, preservation_map = processor.preserve_symbols_in_text(text)
+    return processor.restore_symbols_in_text(preserved, preservation_map), preservation_map
+
+
+def _measure(func: Callable, processor: FinancialSymbolProcessor, text: str):
+    """Return the result, wall time and peak traced memory; timing runs without tracing."""
+    start = time.perf_counter()
+    result = func(processor, text)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    func(processor, text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def run_benchmark(sizes: List[float], legacy_max_mb: float) -> List[dict]:
+    processor = FinancialSymbolProcessor()
+    rows = []
+    for megabytes in sizes:
+        paper = "\n".join(build_papers(1, 8000))
+        text = (paper + "\n") * max(1, int(megabytes * 2**20 / (len(paper) + 1)))
+        variants = [("linear", round_trip)]
+        if megabytes <= legacy_max_mb:
+            variants.append(("legacy", legacy_round_trip))
+        for name, func in variants:
+            (restored, preservation_map), seconds, peak = _measure(func, processor, text)
+            rows.append({
+                "variant": name,
+                "mb": len(text) / 2**20,
+                "symbols": len(preservation_map),
+                "round_trip_ok": restored == text,
+                "seconds": seconds,
+                "peak_mb": peak / 2**20,
+            })
+    return rows
+
+
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Time symbol preserve/restore round trips")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[0.5, 1, 4, 16, 50], help="Text sizes in MB")
+    parser.add_argument("--legacy-max-mb", type=float, default=1, help="Largest size to run the quadratic legacy version on")
+    return parser.parse_args(list(argv) if argv is not None else None)
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s", force=True)
+    logger.info("%8s %8s %9s %10s %9s %9s", "variant", "size_mb", "symbols", "round_trip", "seconds", "peak_mb")
+    for row in run_benchmark(args.sizes, args.legacy_max_mb):
+        logger.info("%8s %8.1f %9d %10s %9.2f %9.1f", row["variant"], row["mb"], row["symbols"],
+                    row["round_trip_ok"], row["seconds"], row["peak_mb"])
+
+
+if __name__ == "__main__":
+    main()
+
+# Example usage:
+# PYTHONPATH=CorpusBuilderApp:. python -m tools.benchmarks.symbol_preservation --sizes 1 10 50